@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from account.models import Account
+from user.models import Agent
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized paid flag on the properties and land of every agent"
+
+    def handle(self, *args, **options):
+        paid_agents = 0
+
+        for agent in Agent.objects.all().iterator():
+            if Account.sync_paid_flag(agent=agent):
+                paid_agents += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Synced paid flag, {paid_agents} paid agents"))
@@ -1,8 +1,9 @@
 import uuid
+from django.apps import apps
 from django.db import models
 from django.utils import timezone
 from datetime import timedelta
-from django.db.models import QuerySet
+from django.db.models import F, Q, QuerySet
 from django.db import transaction
 import logging
 
@@ -22,6 +23,10 @@ class Account(models.Model):
     class Meta:
         db_table = 'account'
         app_label = 'account'
+        indexes = [
+            models.Index(fields=['agent'], name='account_active_agent_idx', condition=Q(is_active=True)),
+            models.Index(fields=['is_active', 'end_date'], name='account_active_end_date_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.end_date and self.plan:
@@ -43,6 +48,7 @@ class Account(models.Model):
             if self.end_date <= timezone.now():
                 self.is_active = False
                 self.save(update_fields=['is_active'])
+                Account.sync_paid_flag(agent=self.agent)
                 logger.info(f"Account {self.account_id} expired and deactivated.")
                 return True
             return False
@@ -53,6 +59,10 @@ class Account(models.Model):
         if self.agent:
             return f"{self.agent.first_name} {self.agent.middle_name} {self.agent.last_name}"
         
+    def is_paid(self) -> bool:
+        """Checks if the account is active on a paid subscription plan"""
+        return self.is_active and self.plan is not None and not self.plan.is_free
+
     def can_upload(self, total_property: int) -> bool:
         """
         Checks if the agent associated with this account can upload another house.
@@ -96,6 +106,7 @@ class Account(models.Model):
             )
 
             account.save()
+            cls.sync_paid_flag(agent=agent)
 
             logger.info(f"Plan subscription for {agent}")
             
@@ -113,9 +124,37 @@ class Account(models.Model):
             )
 
             account.save()
+            cls.sync_paid_flag(agent=agent)
 
             logger.info(f"Plan subscription for {agent}")
             
+    @classmethod
+    def sync_paid_flag(cls, agent: Agent) -> bool:
+        """Materialize the paid state of the agent on all of their properties, land, search index rows and homepage feed entries
+
+        Args:
+            agent (Agent): Agent whose account has changed
+
+        Returns:
+            bool: True if the agent has an active paid account, otherwise False
+        """
+        is_paid = cls.objects.filter(agent=agent, is_active=True, plan__is_free=False).exists()
+
+        for model in (
+            apps.get_model('property', 'Property'),
+            apps.get_model('land', 'Land'),
+        ):
+            model.objects.filter(agent=agent).exclude(is_paid=is_paid).update(is_paid=is_paid, updated_at=timezone.now())
+
+        # The new version drops the cached renderings, they show the paid flag. Paid listings rank first,
+        # updated_at moves the validators of the pages whose order changed
+        apps.get_model('listing', 'ListingSearchIndex').objects.filter(agent=agent).exclude(is_paid=is_paid).update(
+            is_paid=is_paid, version=F('version') + 1, updated_at=timezone.now()
+        )
+
+        apps.get_model('listing', 'HomepageFeedEntry').refresh_paid_flag(agent=agent, is_paid=is_paid)
+        return is_paid
+
     def get_agents_without_account() -> 'QuerySet[Agent]':
         return Agent.objects.filter(agent_account__isnull=True)
         
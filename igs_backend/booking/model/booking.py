@@ -10,6 +10,7 @@ from house.enums.availability_status import STATUS
 import logging
 
 from utils.phone_number import validate_phone_number
+from utils.prefetch import images_prefetch
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,9 @@ class Booking(models.Model):
     class Meta:
         db_table = 'booking'
         app_label = 'booking'
+        indexes = [
+            models.Index(fields=['property', '-listing_date'], name='booking_property_listing_idx'),
+        ]
         
     def __str__(self) -> str:
         return str(self.booking_id)
@@ -60,7 +64,9 @@ class Booking(models.Model):
     @classmethod
     def get_booked_properties(cls, agent: Agent, customer_name: str = None) -> 'QuerySet[Booking]':
         """Retrieve house bookings for an agent who has booked a house, with optional search by customer name."""
-        queryset = cls.objects.filter(property__status=STATUS.BOOKED.value, property__is_deleted = False, property__agent=agent)
+        queryset = cls.objects.select_related('property__location').prefetch_related(images_prefetch(cls, 'property__images')).filter(
+            property__status=STATUS.BOOKED.value, property__is_deleted = False, property__agent=agent
+        )
 
         if customer_name:
             queryset = queryset.filter(Q(customer_name__icontains=customer_name))
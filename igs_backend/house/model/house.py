@@ -1,23 +1,28 @@
 from decimal import Decimal, InvalidOperation
 import uuid
+from typing import Tuple
 from django.db import models
-from django.apps import apps
 from django.core.exceptions import PermissionDenied, ValidationError
 
 from account.models import Account
 from house.enums.availability_status import STATUS
 from house.enums.category import CATEGORY
+from listing.enums.listing_type import LISTING_TYPE
+from listing.models import ListingSearchIndex
 from location.models import Location
+from property.enums.property_type import PROPERTY_TYPE
 from property.models import Property
 from user.models import Agent
 import logging
-from django.db.models.query import QuerySet
-from django.db.models import QuerySet, Q, Count, When, Case, IntegerField, Value, OuterRef, Exists
+from django.db.models import QuerySet
+from utils.prefetch import images_prefetch
 
 
 logger = logging.getLogger(__name__)
 
 class House(Property):
+    default_property_type = PROPERTY_TYPE.HOUSE.value
+
     total_bed_room = models.IntegerField(null=False)
     total_dining_room = models.IntegerField(null=False)
     total_bath_room = models.IntegerField(null=False)
@@ -28,12 +33,12 @@ class House(Property):
         
     def delete(self) -> None:
         self.is_deleted = True
-        self.save(update_fields=["is_deleted"], skip_validation=True)
+        self.save(update_fields=["is_deleted", "updated_at"], skip_validation=True)
     
     def mark_booked(self) -> None:
         """Update the status of the house to 'booked'."""
         self.status = STATUS.BOOKED.value
-        self.save(update_fields=["status"])
+        self.save(update_fields=["status", "updated_at"])
         
     @classmethod
     def save_house(
@@ -115,6 +120,8 @@ class House(Property):
             total_dining_room=total_dining_room,
             total_bath_room=total_bath_room,
             rental_duration=rental_duration,
+            is_paid=account.is_paid(),
+            property_type=PROPERTY_TYPE.HOUSE.value,
         )
 
         house.save()
@@ -130,7 +137,7 @@ class House(Property):
         Returns:
             House | None: House instance if found, Otherwise None
         """
-        return cls.objects.filter(property_id=property_id, is_deleted = False).first()
+        return cls.objects.select_related('location').prefetch_related(images_prefetch(cls, renditions=True)).filter(property_id=property_id, is_deleted = False).first()
     
     @classmethod
     def get_agent_house(cls, agent: Agent, property_id: uuid.UUID) -> 'House':
@@ -144,7 +151,7 @@ class House(Property):
             House: The house instance if found, otherwise None.
         """
         
-        return cls.objects.filter(property_id=property_id, agent=agent, is_deleted = False).first()
+        return cls.objects.select_related('location').prefetch_related(images_prefetch(cls, renditions=True)).filter(property_id=property_id, agent=agent, is_deleted = False).first()
     
     @classmethod
     def get_agent_houses(cls, agent: Agent) -> 'QuerySet[House]':
@@ -156,7 +163,7 @@ class House(Property):
         Returns:
             QuerySet[House]: QuerySet of house instance
         """
-        return cls.objects.filter(agent=agent, is_deleted = False).order_by('-listing_date')
+        return cls.objects.select_related('location').prefetch_related(images_prefetch(cls)).filter(agent=agent, is_deleted = False).order_by('-listing_date')
     
     @classmethod
     def soft_delete_house(cls, property_id: uuid.UUID, agent: Agent) -> None:
@@ -176,50 +183,49 @@ class House(Property):
         min_price: Decimal = None, 
         max_price: Decimal = None,
         ward: str = None, 
-        street: str = None
-    ) -> 'QuerySet[House]':
+        street: str = None,
+        region_id: uuid.UUID = None,
+        district_id: uuid.UUID = None,
+        q: str = None,
+        near: Tuple[float, float, float] = None,
+        bbox: Tuple[float, float, float, float] = None,
+    ) -> 'QuerySet[ListingSearchIndex]':
+        """Filter available houses with images from the listing search index, paid listings first
+
+        Args:
+            category (str, optional): Category of the house. Defaults to None.
+            region (str, optional): Region of the house location. Defaults to None.
+            district (str, optional): District of the house location. Defaults to None.
+            min_price (Decimal, optional): Minimum price. Defaults to None.
+            max_price (Decimal, optional): Maximum price. Defaults to None.
+            ward (str, optional): Ward of the house location. Defaults to None.
+            street (str, optional): Street of the house location. Defaults to None.
+            region_id (uuid.UUID, optional): Region ID of the house location. Defaults to None.
+            district_id (uuid.UUID, optional): District ID of the house location. Defaults to None.
+            q (str, optional): Keywords searched in the description, nearby facilities and utilities. Defaults to None.
+            near (Tuple[float, float, float], optional): (latitude, longitude, radius_km) circle to search in. Defaults to None.
+            bbox (Tuple[float, float, float, float], optional): (min_lng, min_lat, max_lng, max_lat) box to search in. Defaults to None.
+
+        Returns:
+            QuerySet[ListingSearchIndex]: Ordered index rows, load the houses with `ListingSearchIndex.hydrate`
+        """
         
         if category and not CATEGORY.valid(category=category):
             raise ValueError(f"Invalid category '{category}'. Valid options are {', '.join([choice[0] for choice in CATEGORY.choices()])}.")
         
-        filters = Q(status=STATUS.AVAILABLE.value, is_active_account=True, is_deleted=False)
-
-        if category:
-            filters &= Q(category=category)
-        
-        if region:
-            filters &= Q(location__region__iexact=region)
-        if district:
-            filters &= Q(location__district__iexact=district)
-            
-        if min_price:
-            filters &= Q(price__gte=min_price)
-        if max_price:
-            filters &= Q(price__lte=max_price)
-            
-        if ward:
-            filters &= Q(location__ward__iexact=ward)
-
-        if street:
-            filters &= Q(location__street__iexact=street)
-        
-        paid_account_exists = Account.objects.filter(
-            agent=OuterRef("agent"),
-            is_active=True,
-            plan__is_free=False
-        ).values("pk")
-
-        queryset = cls.objects.filter(filters).annotate(
-            is_paid=Case(
-                When(Exists(paid_account_exists), then=Value(1)),
-                default=Value(0),
-                output_field=IntegerField()
-            ),
-            image_count=Count('images', distinct=True) 
-        ).filter(image_count__gt=0)
-
-        queryset = queryset.select_related('location').order_by('-is_paid', '-listing_date')
-
-        return queryset
-
-    
+        return ListingSearchIndex.search(
+            listing_types=[LISTING_TYPE.HOUSE.value],
+            with_images=True,
+            category=category,
+            region=region,
+            district=district,
+            region_id=region_id,
+            district_id=district_id,
+            ward=ward,
+            street=street,
+            min_price=min_price,
+            max_price=max_price,
+            q=q,
+            near=near,
+            bbox=bbox,
+        )
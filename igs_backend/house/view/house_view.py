@@ -6,14 +6,24 @@ from rest_framework import viewsets, permissions, status
 from authentication.custom_permissions import IsAgent
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
+from shared.renderers import ORJSONRenderer
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from house.enums.category import CATEGORY
 from house.models import House
 from house.serializers import RequestHouseSerializer, ResponseHouseSerializer, ResponseHouseDetailSerializer, ResponseMyHouseSerializer
+from listing.enums.listing_type import LISTING_TYPE
+from listing.models import ListingSearchIndex
+from listing.search_cache import SearchCache
+from listing.serializers import ListingCardSerializer
 from location.models import Location, District
 from property.models import Property
 from property_images.models import PropertyImage
+from shared.mixins import CachedSearchMixin
+from shared.pagination import ListingPagination
+from shared.serializer import SparseFieldsMixin
+from utils import geohash
 from shared.seriaizers import DetailResponseSerializer
 import logging
 from rest_framework.pagination import PageNumberPagination
@@ -23,14 +33,16 @@ from django.core.exceptions import PermissionDenied, ValidationError
 from user.models import Agent
 from user.models import User
 
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import never_cache
 
 
 logger = logging.getLogger(__name__)
 
-@method_decorator(never_cache, name='dispatch')
-class HouseViewSet(viewsets.ModelViewSet):
+class HouseViewSet(CachedSearchMixin, viewsets.ModelViewSet):
+    cache_control = {
+        'filter_houses': {'public': True, 'max_age': 30},
+        'house_detail': {'public': True, 'max_age': 60},
+    }
+
     def get_serializer_class(self):
         return RequestHouseSerializer
 
@@ -153,7 +165,8 @@ class HouseViewSet(viewsets.ModelViewSet):
                     ward=validated_data.get("ward"),
                     street = validated_data.get("street"),
                     latitude=validated_data.get("latitude"),
-                    longitude=validated_data.get("longitude")
+                    longitude=validated_data.get("longitude"),
+                    district_ref=district,
                 )
 
                 saved_house = House.save_house(
@@ -273,8 +286,14 @@ class HouseViewSet(viewsets.ModelViewSet):
             
             if not house:
                 return Response({"detail": "House not found"}, status=status.HTTP_404_NOT_FOUND)
+
+            etag = self.weak_etag(str(house.pk), house.updated_at.isoformat())
+            not_modified = self.not_modified(request, etag, house.updated_at)
+            if not_modified is not None:
+                return not_modified
+
             serializer = ResponseHouseDetailSerializer(house, many=False)
-            return Response(data=serializer.data, status=status.HTTP_200_OK)
+            return self.set_validators(Response(data=serializer.data, status=status.HTTP_200_OK), etag, house.updated_at)
         except Exception as e:
           logger.error(f"Un expected error occured while getting house with id {pk}", exc_info=True)
           return Response(data={"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -462,9 +481,45 @@ class HouseViewSet(viewsets.ModelViewSet):
             openapi.Parameter(
                 'maxPrice', openapi.IN_QUERY, description="Maximum price of the house", type=openapi.TYPE_STRING
             ),
+            openapi.Parameter(
+                'region_id', openapi.IN_QUERY, description="Region ID of the house location, takes precedence over region", type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+            ),
+            openapi.Parameter(
+                'district_id', openapi.IN_QUERY, description="District ID of the house location, takes precedence over district", type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+            ),
+            openapi.Parameter(
+                'q', openapi.IN_QUERY, description="Keywords to search in the description, nearby facilities and utilities, results are ranked by relevance after paid listings", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'lat', openapi.IN_QUERY, description="Latitude of the search center, requires lng and radius_km", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'lng', openapi.IN_QUERY, description="Longitude of the search center, requires lat and radius_km", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'radius_km', openapi.IN_QUERY, description="Only houses within this many kilometers of lat/lng (max 200)", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'bbox', openapi.IN_QUERY, description="Only houses inside the map box `min_lng,min_lat,max_lng,max_lat`", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'view', openapi.IN_QUERY, description="`card` returns the compact card of each listing instead of the full listing",
+                type=openapi.TYPE_STRING, enum=['card']
+            ),
+            openapi.Parameter(
+                'fields', openapi.IN_QUERY, description="Comma separated fields to return, e.g. `property_id,price,cover_image`", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'page_size', openapi.IN_QUERY, description="Listings per page, at most 50", type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'cursor', openapi.IN_QUERY,
+                description="Opt in cursor pagination, send an empty value for the first page then follow `next`",
+                type=openapi.TYPE_STRING
+            ),
         ]
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=[ORJSONRenderer, BrowsableAPIRenderer])
     def filter_houses(self, request: HttpRequest):
         category: str = request.GET.get('category')
         region: str = request.GET.get('region')
@@ -473,6 +528,9 @@ class HouseViewSet(viewsets.ModelViewSet):
         max_price: str = request.GET.get('maxPrice')
         street: str = request.GET.get('street')
         ward: str = request.GET.get('ward')
+        region_id: str = request.GET.get('region_id')
+        district_id: str = request.GET.get('district_id')
+        q: str = request.GET.get('q')
 
         try:
             min_price = Decimal(min_price) if min_price else None
@@ -481,18 +539,33 @@ class HouseViewSet(viewsets.ModelViewSet):
             return Response({"detail": "Invalid price format."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            houses = House.house_filter(category=category, region=region, district=district, min_price=min_price, max_price=max_price, street=street, ward=ward)
-            
+            region_id = uuid.UUID(region_id) if region_id else None
+            district_id = uuid.UUID(district_id) if district_id else None
+        except ValueError:
+            return Response({"detail": "Invalid region or district ID."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            near = geohash.parse_radius(request.GET.get('lat'), request.GET.get('lng'), request.GET.get('radius_km'))
+            bbox = geohash.parse_bbox(request.GET.get('bbox'))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        cache_key = SearchCache.key('filter_houses', [LISTING_TYPE.HOUSE.value], request)
+        cached = self.cached_search_response(request, cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            houses = House.house_filter(category=category, region=region, district=district, min_price=min_price, max_price=max_price, street=street, ward=ward, region_id=region_id, district_id=district_id, q=q, near=near, bbox=bbox)
             
-            paginator = PageNumberPagination()
             
-            page = paginator.paginate_queryset(houses, request)
-            if page is not None:
-                serializer = ResponseHouseSerializer(page, many=True)
-                return paginator.get_paginated_response(serializer.data)
+            fields = SparseFieldsMixin.parse_fields(request.GET.get('fields'))
+            serializer_class = ListingCardSerializer if request.GET.get('view') == 'card' else ResponseHouseSerializer
 
-            serializer = ResponseHouseSerializer(houses, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            def render(rows):
+                return ListingSearchIndex.render(rows, model=House, serializer_class=serializer_class, fields=fields)
+
+            return self.search_response(request, cache_key, houses, ListingPagination(), render)
         except ValueError as e:
             logger.error(f"Validation error occurred: {e}", exc_info=True)
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -88,6 +88,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework_simplejwt.token_blacklist",
     "corsheaders",
     "drf_yasg",
@@ -108,6 +109,7 @@ INSTALLED_APPS = [
     "property_images",
     "settings",
     "land",
+    "listing",
 ]
 
 # AUTH_USER_MODEL = "authentication.User"
@@ -120,6 +122,7 @@ AUTHENTICATION_BACKENDS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'shared.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -217,6 +220,10 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 21
 }
 
+# Public list endpoints render from values() rows with orjson instead of serializer instances,
+# the output is the same. Turn off to go back to the plain DRF serializers and renderer.
+FAST_LIST_RENDERING = env.bool('FAST_LIST_RENDERING', default=True)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=2),
@@ -260,6 +267,54 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# The search cache backend is one of locmem (per process), file (shared by the workers of one host)
+# or redis (any Redis protocol compatible server, shared by every host). Writes invalidate the cache
+# of the process making them, so web workers and the images worker must share it, locmem only suits
+# a single process.
+
+SEARCH_CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+SEARCH_CACHE_BACKEND = env('SEARCH_CACHE_BACKEND', default='file')
+SEARCH_CACHE_LOCATION = env('SEARCH_CACHE_LOCATION', default=str(BASE_DIR / 'cache' / 'search'))
+SEARCH_CACHE_TIMEOUT = env.int('SEARCH_CACHE_TIMEOUT', default=300)
+# Rendered listings use the same backend, their keys carry the listing version so they can live long
+LISTING_FRAGMENT_CACHE_TIMEOUT = env.int('LISTING_FRAGMENT_CACHE_TIMEOUT', default=60 * 60 * 24)
+
+CACHES = {
+    "default": {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    "search": {
+        'BACKEND': SEARCH_CACHE_BACKENDS[SEARCH_CACHE_BACKEND],
+        'LOCATION': SEARCH_CACHE_LOCATION,
+        'TIMEOUT': SEARCH_CACHE_TIMEOUT,
+        'KEY_PREFIX': 'search',
+    },
+    "listing_fragments": {
+        'BACKEND': SEARCH_CACHE_BACKENDS[SEARCH_CACHE_BACKEND],
+        'LOCATION': env('LISTING_FRAGMENT_CACHE_LOCATION', default=SEARCH_CACHE_LOCATION),
+        'TIMEOUT': LISTING_FRAGMENT_CACHE_TIMEOUT,
+        'KEY_PREFIX': 'fragment',
+    },
+}
+
+
+# Response compression
+# API responses of at least RESPONSE_COMPRESSION_MIN_SIZE bytes are compressed with the encoding the
+# client prefers among RESPONSE_COMPRESSION_ENCODINGS (br needs the Brotli package), an empty list
+# turns compression off
+
+RESPONSE_COMPRESSION_PATHS = ['/api/']
+RESPONSE_COMPRESSION_ENCODINGS = env.list('RESPONSE_COMPRESSION_ENCODINGS', default=['br', 'gzip'])
+RESPONSE_COMPRESSION_MIN_SIZE = env.int('RESPONSE_COMPRESSION_MIN_SIZE', default=1024)
+RESPONSE_COMPRESSION_GZIP_LEVEL = env.int('RESPONSE_COMPRESSION_GZIP_LEVEL', default=6)
+RESPONSE_COMPRESSION_BROTLI_QUALITY = env.int('RESPONSE_COMPRESSION_BROTLI_QUALITY', default=5)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -300,6 +355,12 @@ STATIC_ROOT = os.path.join(BASE_DIR, env('STATIC_ROOT'))
 MEDIA_URL = env('MEDIA_URL')
 MEDIA_ROOT = os.path.join(BASE_DIR, env('MEDIA_ROOT'))
 
+# Image endpoints answer with an X-Accel-Redirect to this internal nginx location aliasing MEDIA_ROOT,
+# nginx then sends the file. Empty to stream files from Django, as when running without nginx
+MEDIA_ACCEL_REDIRECT_LOCATION = env('MEDIA_ACCEL_REDIRECT_LOCATION', default='')
+# Lifetime of the images in client and proxy caches, an image URL never serves other content
+MEDIA_CACHE_MAX_AGE = env.int('MEDIA_CACHE_MAX_AGE', default=60 * 60 * 24 * 365)
+
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR, "static"),
 ]
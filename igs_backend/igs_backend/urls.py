@@ -37,6 +37,7 @@ urlpatterns = [
     path('api/v2/room/', include('room.urls')),
     path('api/v2/company_information/', include('settings.urls')),
     path('api/v2/land/', include('land.urls')),
+    path('api/v2/listings/', include('listing.urls')),
 ]
 
 # if settings.DEBUG:
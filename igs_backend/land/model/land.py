@@ -1,4 +1,5 @@
 import uuid
+from typing import Tuple
 from django.db import models
 
 from account.models import Account
@@ -7,13 +8,16 @@ from land.enums.land_size_unit_enum import LandSizeType
 from land.enums.land_status import LAND_STATUS
 from land.enums.land_type import LAND_TYPE
 from land.enums.zoning_type import ZONING_TYPE
+from listing.enums.listing_type import LISTING_TYPE
+from listing.models import ListingSearchIndex
 from location.models import Location
 from user.model.agent import Agent
 
-from django.db.models import Q, QuerySet, OuterRef, Exists, Value, Case, When, IntegerField, Count
+from django.db.models import Q, QuerySet
 from django.core.exceptions import PermissionDenied, ValidationError
 from decimal import Decimal
 import uuid
+from utils.prefetch import images_prefetch
 
 class Land(models.Model):
     land_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -27,21 +31,29 @@ class Land(models.Model):
     utilities = models.TextField(null=True, blank=True)
     description = models.TextField()
     is_active_account = models.BooleanField(default=True)
+    is_paid = models.BooleanField(default=False)
+    image_count = models.IntegerField(default=0)
+    cover_image_id = models.UUIDField(null=True, blank=True)
     location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name="land")
     listing_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=100, choices=LAND_STATUS.choices(), default=LAND_STATUS.default)
     is_deleted = models.BooleanField(default=False)
 
     class Meta:
         db_table = 'land'
         app_label = 'land'
+        indexes = [
+            models.Index(fields=['agent', '-listing_date'], name='land_agent_listing_idx', condition=Q(is_deleted=False)),
+            models.Index(fields=['category', 'price'], name='land_available_idx', condition=Q(is_deleted=False, is_active_account=True, status=LAND_STATUS.AVAILABLE.name)),
+        ]
 
     def __str__(self):
         return f"{self.category} land - {self.land_size} sq meters"
 
     def delete(self, using=None, keep_parents=False):
         self.is_deleted = True
-        self.save(update_fields=["is_deleted"])
+        self.save(update_fields=["is_deleted", "updated_at"])
 
 
     @classmethod
@@ -73,6 +85,7 @@ class Land(models.Model):
             zoning_type=zoning_type,
             utilities=utilities,
             land_size_unit=land_size_unit,
+            is_paid=account.is_paid(),
         )
 
         instance.save()
@@ -80,15 +93,15 @@ class Land(models.Model):
 
     @classmethod
     def get_land_by_id(cls, land_id: uuid.UUID) -> 'Land':
-        return cls.objects.filter(land_id=land_id, is_deleted=False).first()
+        return cls.objects.select_related('location').prefetch_related(images_prefetch(cls, renditions=True)).filter(land_id=land_id, is_deleted=False).first()
 
     @classmethod
     def get_agent_land(cls, agent: Agent, land_id: uuid.UUID) -> 'Land':
-        return cls.objects.filter(agent=agent, land_id=land_id, is_deleted=False).first()
+        return cls.objects.select_related('location').prefetch_related(images_prefetch(cls, renditions=True)).filter(agent=agent, land_id=land_id, is_deleted=False).first()
 
     @classmethod
     def get_agent_lands(cls, agent: Agent) -> 'QuerySet[Land]':
-        return cls.objects.filter(agent=agent, is_deleted=False).order_by('-listing_date')
+        return cls.objects.select_related('location').prefetch_related(images_prefetch(cls)).filter(agent=agent, is_deleted=False).order_by('-listing_date')
     
     @classmethod
     def get_land_available_for_booking(cls, land_id: uuid.UUID) -> 'Land':
@@ -97,51 +110,25 @@ class Land(models.Model):
     @classmethod
     def land_filter(cls, region: str = None, district: str = None, min_price: Decimal = None, 
                     max_price: Decimal = None, category: str = None, ward: str = None, 
-                    street: str = None) -> 'QuerySet[Land]':
-        filters = Q(
-            status=LAND_STATUS.AVAILABLE.name,
-            is_active_account=True,
-            is_deleted=False
+                    street: str = None, region_id: uuid.UUID = None, district_id: uuid.UUID = None,
+                    q: str = None, near: Tuple[float, float, float] = None,
+                    bbox: Tuple[float, float, float, float] = None) -> 'QuerySet[ListingSearchIndex]':
+        return ListingSearchIndex.search(
+            listing_types=[LISTING_TYPE.LAND.value],
+            category=category,
+            region=region,
+            district=district,
+            region_id=region_id,
+            district_id=district_id,
+            ward=ward,
+            street=street,
+            min_price=min_price,
+            max_price=max_price,
+            q=q,
+            near=near,
+            bbox=bbox,
         )
 
-        if category:
-            filters &= Q(category=category)
-
-        if min_price:
-            filters &= Q(price__gte=min_price)
-
-        if max_price:
-            filters &= Q(price__lte=max_price)
-
-        if region:
-            filters &= Q(location__region__iexact=region)
-
-        if district:
-            filters &= Q(location__district__iexact=district)
-
-        if ward:
-            filters &= Q(location__ward__iexact=ward)
-
-        if street:
-            filters &= Q(location__street__iexact=street)
-
-        paid_account_exists = Account.objects.filter(
-            agent=OuterRef("agent"),
-            is_active=True,
-            plan__is_free=False
-        ).values("pk")
-
-        queryset = cls.objects.filter(filters).annotate(
-            is_paid=Case(
-                When(Exists(paid_account_exists), then=Value(1)),
-                default=Value(0),
-                output_field=IntegerField()
-            ),
-            image_count=Count('images', distinct=True) 
-        ).select_related('location').order_by('-is_paid', '-listing_date')
-
-        return queryset
-
     @classmethod
     def total_properties_for_agent(cls, agent: Agent) -> int:
         return cls.objects.filter(agent=agent, is_deleted=False).count()
@@ -1,18 +1,16 @@
 from decimal import Decimal
 import logging
-import mimetypes
-import os
 from typing import cast
 import uuid
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest
 from rest_framework import viewsets, permissions, status
 from authentication.custom_permissions import IsAgent
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
+from shared.renderers import ORJSONRenderer
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import never_cache
 
 from django.db import transaction, DatabaseError
 from django.core.exceptions import PermissionDenied, ValidationError
@@ -22,11 +20,20 @@ from igs_backend import settings
 from land.enums.land_type import LAND_TYPE
 from land.model.land import Land
 from land.serializers import FilterLandSerializer, AddLandSerializer, ResponseAgentLandSerializer, RequestLandAgentInfoSerializer
+from listing.enums.listing_type import LISTING_TYPE
+from listing.models import ListingSearchIndex
+from listing.search_cache import SearchCache
+from listing.serializers import ListingCardSerializer
 from location.models import Location
 from location.models import District
 from message.utils import send_sms
+from property_images.enums.rendition_size import RENDITION_SIZE
 from property_images.models import LandImage
 from settings.models import SiteSettings
+from shared.mixins import CachedSearchMixin, MediaFileMixin
+from shared.pagination import ListingPagination
+from shared.serializer import SparseFieldsMixin
+from utils import geohash
 from shared.serializer.detail_response_serializer import DetailResponseSerializer
 from user.model.agent import Agent
 from user.models import User
@@ -35,7 +42,7 @@ from user.models import User
 logger = logging.getLogger(__name__)
 
 
-class LandImagesViewSet(viewsets.ModelViewSet):
+class LandImagesViewSet(MediaFileMixin, viewsets.ModelViewSet):
     """
     ViewSet for handling Land images.
     """
@@ -69,34 +76,44 @@ class LandImagesViewSet(viewsets.ModelViewSet):
                 description="The UUID of the image to retrieve",
                 type=openapi.TYPE_STRING,
                 required=True
+            ),
+            openapi.Parameter(
+                'size',
+                openapi.IN_QUERY,
+                description="Rendition to retrieve, the full image by default",
+                type=openapi.TYPE_STRING,
+                enum=[choice[0] for choice in RENDITION_SIZE.choices()],
+                required=False
             )
         ]
     )
     @action(detail=False, methods=['get'], url_path='land-images/(?P<image_id>[^/]+)')
     def property_images(self, request, image_id):
-        try:
-            image = LandImage.get_image_by_id(image_id=image_id)
+        size = request.query_params.get('size', RENDITION_SIZE.FULL.value)
 
-            image_path = os.path.join(settings.MEDIA_ROOT, str(image.image))
+        if not RENDITION_SIZE.valid(size):
+            return Response({"detail": f"Invalid size '{size}'. Valid options are {', '.join([choice[0] for choice in RENDITION_SIZE.choices()])}."}, status=status.HTTP_400_BAD_REQUEST)
 
-            if not os.path.exists(image_path):
-                return Response({"detail": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            image_name = LandImage.get_image_file(image_id=image_id, size=size)
+            response = self.serve_media(request, image_name, cache_control=self.immutable_cache_control) if image_name else None
 
-            mime_type, _ = mimetypes.guess_type(image_path)
-            if not mime_type:
-                mime_type = 'application/octet-stream'
+            if response is None:
+                return Response({"detail": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
 
-            with open(image_path, 'rb') as image_file:
-                response = HttpResponse(image_file.read(), content_type=mime_type)
-                return response
+            return response
 
         except LandImage.DoesNotExist:
             return Response({"detail": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({"detail": f"An error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-@method_decorator(never_cache, name='dispatch')
-class LandViewSet(viewsets.ModelViewSet):
+class LandViewSet(CachedSearchMixin, viewsets.ModelViewSet):
+    cache_control = {
+        'land_filter': {'public': True, 'max_age': 30},
+        'retrieve_land_details': {'public': True, 'max_age': 60},
+    }
+
     def get_serializer_class(self):
         return AddLandSerializer
     
@@ -216,6 +233,16 @@ class LandViewSet(viewsets.ModelViewSet):
                             type=openapi.TYPE_ARRAY,
                             items=openapi.Schema(type=openapi.TYPE_STRING),
                         ),
+                        'image_srcsets': openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    'url': openapi.Schema(type=openapi.TYPE_STRING),
+                                    'srcset': openapi.Schema(type=openapi.TYPE_STRING),
+                                }
+                            ),
+                        ),
                     }
                 )
             ),
@@ -238,8 +265,14 @@ class LandViewSet(viewsets.ModelViewSet):
             land = Land.get_land_by_id(land_id=pk)
             if land is None:
                 return Response(data={"detail": "Land not found"}, status=status.HTTP_404_NOT_FOUND)
+
+            etag = self.weak_etag(str(land.pk), land.updated_at.isoformat())
+            not_modified = self.not_modified(request, etag, land.updated_at)
+            if not_modified is not None:
+                return not_modified
+
             serializer = ResponseAgentLandSerializer(land)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return self.set_validators(Response(serializer.data, status=status.HTTP_200_OK), etag, land.updated_at)
         except Exception as e:
             logger.error(f"Unexpected error occurred: {e}", exc_info=True)
             return Response({"detail": f"An unexpected error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -284,6 +317,16 @@ class LandViewSet(viewsets.ModelViewSet):
                             type=openapi.TYPE_ARRAY,
                             items=openapi.Schema(type=openapi.TYPE_STRING),
                         ),
+                        'image_srcsets': openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    'url': openapi.Schema(type=openapi.TYPE_STRING),
+                                    'srcset': openapi.Schema(type=openapi.TYPE_STRING),
+                                }
+                            ),
+                        ),
                     }
                 )
             ),
@@ -516,7 +559,8 @@ class LandViewSet(viewsets.ModelViewSet):
                     ward=validated_data.get("ward"),
                     street=validated_data.get("street"),
                     latitude=validated_data.get("latitude"),
-                    longitude=validated_data.get("longitude")
+                    longitude=validated_data.get("longitude"),
+                    district_ref=district,
                 )
 
                 response = Land.save_land(
@@ -656,9 +700,45 @@ class LandViewSet(viewsets.ModelViewSet):
                 description="Maximum price of the land",
                 type=openapi.TYPE_STRING
             ),
+            openapi.Parameter(
+                'region_id', openapi.IN_QUERY, description="Region ID of the land location, takes precedence over region", type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+            ),
+            openapi.Parameter(
+                'district_id', openapi.IN_QUERY, description="District ID of the land location, takes precedence over district", type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+            ),
+            openapi.Parameter(
+                'q', openapi.IN_QUERY, description="Keywords to search in the description, nearby facilities and utilities, results are ranked by relevance after paid listings", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'lat', openapi.IN_QUERY, description="Latitude of the search center, requires lng and radius_km", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'lng', openapi.IN_QUERY, description="Longitude of the search center, requires lat and radius_km", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'radius_km', openapi.IN_QUERY, description="Only land within this many kilometers of lat/lng (max 200)", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'bbox', openapi.IN_QUERY, description="Only land inside the map box `min_lng,min_lat,max_lng,max_lat`", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'view', openapi.IN_QUERY, description="`card` returns the compact card of each listing instead of the full listing",
+                type=openapi.TYPE_STRING, enum=['card']
+            ),
+            openapi.Parameter(
+                'fields', openapi.IN_QUERY, description="Comma separated fields to return, e.g. `property_id,price,cover_image`", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'page_size', openapi.IN_QUERY, description="Listings per page, at most 50", type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'cursor', openapi.IN_QUERY,
+                description="Opt in cursor pagination, send an empty value for the first page then follow `next`",
+                type=openapi.TYPE_STRING
+            ),
         ]
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=[ORJSONRenderer, BrowsableAPIRenderer])
     def land_filter(self, request: HttpRequest):
         category: str = request.GET.get('category')
         region: str = request.GET.get('region')
@@ -667,6 +747,9 @@ class LandViewSet(viewsets.ModelViewSet):
         max_price: str = request.GET.get('max_price')
         street: str = request.GET.get('street')
         ward: str = request.GET.get('ward')
+        region_id: str = request.GET.get('region_id')
+        district_id: str = request.GET.get('district_id')
+        q: str = request.GET.get('q')
 
         try:
             min_price = Decimal(min_price) if min_price else None
@@ -674,25 +757,46 @@ class LandViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({"detail": "Invalid price format."}, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            region_id = uuid.UUID(region_id) if region_id else None
+            district_id = uuid.UUID(district_id) if district_id else None
+        except ValueError:
+            return Response({"detail": "Invalid region or district ID."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            near = geohash.parse_radius(request.GET.get('lat'), request.GET.get('lng'), request.GET.get('radius_km'))
+            bbox = geohash.parse_bbox(request.GET.get('bbox'))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        cache_key = SearchCache.key('land_filter', [LISTING_TYPE.LAND.value], request)
+        cached = self.cached_search_response(request, cache_key)
+        if cached is not None:
+            return cached
+
         try:
             lands = Land.land_filter(
                 category=category,
                 region=region,
                 district=district,
+                region_id=region_id,
+                district_id=district_id,
                 ward=ward,
                 street=street,
                 min_price=min_price,
-                max_price=max_price
+                max_price=max_price,
+                q=q,
+                near=near,
+                bbox=bbox,
             )
 
-            paginator = PageNumberPagination()
-            page = paginator.paginate_queryset(lands, request)
-            if page is not None:
-                serializer = FilterLandSerializer(page, many=True)
-                return paginator.get_paginated_response(serializer.data)
+            fields = SparseFieldsMixin.parse_fields(request.GET.get('fields'))
+            serializer_class = ListingCardSerializer if request.GET.get('view') == 'card' else FilterLandSerializer
 
-            serializer = FilterLandSerializer(lands, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            def render(rows):
+                return ListingSearchIndex.render(rows, model=Land, serializer_class=serializer_class, fields=fields)
+
+            return self.search_response(request, cache_key, lands, ListingPagination(), render)
 
         except ValueError as e:
             logger.error(f"Validation error occurred: {e}", exc_info=True)
@@ -0,0 +1,16 @@
+from enum import Enum
+from typing import List, Tuple
+
+
+class LISTING_TYPE(Enum):
+    HOUSE = 'House'
+    ROOM = 'Room'
+    LAND = 'Land'
+
+    @classmethod
+    def choices(cls) -> List[Tuple[str, str]]:
+        return [(listing_type.value, listing_type.value) for listing_type in cls]
+
+    @classmethod
+    def default(cls) -> str:
+        return cls.HOUSE.value
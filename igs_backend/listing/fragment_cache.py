@@ -0,0 +1,42 @@
+from typing import Any, Dict, List, Optional
+import uuid
+from django.core.cache import caches
+
+
+class FragmentCache:
+    """Cache of rendered listings, one entry per listing, serializer and set of fields.
+
+    Keys embed the version of the index row of the listing, bumped whenever the listing, its
+    location, its images or the paid state of its agent change, so a stale fragment is never
+    read again and simply expires.
+    """
+    alias = 'listing_fragments'
+
+    @classmethod
+    def _cache(cls):
+        return caches[cls.alias]
+
+    @staticmethod
+    def key(serializer_class: type, fields: Optional[List[str]], listing_id: uuid.UUID, version: int) -> str:
+        """Cache key of the rendering of a listing
+
+        Args:
+            serializer_class (type): Serializer rendering the listing
+            fields (Optional[List[str]]): Requested fields, every field when None
+            listing_id (uuid.UUID): Listing ID
+            version (int): Version of the index row of the listing
+
+        Returns:
+            str: Cache key
+        """
+        fields = ','.join(sorted(set(fields))) if fields else '*'
+        return f"{serializer_class.__name__}:{fields}:{listing_id}:{version}"
+
+    @classmethod
+    def get_many(cls, keys: List[str]) -> Dict[str, Any]:
+        return cls._cache().get_many(keys) if keys else {}
+
+    @classmethod
+    def set_many(cls, fragments: Dict[str, Any]) -> None:
+        if fragments:
+            cls._cache().set_many(fragments)
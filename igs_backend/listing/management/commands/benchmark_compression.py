@@ -0,0 +1,57 @@
+import gzip
+import time
+from django.core.management.base import BaseCommand
+
+from house.models import House
+from house.serializers import ResponseHouseSerializer
+from land.models import Land
+from land.serializers import FilterLandSerializer
+from listing.models import HomepageFeedEntry, ListingSearchIndex
+from room.models import Room
+from room.serializers import ResponseRoomSerializer
+from shared.middleware.compression_middleware import brotli
+from shared.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = "Measure the bytes saved and the CPU time of gzip and brotli on the first page of each public list"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=21, help="Listings per page")
+        parser.add_argument('--repeat', type=int, default=20, help="Compressions timed per level")
+
+    def _payloads(self, page_size: int) -> dict:
+        lists = [
+            ('filter_houses', House, House.house_filter(), ResponseHouseSerializer),
+            ('room_filter', Room, Room.room_filter(), ResponseRoomSerializer),
+            ('land_filter', Land, Land.land_filter(), FilterLandSerializer),
+        ]
+        payloads = {
+            name: ORJSONRenderer().render(ListingSearchIndex.render(queryset[:page_size], model=model, serializer_class=serializer_class))
+            for name, model, queryset, serializer_class in lists
+        }
+        payloads['demo_property'] = ORJSONRenderer().render([entry.payload for entry in HomepageFeedEntry.feed()[:page_size]])
+        return payloads
+
+    def handle(self, *args, **options):
+        codecs = [(f"gzip-{level}", lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0)) for level in (1, 6, 9)]
+
+        if brotli is not None:
+            codecs += [(f"br-{quality}", lambda data, quality=quality: brotli.compress(data, quality=quality)) for quality in (1, 5, 11)]
+        else:
+            self.stdout.write(self.style.WARNING("Brotli is not installed, only gzip is measured"))
+
+        for name, payload in self._payloads(options['page_size']).items():
+            self.stdout.write(f"{name}: {len(payload)} bytes")
+
+            if not payload:
+                continue
+
+            for codec, compress in codecs:
+                size = len(compress(payload))
+                start = time.perf_counter()
+                for _ in range(options['repeat']):
+                    compress(payload)
+                elapsed = (time.perf_counter() - start) / options['repeat'] * 1000
+
+                self.stdout.write(f"  {codec}: {size} bytes, {100 - size * 100 / len(payload):.0f}% saved, {elapsed:.2f} ms")
@@ -0,0 +1,55 @@
+import time
+from typing import Callable
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from house.models import House
+from house.serializers import ResponseHouseSerializer
+from land.models import Land
+from land.serializers import FilterLandSerializer
+from listing.models import ListingSearchIndex
+from room.models import Room
+from room.serializers import ResponseRoomSerializer
+from shared.renderers import ORJSONRenderer
+from shared.serializer import RowConverter
+
+
+class Command(BaseCommand):
+    help = "Time the DRF and the values()/orjson rendering of the first page of each public filter on the current data"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=21, help="Listings per page")
+        parser.add_argument('--repeat', type=int, default=50, help="Renderings timed per path")
+
+    @staticmethod
+    def _time(render: Callable[[], bytes], repeat: int) -> float:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            render()
+        return (time.perf_counter() - start) / repeat * 1000
+
+    def handle(self, *args, **options):
+        lists = [
+            ('filter_houses', House, House.house_filter(), ResponseHouseSerializer),
+            ('room_filter', Room, Room.room_filter(), ResponseRoomSerializer),
+            ('land_filter', Land, Land.land_filter(), FilterLandSerializer),
+        ]
+
+        for name, model, queryset, serializer_class in lists:
+            page = list(queryset[:options['page_size']])
+
+            def drf():
+                instances = ListingSearchIndex.hydrate(page, model=model, only=serializer_class.get_only(model), prefetch=serializer_class.get_prefetch())
+                return JSONRenderer().render(serializer_class(instances, many=True).data)
+
+            def fast():
+                return ORJSONRenderer().render(RowConverter.for_serializer(serializer_class).rows_by_id([row.listing_id for row in page]))
+
+            same = drf() == fast()
+            drf_ms = self._time(drf, options['repeat'])
+            fast_ms = self._time(fast, options['repeat'])
+
+            self.stdout.write(
+                f"{name}: {len(page)} listings, DRF {drf_ms:.2f} ms, fast {fast_ms:.2f} ms, "
+                f"{drf_ms / fast_ms:.1f}x, {'same output' if same else 'DIFFERENT OUTPUT'}"
+            )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from listing.models import ListingSearchIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuild the listing search index and homepage feed from the house, room and land tables"
+
+    def handle(self, *args, **options):
+        total = ListingSearchIndex.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} listings"))
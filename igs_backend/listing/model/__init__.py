@@ -0,0 +1,2 @@
+from .listing_search_index import ListingSearchIndex
+from .homepage_feed_entry import HomepageFeedEntry
\ No newline at end of file
@@ -0,0 +1,117 @@
+from typing import Dict, Iterable, List
+import uuid
+import logging
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.cache import caches
+from django.db import models
+from django.db.models import QuerySet
+
+from listing.enums.listing_type import LISTING_TYPE
+from listing.model.listing_search_index import ListingSearchIndex
+from listing.search_cache import SearchCache
+from user.models import Agent
+from utils.prefetch import images_prefetch
+
+
+logger = logging.getLogger(__name__)
+
+class HomepageFeedEntry(models.Model):
+    """Rendered homepage entry of a house or room with images, in homepage order.
+
+    Entries are refreshed with the index row of their listing, so the homepage reads a page
+    of ready JSON in one query instead of loading and serializing the properties per request.
+    """
+    listing = models.OneToOneField(ListingSearchIndex, on_delete=models.CASCADE, primary_key=True, related_name="feed_entry")
+    is_paid = models.BooleanField(default=False)
+    listing_date = models.DateTimeField()
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'homepage_feed_entry'
+        app_label = 'listing'
+        indexes = [
+            models.Index(fields=['-is_paid', '-listing_date', 'listing'], name='homepage_feed_rank_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f"Feed entry {self.listing_id}"
+
+    @classmethod
+    def refresh(cls, listing_id: uuid.UUID) -> None:
+        """Render the entry of a listing again from its index row, dropping it when it left the homepage
+
+        Args:
+            listing_id (uuid.UUID): Property ID of the house or room
+        """
+        # Imported here, the property serializers depend on the models of this app
+        from property.serializers import ResponseDemoPropertySerializer
+
+        Property = apps.get_model('property', 'Property')
+
+        row = ListingSearchIndex.objects.filter(
+            listing_id=listing_id,
+            listing_type__in=[LISTING_TYPE.HOUSE.value, LISTING_TYPE.ROOM.value],
+            image_count__gt=0,
+        ).first()
+        property = Property.objects.select_related('location').prefetch_related(images_prefetch(Property)).filter(property_id=listing_id).first() if row else None
+
+        if property is None:
+            cls.objects.filter(listing_id=listing_id).delete()
+            return
+
+        property.listing_type = row.listing_type
+        cls.objects.update_or_create(
+            listing_id=listing_id,
+            defaults={
+                'is_paid': row.is_paid,
+                'listing_date': row.listing_date,
+                'payload': ResponseDemoPropertySerializer(property).data,
+            }
+        )
+
+    @classmethod
+    def refresh_paid_flag(cls, agent: Agent, is_paid: bool) -> None:
+        """Render the entries of an agent again when the paid state of their account changed
+
+        Args:
+            agent (Agent): Agent whose account has changed
+            is_paid (bool): New paid state of the agent
+        """
+        for listing_id in cls.objects.filter(listing__agent=agent).exclude(is_paid=is_paid).values_list('listing_id', flat=True):
+            cls.refresh(listing_id=listing_id)
+
+    @classmethod
+    def feed(cls) -> 'QuerySet[HomepageFeedEntry]':
+        """Homepage entries, paid listings first then the newest
+
+        Returns:
+            QuerySet[HomepageFeedEntry]: Ordered entries, count them with `cached_count`
+        """
+        return cls.objects.order_by('-is_paid', '-listing_date', 'listing_id')
+
+    @classmethod
+    def cached_count(cls) -> int:
+        """Number of entries, counted once per version of the house and room searches
+
+        Entries only come and go with writes to houses, rooms and their images, which bump those versions.
+
+        Returns:
+            int: Number of entries
+        """
+        versions = '.'.join(str(version) for version in SearchCache.versions([LISTING_TYPE.HOUSE.value, LISTING_TYPE.ROOM.value]))
+        return caches[SearchCache.alias].get_or_set(f"homepage_feed_count:{versions}", cls.objects.count)
+
+    @staticmethod
+    def payloads(entries: Iterable['HomepageFeedEntry'], fields: List[str]) -> List[Dict]:
+        """Rendered entries reduced to the requested fields
+
+        Args:
+            entries (Iterable[HomepageFeedEntry]): Page of entries
+            fields (List[str]): Fields to keep
+
+        Returns:
+            List[Dict]: Entries as returned by the homepage
+        """
+        return [{name: entry.payload[name] for name in fields if name in entry.payload} for entry in entries]
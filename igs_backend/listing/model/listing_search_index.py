@@ -0,0 +1,714 @@
+from decimal import Decimal
+import hashlib
+import math
+from typing import Dict, Iterable, List, Tuple, Type
+import uuid
+import logging
+from django.apps import apps
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.core.cache import cache, caches
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, SearchVectorField
+from django.db import connection, models, transaction
+from django.db.models import Avg, Case, Count, F, FloatField, IntegerField, Max, Min, Q, QuerySet, TextField, Value, When
+from django.utils import timezone
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt, Substr
+
+from house.enums.category import CATEGORY
+from land.enums.land_status import LAND_STATUS
+from listing.enums.listing_type import LISTING_TYPE
+from listing.fragment_cache import FragmentCache
+from location.models import District, Location, Region, Ward
+from shared.serializer import RowConverter
+from user.models import Agent
+from utils import geohash
+from utils.prefetch import images_prefetch
+
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL ships no Swahili dictionary, the unstemmed 'simple' config matches Swahili words as typed
+# while 'english' adds stemming for the English descriptions
+SEARCH_CONFIGS = ('english', 'simple')
+
+MAX_ZOOM = 20
+MAX_CLUSTER_TILES = 64
+CLUSTER_CACHE_TIMEOUT = 60 * 10
+# Clusters are invalidated from any process writing listings, they live in the shared search cache
+CLUSTER_CACHE_ALIAS = 'search'
+
+# Upper bounds of the facet price buckets in TZS, the last bucket is open ended
+PRICE_BUCKETS = [100_000, 250_000, 500_000, 1_000_000, 5_000_000, 20_000_000, 100_000_000]
+FACET_CACHE_TIMEOUT = 60
+FACET_COLUMNS = ['region_ref_id', 'region', 'district_ref_id', 'district', 'category', 'room_category', 'zoning_type', 'price_bucket']
+FACET_GROUPING_SETS = {
+    'regions': ('region_ref_id', 'region'),
+    'districts': ('district_ref_id', 'district'),
+    'categories': ('category',),
+    'room_categories': ('room_category',),
+    'zoning_types': ('zoning_type',),
+    'price_buckets': ('price_bucket',),
+}
+
+class ListingSearchIndex(models.Model):
+    """Denormalized, read optimized copy of every publicly listed house, room and land.
+
+    One row per listing that is not deleted and belongs to an active account. The row is
+    kept in sync from model signals so the public filter endpoints read a single table
+    instead of joining property, location, account and image tables on every request.
+    """
+    listing_id = models.UUIDField(primary_key=True, editable=False)
+    listing_type = models.CharField(max_length=20, choices=LISTING_TYPE.choices(), default=LISTING_TYPE.default())
+    agent = models.ForeignKey(Agent, on_delete=models.CASCADE, related_name="listings")
+    category = models.CharField(max_length=100)
+    room_category = models.CharField(max_length=100, null=True, blank=True)
+    zoning_type = models.CharField(max_length=100, null=True, blank=True)
+    is_available = models.BooleanField(default=True)
+    price = models.DecimalField(max_digits=32, decimal_places=2)
+    region = models.CharField(max_length=255)
+    district = models.CharField(max_length=255)
+    ward = models.CharField(max_length=255)
+    street = models.CharField(max_length=255)
+    region_ref = models.ForeignKey(Region, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    district_ref = models.ForeignKey(District, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    ward_ref = models.ForeignKey(Ward, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    latitude = models.DecimalField(max_digits=11, decimal_places=8, null=True, blank=True)
+    longitude = models.DecimalField(max_digits=11, decimal_places=8, null=True, blank=True)
+    geohash = models.CharField(max_length=12, null=True, blank=True, db_index=True)
+    is_paid = models.BooleanField(default=False)
+    image_count = models.IntegerField(default=0)
+    cover_image_id = models.UUIDField(null=True, blank=True)
+    listing_date = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+    # Bumped on every write of the row, the cached renderings of the listing are keyed on it
+    version = models.PositiveIntegerField(default=1)
+    search_vector = SearchVectorField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'listing_search_index'
+        app_label = 'listing'
+        indexes = [
+            models.Index(fields=['listing_type', 'is_available', '-is_paid', '-listing_date', 'listing_id'], name='listing_type_rank_idx'),
+            models.Index(fields=['listing_type', '-is_paid', '-listing_date', 'listing_id'], name='listing_public_rank_idx', condition=Q(is_available=True, image_count__gt=0)),
+            models.Index(fields=['listing_type', 'price'], name='listing_public_price_idx', condition=Q(is_available=True)),
+            models.Index(fields=['-is_paid', '-listing_date', 'listing_id'], name='listing_rank_idx', condition=Q(is_available=True)),
+            models.Index(fields=['listing_type', 'region', 'district', 'ward'], name='listing_type_location_idx'),
+            models.Index(fields=['agent'], name='listing_agent_idx'),
+            GinIndex(fields=['search_vector'], name='listing_search_vector_idx'),
+            models.Index(fields=['latitude', 'longitude'], name='listing_coordinates_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.listing_type} {self.listing_id}"
+
+    @staticmethod
+    def _fold(value: str) -> str:
+        """Case fold location names so lookups can use plain equality on the indexed columns"""
+        return Location.normalize(value)
+
+    @classmethod
+    def _location_filter(cls, field: str, model: Type[models.Model], name: str) -> Q:
+        """Match a location name on the ids of every place with that name, or on the folded name for
+        rows whose reference is not set"""
+        return (
+            Q(**{f"{field}_ref__in": model.objects.filter(name__iexact=name.strip()).values('pk')})
+            | Q(**{field: cls._fold(name)})
+        )
+
+    @staticmethod
+    def _search_vector(weighted_texts: List[tuple]) -> SearchVector:
+        """Build the weighted tsvector of the listing texts for every search config
+
+        Args:
+            weighted_texts (List[tuple]): (weight, text) pairs, weight being one of A, B, C or D
+        """
+        vector = None
+
+        for weight, text in weighted_texts:
+            for config in SEARCH_CONFIGS:
+                part = SearchVector(Value(text or '', output_field=TextField()), config=config, weight=weight)
+                vector = part if vector is None else vector + part
+
+        return vector
+
+    @staticmethod
+    def _search_query(q: str) -> SearchQuery:
+        query = None
+
+        for config in SEARCH_CONFIGS:
+            part = SearchQuery(q, config=config, search_type='websearch')
+            query = part if query is None else query | part
+
+        return query
+
+    @staticmethod
+    def _distance_km(latitude: float, longitude: float):
+        """Haversine great circle distance in kilometers between the listing and the given point"""
+        lat = Radians(Cast('latitude', FloatField()))
+        lng = Radians(Cast('longitude', FloatField()))
+        origin_lat = math.radians(latitude)
+        origin_lng = math.radians(longitude)
+
+        haversine = (
+            Power(Sin((lat - Value(origin_lat)) / 2), 2)
+            + Value(math.cos(origin_lat)) * Cos(lat) * Power(Sin((lng - Value(origin_lng)) / 2), 2)
+        )
+        return Value(2 * geohash.EARTH_RADIUS_KM) * ASin(Sqrt(haversine))
+
+    @staticmethod
+    def _tile_precision(zoom: int) -> int:
+        """Clusters of a zoom level are cached per tile, one geohash character coarser than the clusters"""
+        return geohash.precision_for_zoom(zoom) - 1
+
+    @staticmethod
+    def _cluster_cache_key(zoom: int, tile: str) -> str:
+        return f"listing_clusters:{zoom}:{tile}"
+
+    @classmethod
+    def _invalidate_clusters(cls, geohashes: Iterable[str]) -> None:
+        """Drop the cached clusters of every zoom level for the tiles containing the given geohashes
+
+        The keys are dropped once the write commits, a reader running before that would cache the old rows again.
+        """
+        keys = list({
+            cls._cluster_cache_key(zoom, value[:cls._tile_precision(zoom)])
+            for value in geohashes if value
+            for zoom in range(MAX_ZOOM + 1)
+        })
+
+        if keys:
+            transaction.on_commit(lambda: caches[CLUSTER_CACHE_ALIAS].delete_many(keys))
+
+    @classmethod
+    def _write(cls, listing, listing_type: str, is_available: bool, room_category: str = None) -> None:
+        location = listing.location
+        search_vector = cls._search_vector([
+            ('A', listing.description),
+            ('B', getattr(listing, 'nearby_facilities', None)),
+            ('B', listing.utilities),
+        ])
+        previous_geohash = cls.objects.filter(listing_id=listing.pk).values_list('geohash', flat=True).first()
+        current_geohash = geohash.encode(float(location.latitude), float(location.longitude)) if location.latitude is not None and location.longitude is not None else None
+
+        defaults = {
+            'listing_type': listing_type,
+            'agent_id': listing.agent_id,
+            'category': listing.category,
+            'room_category': room_category,
+            'zoning_type': getattr(listing, 'zoning_type', None),
+            'is_available': is_available,
+            'price': listing.price,
+            'region': cls._fold(location.region),
+            'district': cls._fold(location.district),
+            'ward': cls._fold(location.ward),
+            'street': cls._fold(location.street),
+            'region_ref_id': location.region_ref_id,
+            'district_ref_id': location.district_ref_id,
+            'ward_ref_id': location.ward_ref_id,
+            'latitude': location.latitude,
+            'longitude': location.longitude,
+            'geohash': current_geohash,
+            'is_paid': listing.is_paid,
+            'image_count': listing.image_count,
+            'cover_image_id': listing.cover_image_id,
+            'listing_date': listing.listing_date,
+            'search_vector': search_vector,
+        }
+
+        if not cls.objects.filter(listing_id=listing.pk).update(**defaults, version=F('version') + 1, updated_at=timezone.now()):
+            cls.objects.create(listing_id=listing.pk, **defaults)
+
+        cls._invalidate_clusters([previous_geohash, current_geohash])
+
+    @classmethod
+    def sync_property(cls, property_id: uuid.UUID) -> None:
+        """Create, refresh or drop the index row and homepage feed entry of a house or room
+
+        Args:
+            property_id (uuid.UUID): Property ID of the house or room
+        """
+        Property = apps.get_model('property', 'Property')
+
+        listing = next(iter(Property.objects.select_related('location').filter(property_id=property_id).as_subtypes()), None)
+
+        if listing is None or listing.property_type is None or listing.is_deleted or not listing.is_active_account:
+            cls.remove(listing_id=property_id)
+            return
+
+        cls._write(
+            listing=listing,
+            listing_type=listing.property_type,
+            is_available=listing.available(),
+            room_category=getattr(listing, 'room_category', None),
+        )
+        apps.get_model('listing', 'HomepageFeedEntry').refresh(listing_id=property_id)
+
+    @classmethod
+    def sync_land(cls, land_id: uuid.UUID) -> None:
+        """Create, refresh or drop the index row of a land
+
+        Args:
+            land_id (uuid.UUID): Land ID
+        """
+        Land = apps.get_model('land', 'Land')
+
+        land = Land.objects.select_related('location').filter(land_id=land_id).first()
+
+        if land is None or land.is_deleted or not land.is_active_account:
+            cls.remove(listing_id=land_id)
+            return
+
+        cls._write(
+            listing=land,
+            listing_type=LISTING_TYPE.LAND.value,
+            is_available=land.status == LAND_STATUS.AVAILABLE.name,
+        )
+
+    @classmethod
+    def sync_location(cls, location_id: uuid.UUID) -> None:
+        """Refresh the index rows of every listing placed at the given location
+
+        Args:
+            location_id (uuid.UUID): Location ID
+        """
+        Property = apps.get_model('property', 'Property')
+        Land = apps.get_model('land', 'Land')
+
+        for property_id in Property.objects.filter(location_id=location_id).values_list('property_id', flat=True):
+            cls.sync_property(property_id=property_id)
+
+        for land_id in Land.objects.filter(location_id=location_id).values_list('land_id', flat=True):
+            cls.sync_land(land_id=land_id)
+
+    @classmethod
+    def remove(cls, listing_id: uuid.UUID) -> None:
+        previous_geohash = cls.objects.filter(listing_id=listing_id).values_list('geohash', flat=True).first()
+        cls.objects.filter(listing_id=listing_id).delete()
+        cls._invalidate_clusters([previous_geohash])
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """Rebuild the whole index from the source tables
+
+        Returns:
+            int: Total number of indexed listings
+        """
+        Property = apps.get_model('property', 'Property')
+        Land = apps.get_model('land', 'Land')
+
+        cls._invalidate_clusters(cls.objects.values_list('geohash', flat=True).distinct().iterator())
+        cls.objects.all().delete()
+
+        for property_id in Property.objects.filter(is_deleted=False, is_active_account=True).values_list('property_id', flat=True).iterator():
+            cls.sync_property(property_id=property_id)
+
+        for land_id in Land.objects.filter(is_deleted=False, is_active_account=True).values_list('land_id', flat=True).iterator():
+            cls.sync_land(land_id=land_id)
+
+        return cls.objects.count()
+
+    @classmethod
+    def search(
+        cls,
+        listing_types: List[str],
+        available_only: bool = True,
+        with_images: bool = False,
+        category: str = None,
+        room_category: str = None,
+        region: str = None,
+        district: str = None,
+        region_id: uuid.UUID = None,
+        district_id: uuid.UUID = None,
+        ward: str = None,
+        street: str = None,
+        min_price: Decimal = None,
+        max_price: Decimal = None,
+        q: str = None,
+        near: Tuple[float, float, float] = None,
+        bbox: Tuple[float, float, float, float] = None,
+    ) -> 'QuerySet[ListingSearchIndex]':
+        """Filter the index, paid listings first then the newest, or the most relevant when searching by keywords
+
+        Args:
+            listing_types (List[str]): Listing types to include
+            available_only (bool, optional): Only listings open for booking. Defaults to True.
+            with_images (bool, optional): Only listings with at least one image. Defaults to False.
+            category (str, optional): Listing category. Defaults to None.
+            room_category (str, optional): Room category. Defaults to None.
+            region (str, optional): Region name, case insensitive. Defaults to None.
+            district (str, optional): District name, case insensitive. Defaults to None.
+            region_id (uuid.UUID, optional): Region ID, takes precedence over the region name. Defaults to None.
+            district_id (uuid.UUID, optional): District ID, takes precedence over the district name. Defaults to None.
+            ward (str, optional): Ward name, case insensitive. Defaults to None.
+            street (str, optional): Street name, case insensitive. Defaults to None.
+            min_price (Decimal, optional): Minimum price. Defaults to None.
+            max_price (Decimal, optional): Maximum price. Defaults to None.
+            q (str, optional): Keywords searched in the description, nearby facilities and utilities. Defaults to None.
+            near (Tuple[float, float, float], optional): (latitude, longitude, radius_km) circle to search in. Defaults to None.
+            bbox (Tuple[float, float, float, float], optional): (min_lng, min_lat, max_lng, max_lat) box to search in. Defaults to None.
+
+        Returns:
+            QuerySet[ListingSearchIndex]: Ordered queryset of index rows
+        """
+        filters = Q(listing_type__in=listing_types)
+
+        if available_only:
+            filters &= Q(is_available=True)
+        if with_images:
+            filters &= Q(image_count__gt=0)
+
+        if category:
+            filters &= Q(category=category)
+        if room_category:
+            filters &= Q(room_category=room_category)
+
+        if region_id:
+            filters &= Q(region_ref_id=region_id)
+        elif region:
+            filters &= cls._location_filter('region', Region, region)
+
+        if district_id:
+            filters &= Q(district_ref_id=district_id)
+        elif district:
+            filters &= cls._location_filter('district', District, district)
+
+        if ward:
+            filters &= cls._location_filter('ward', Ward, ward)
+        if street:
+            filters &= Q(street=cls._fold(street))
+
+        if min_price:
+            filters &= Q(price__gte=min_price)
+        if max_price:
+            filters &= Q(price__lte=max_price)
+
+        if bbox:
+            min_lng, min_lat, max_lng, max_lat = bbox
+            filters &= Q(latitude__gte=min_lat, latitude__lte=max_lat, longitude__gte=min_lng, longitude__lte=max_lng)
+
+        queryset = cls.objects.filter(filters)
+
+        if near:
+            latitude, longitude, radius_km = near
+            cells = Q()
+
+            # Prune with geohash prefixes on the indexed column, then refine with the exact distance
+            for cell in geohash.covering_cells(latitude, longitude, radius_km):
+                cells |= Q(geohash__startswith=cell)
+
+            queryset = queryset.filter(cells).annotate(
+                distance_km=cls._distance_km(latitude, longitude)
+            ).filter(distance_km__lte=radius_km)
+
+        if q and q.strip():
+            query = cls._search_query(q.strip())
+            # ts_rank is a real, cast it so the rank survives a round trip through the pagination cursor
+            return queryset.filter(search_vector=query).annotate(
+                rank=Cast(SearchRank(F('search_vector'), query), output_field=FloatField())
+            ).order_by('-is_paid', '-rank', '-listing_date', 'listing_id')
+
+        return queryset.order_by('-is_paid', '-listing_date', 'listing_id')
+
+    @classmethod
+    def public_search(cls, listing_types: List[str] = None, **filters) -> 'QuerySet[ListingSearchIndex]':
+        """Search the public houses, rooms and land together in one ranked query
+
+        Each type keeps the rules of its own filter endpoint: houses and rooms need an image and
+        rooms are only listed for rent, land is listed without images.
+
+        Args:
+            listing_types (List[str], optional): Listing types to include, every type when None. Defaults to None.
+            filters: Any other `search` filter
+
+        Raises:
+            ValueError: If a listing type is invalid
+
+        Returns:
+            QuerySet[ListingSearchIndex]: Rows of every type in a single ranking, load them with `ListingSearchIndex.hydrate_listings`
+        """
+        all_types = [listing_type.value for listing_type in LISTING_TYPE]
+        listing_types = listing_types or all_types
+
+        if not set(listing_types) <= set(all_types):
+            raise ValueError("Invalid listing type.")
+
+        return cls.search(listing_types=listing_types, **filters).filter(
+            Q(listing_type=LISTING_TYPE.LAND.value) | Q(image_count__gt=0),
+            ~Q(listing_type=LISTING_TYPE.ROOM.value) | Q(category=CATEGORY.RENTAL.value),
+        )
+
+    @classmethod
+    def clusters(cls, bbox: Tuple[float, float, float, float], zoom: int) -> List[Dict]:
+        """Group the live listings inside a map box into geohash cells sized for the zoom level
+
+        Clusters are cached per (zoom, tile), the tiles missing from the cache are aggregated
+        together in a single GROUP BY over the geohash column.
+
+        Args:
+            bbox (Tuple[float, float, float, float]): (min_lng, min_lat, max_lng, max_lat) visible map box
+            zoom (int): Web map zoom level between 0 and MAX_ZOOM
+
+        Raises:
+            ValueError: If the zoom level is out of range or the box spans too many tiles
+
+        Returns:
+            List[Dict]: Clusters with the geohash cell, listing count, centroid and price range
+        """
+        if not 0 <= zoom <= MAX_ZOOM:
+            raise ValueError(f"zoom must be between 0 and {MAX_ZOOM}.")
+
+        precision = geohash.precision_for_zoom(zoom)
+        tile_precision = cls._tile_precision(zoom)
+        min_lng, min_lat, max_lng, max_lat = bbox
+
+        # Estimate the tile count before enumerating them, a wide box at a high zoom spans millions of tiles
+        if tile_precision > 0:
+            lat_degrees, lng_degrees = geohash.cell_size(tile_precision)
+            if ((max_lat - min_lat) / lat_degrees + 1) * ((max_lng - min_lng) / lng_degrees + 1) > MAX_CLUSTER_TILES:
+                raise ValueError("The map box is too large for the zoom level.")
+
+        tiles = geohash.covering_tiles(min_lng, min_lat, max_lng, max_lat, precision=tile_precision)
+
+        keys = {tile: cls._cluster_cache_key(zoom, tile) for tile in tiles}
+        cached = caches[CLUSTER_CACHE_ALIAS].get_many(list(keys.values()))
+        missing = [tile for tile in tiles if keys[tile] not in cached]
+
+        if missing:
+            prefixes = Q()
+            for tile in missing:
+                prefixes |= Q(geohash__startswith=tile)
+
+            rows = cls.objects.filter(
+                prefixes,
+                Q(listing_type=LISTING_TYPE.LAND.value) | Q(image_count__gt=0),
+                is_available=True,
+                geohash__isnull=False,
+            ).annotate(
+                cell=Substr('geohash', 1, precision)
+            ).values('cell').annotate(
+                count=Count('listing_id'),
+                latitude=Avg(Cast('latitude', FloatField())),
+                longitude=Avg(Cast('longitude', FloatField())),
+                min_price=Min('price'),
+                max_price=Max('price'),
+            ).order_by('cell')
+
+            fresh = {tile: [] for tile in missing}
+            for row in rows:
+                fresh[row['cell'][:tile_precision]].append(row)
+
+            caches[CLUSTER_CACHE_ALIAS].set_many({keys[tile]: clusters for tile, clusters in fresh.items()}, timeout=CLUSTER_CACHE_TIMEOUT)
+            cached.update({keys[tile]: clusters for tile, clusters in fresh.items()})
+
+        return [cluster for tile in tiles for cluster in cached[keys[tile]]]
+
+    @staticmethod
+    def facet_cache_key(listing_type: str, **filters) -> str:
+        """Cache key of the facets of a filter, equal for filters differing only in case, spacing or unset values"""
+        def normalize(value) -> str:
+            if isinstance(value, str):
+                return Location.normalize(value)
+            if isinstance(value, Decimal):
+                return format(value.normalize(), 'f')
+            return str(value)
+
+        normalized = sorted((name, normalize(value)) for name, value in filters.items() if value not in (None, ''))
+        digest = hashlib.md5(repr((listing_type, normalized)).encode()).hexdigest()
+        return f"listing_facets:{digest}"
+
+    @classmethod
+    def facets(cls, queryset: 'QuerySet[ListingSearchIndex]', cache_key: str = None) -> Dict:
+        """Count the listings of a filtered queryset per region, district, category, room category, zoning type
+        and price bucket in a single GROUPING SETS pass
+
+        Args:
+            queryset (QuerySet[ListingSearchIndex]): Filtered index rows, as returned by `search`
+            cache_key (str, optional): Cache the counts for FACET_CACHE_TIMEOUT seconds under this key. Defaults to None.
+
+        Returns:
+            Dict: Total and the counts of every facet, largest first
+        """
+        if cache_key:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        price_bucket = Case(
+            *[When(price__lt=bound, then=Value(index)) for index, bound in enumerate(PRICE_BUCKETS)],
+            default=Value(len(PRICE_BUCKETS)),
+            output_field=IntegerField(),
+        )
+        listings = queryset.order_by().annotate(price_bucket=price_bucket).values(*FACET_COLUMNS)
+        listings_sql, params = listings.query.sql_with_params()
+
+        columns = ', '.join(FACET_COLUMNS)
+        groupings = ', '.join(f"GROUPING({column})" for column in FACET_COLUMNS)
+        grouping_sets = ', '.join(f"({', '.join(fields)})" for fields in FACET_GROUPING_SETS.values())
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {columns}, {groupings}, COUNT(*) FROM ({listings_sql}) AS listings "
+                f"GROUP BY GROUPING SETS ({grouping_sets}, ())",
+                params,
+            )
+            rows = cursor.fetchall()
+
+        result = {facet: [] for facet in FACET_GROUPING_SETS}
+        result['total'] = 0
+
+        for row in rows:
+            values = dict(zip(FACET_COLUMNS, row))
+            grouped = {column for column, grouping in zip(FACET_COLUMNS, row[len(FACET_COLUMNS):-1]) if grouping == 0}
+            count = row[-1]
+
+            if not grouped:
+                result['total'] = count
+                continue
+
+            facet = next(name for name, fields in FACET_GROUPING_SETS.items() if grouped == set(fields))
+
+            if facet in ('regions', 'districts'):
+                reference, name = FACET_GROUPING_SETS[facet]
+                result[facet].append({'id': values[reference], 'name': values[name], 'count': count})
+            elif facet == 'price_buckets':
+                bucket = values['price_bucket']
+                result[facet].append({
+                    'min_price': PRICE_BUCKETS[bucket - 1] if bucket > 0 else 0,
+                    'max_price': PRICE_BUCKETS[bucket] if bucket < len(PRICE_BUCKETS) else None,
+                    'count': count,
+                })
+            elif values[FACET_GROUPING_SETS[facet][0]] is not None:
+                result[facet].append({'value': values[FACET_GROUPING_SETS[facet][0]], 'count': count})
+
+        cls._facet_names(result['regions'], Region)
+        cls._facet_names(result['districts'], District)
+
+        for facet in FACET_GROUPING_SETS:
+            if facet == 'price_buckets':
+                result[facet].sort(key=lambda bucket: bucket['min_price'])
+            else:
+                result[facet].sort(key=lambda entry: -entry['count'])
+
+        if cache_key:
+            cache.set(cache_key, result, timeout=FACET_CACHE_TIMEOUT)
+
+        return result
+
+    @staticmethod
+    def _facet_names(entries: List[Dict], model: Type[models.Model]) -> None:
+        """Replace the folded location names with the names of the referenced regions or districts"""
+        names = dict(model.objects.filter(pk__in=[entry['id'] for entry in entries if entry['id']]).values_list('pk', 'name'))
+
+        for entry in entries:
+            entry['name'] = names.get(entry['id'], entry['name'])
+
+    @classmethod
+    def hydrate(cls, rows: Iterable['ListingSearchIndex'], model: Type[models.Model], related: tuple = ('location',), only: List[str] = None, prefetch: Iterable[str] = ()) -> list:
+        """Load the source model instances of a page of index rows in a single query, keeping the index order
+
+        Each instance gets the `listing_type` of its row.
+
+        Args:
+            rows (Iterable[ListingSearchIndex]): Page of index rows
+            model (Type[models.Model]): Source model to load (House, Room, Land or Property)
+            related (tuple, optional): Relations to select along. Defaults to ('location',).
+            only (List[str], optional): Columns to load, relations without a listed column are not joined. Defaults to None.
+            prefetch (Iterable[str], optional): Image relations to prefetch, one more query each. Defaults to ().
+
+        Returns:
+            list: Model instances in the same order as the rows
+        """
+        rows = list(rows)
+
+        if not rows:
+            return []
+
+        queryset = model.objects.all()
+
+        if only is not None:
+            related = tuple(relation for relation in related if any(column.startswith(f"{relation}__") for column in only))
+            queryset = queryset.only(model._meta.pk.name, *only)
+
+        queryset = queryset.prefetch_related(*[images_prefetch(model, relation) for relation in prefetch])
+        instances = queryset.select_related(*related).in_bulk([row.listing_id for row in rows])
+        listings = []
+
+        for row in rows:
+            instance = instances.get(row.listing_id)
+
+            if instance is not None:
+                instance.listing_type = row.listing_type
+                listings.append(instance)
+
+        return listings
+
+    @classmethod
+    def render(cls, rows: Iterable['ListingSearchIndex'], model: Type[models.Model], serializer_class: type, fields: List[str] = None) -> list:
+        """Serialized listings of a page of index rows, keeping the index order
+
+        Listings are read from the fragment cache with one multi-get on their row version and
+        the missing ones are rendered together. With `FAST_LIST_RENDERING` on, serializers whose
+        fields all map to columns render from values() rows by a `RowConverter`, any other is
+        given hydrated instances.
+
+        Args:
+            rows (Iterable[ListingSearchIndex]): Page of index rows
+            model (Type[models.Model]): Source model of the rows (House, Room or Land)
+            serializer_class (type): `SparseFieldsMixin` serializer of the model
+            fields (List[str], optional): Requested fields, every field when None. Defaults to None.
+
+        Raises:
+            ValueError: If a requested field does not exist
+
+        Returns:
+            list: Serializer data of the listings
+        """
+        rows = list(rows)
+        # Compiled whatever the setting, it also rejects unknown fields before they reach a cache key
+        converter = RowConverter.for_serializer(serializer_class, fields)
+
+        keys = {row.listing_id: FragmentCache.key(serializer_class, fields, row.listing_id, row.version) for row in rows}
+        fragments = FragmentCache.get_many(list(keys.values()))
+        missing = [row for row in rows if keys[row.listing_id] not in fragments]
+
+        if missing:
+            if converter is not None and settings.FAST_LIST_RENDERING:
+                rendered = converter.rows_in_bulk([row.listing_id for row in missing])
+            else:
+                only = serializer_class.get_only(model, fields)
+                prefetch = serializer_class.get_prefetch(fields)
+                instances = cls.hydrate(missing, model=model, only=only, prefetch=prefetch)
+                rendered = dict(zip([instance.pk for instance in instances], serializer_class(instances, many=True, fields=fields).data))
+
+            rendered = {keys[listing_id]: data for listing_id, data in rendered.items()}
+            FragmentCache.set_many(rendered)
+            fragments.update(rendered)
+
+        return [fragments[keys[row.listing_id]] for row in rows if keys[row.listing_id] in fragments]
+
+    @classmethod
+    def hydrate_listings(cls, rows: Iterable['ListingSearchIndex'], only: List[str] = None) -> list:
+        """Load the houses, rooms and land of a mixed page with one query per listing type, keeping the index order
+
+        Args:
+            rows (Iterable[ListingSearchIndex]): Page of index rows of any type
+            only (List[str], optional): Columns to load, shared by every type. Defaults to None.
+
+        Returns:
+            list: House, Room and Land instances in the same order as the rows
+        """
+        models_by_type = {
+            LISTING_TYPE.HOUSE.value: apps.get_model('house', 'House'),
+            LISTING_TYPE.ROOM.value: apps.get_model('room', 'Room'),
+            LISTING_TYPE.LAND.value: apps.get_model('land', 'Land'),
+        }
+        rows = list(rows)
+        instances = {}
+
+        for listing_type, model in models_by_type.items():
+            typed_rows = [row for row in rows if row.listing_type == listing_type]
+
+            for instance in cls.hydrate(typed_rows, model=model, only=only):
+                instances[instance.pk] = instance
+
+        return [instances[row.listing_id] for row in rows if row.listing_id in instances]
@@ -0,0 +1 @@
+from .model import *
\ No newline at end of file
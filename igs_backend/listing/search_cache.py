@@ -0,0 +1,79 @@
+import hashlib
+from typing import Any, List
+from django.core.cache import caches
+from django.http import HttpRequest
+
+from location.models import Location
+
+
+class SearchCache:
+    """Cache of public search responses keyed on the normalized query parameters.
+
+    Every key embeds the version counter of the listing types it covers. Writes bump the
+    counters so stale entries are never read again and simply expire.
+    """
+    alias = 'search'
+    # Parameters the filters match case insensitively, every other value is compared as sent
+    folded_params = {'region', 'district', 'ward', 'street', 'q'}
+
+    @classmethod
+    def _cache(cls):
+        return caches[cls.alias]
+
+    @staticmethod
+    def _version_key(listing_type: str) -> str:
+        return f"version:{listing_type}"
+
+    @classmethod
+    def versions(cls, listing_types: List[str]) -> List[int]:
+        keys = [cls._version_key(listing_type) for listing_type in listing_types]
+        versions = cls._cache().get_many(keys)
+        return [versions.get(key, 0) for key in keys]
+
+    @classmethod
+    def bump(cls, listing_types: List[str]) -> None:
+        """Invalidate every cached response covering one of the listing types
+
+        Args:
+            listing_types (List[str]): Listing types whose listings changed
+        """
+        cache = cls._cache()
+
+        for listing_type in listing_types:
+            key = cls._version_key(listing_type)
+
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, 1, timeout=None)
+
+    @classmethod
+    def key(cls, endpoint: str, listing_types: List[str], request: HttpRequest) -> str:
+        """Cache key of a search request, equal for requests differing only in parameter order, case or empty values
+
+        Args:
+            endpoint (str): Name of the search endpoint
+            listing_types (List[str]): Listing types returned by the endpoint
+            request (HttpRequest): Search request, including the page or cursor
+
+        Returns:
+            str: Cache key
+        """
+        # Empty values are ignored by the filters, except the cursor which switches the pagination mode
+        params = sorted(
+            (name, Location.normalize(value) if name in cls.folded_params else value)
+            for name, value in request.GET.items()
+            if value or name == 'cursor'
+        )
+        # Pagination links are absolute, responses differ per host
+        digest = hashlib.md5(repr((request.get_host(), params)).encode()).hexdigest()
+        versions = '.'.join(str(version) for version in cls.versions(listing_types))
+        return f"{endpoint}:{versions}:{digest}"
+
+    @classmethod
+    def get(cls, key: str) -> Any:
+        return cls._cache().get(key)
+
+    @classmethod
+    def set(cls, key: str, data: Any) -> None:
+        cls._cache().set(key, data)
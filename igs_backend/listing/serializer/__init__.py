@@ -0,0 +1,3 @@
+from .listing_cluster_serializer import ListingClusterSerializer
+from .listing_facet_serializer import ListingFacetsSerializer
+from .listing_card_serializer import ListingCardSerializer
@@ -0,0 +1,35 @@
+from rest_framework import serializers
+from igs_backend import settings
+from listing.enums.listing_type import LISTING_TYPE
+from property_images.enums.rendition_size import RENDITION_SIZE
+from shared.serializer import SparseFieldsMixin, image_url
+
+
+class ListingCardSerializer(SparseFieldsMixin, serializers.Serializer):
+    """Compact projection of a house, room or land for result lists and map popups"""
+    id = serializers.UUIDField(source='pk')
+    type = serializers.CharField(source='listing_type')
+    price = serializers.DecimalField(max_digits=32, decimal_places=2)
+    category = serializers.CharField()
+    status = serializers.CharField()
+    region = serializers.CharField(source='location.region')
+    district = serializers.CharField(source='location.district')
+    ward = serializers.CharField(source='location.ward')
+    street = serializers.CharField(source='location.street')
+    cover_image = serializers.SerializerMethodField()
+
+    field_columns = {
+        'id': [],
+        'type': [],
+        'cover_image': ['cover_image_id'],
+    }
+
+    def get_cover_image(self, obj):
+        """
+        Thumbnail URL of the cover image, land images are served from their own base URL.
+        """
+        if obj.cover_image_id is None:
+            return None
+
+        base_url = settings.LAND_IMAGE_BASE_URL if obj.listing_type == LISTING_TYPE.LAND.value else settings.PROPERTY_IMAGE_BASE_URL
+        return image_url(base_url, obj.cover_image_id, RENDITION_SIZE.THUMBNAIL.value)
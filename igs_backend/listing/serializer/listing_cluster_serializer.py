@@ -0,0 +1,10 @@
+from rest_framework import serializers
+
+
+class ListingClusterSerializer(serializers.Serializer):
+    cell = serializers.CharField()
+    count = serializers.IntegerField()
+    latitude = serializers.FloatField()
+    longitude = serializers.FloatField()
+    min_price = serializers.DecimalField(max_digits=32, decimal_places=2)
+    max_price = serializers.DecimalField(max_digits=32, decimal_places=2)
@@ -0,0 +1,28 @@
+from rest_framework import serializers
+
+
+class LocationFacetSerializer(serializers.Serializer):
+    id = serializers.UUIDField(allow_null=True)
+    name = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class ValueFacetSerializer(serializers.Serializer):
+    value = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class PriceBucketFacetSerializer(serializers.Serializer):
+    min_price = serializers.IntegerField()
+    max_price = serializers.IntegerField(allow_null=True)
+    count = serializers.IntegerField()
+
+
+class ListingFacetsSerializer(serializers.Serializer):
+    total = serializers.IntegerField()
+    regions = LocationFacetSerializer(many=True)
+    districts = LocationFacetSerializer(many=True)
+    categories = ValueFacetSerializer(many=True)
+    room_categories = ValueFacetSerializer(many=True)
+    zoning_types = ValueFacetSerializer(many=True)
+    price_buckets = PriceBucketFacetSerializer(many=True)
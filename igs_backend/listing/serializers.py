@@ -0,0 +1 @@
+from .serializer import *
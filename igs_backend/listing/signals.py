@@ -0,0 +1,90 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from account.models import Account
+from house.models import House
+from land.models import Land
+from listing.enums.listing_type import LISTING_TYPE
+from listing.models import ListingSearchIndex
+from listing.search_cache import SearchCache
+from location.models import Location
+from property.models import Property
+from property_images.models import LandImage, PropertyImage
+from property_images.signals import images_saved
+from room.models import Room
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_save, sender=House)
+@receiver(post_save, sender=Room)
+def sync_property_listing(sender, instance, **kwargs):
+    ListingSearchIndex.sync_property(property_id=instance.property_id)
+
+
+@receiver(post_save, sender=Land)
+def sync_land_listing(sender, instance, **kwargs):
+    ListingSearchIndex.sync_land(land_id=instance.land_id)
+
+
+@receiver(post_delete, sender=Property)
+@receiver(post_delete, sender=House)
+@receiver(post_delete, sender=Room)
+@receiver(post_delete, sender=Land)
+def remove_listing(sender, instance, **kwargs):
+    ListingSearchIndex.remove(listing_id=instance.pk)
+
+
+@receiver(post_save, sender=Location)
+def sync_location_listings(sender, instance, created, **kwargs):
+    if not created:
+        # Details embed the location and build their validators from updated_at
+        now = timezone.now()
+        Property.objects.filter(location_id=instance.location_id).update(updated_at=now)
+        Land.objects.filter(location_id=instance.location_id).update(updated_at=now)
+        ListingSearchIndex.sync_location(location_id=instance.location_id)
+
+
+@receiver(images_saved, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyImage)
+def sync_property_images(sender, instance=None, property=None, **kwargs):
+    property_id = property.property_id if property is not None else instance.property_id
+    ListingSearchIndex.sync_property(property_id=property_id)
+
+
+@receiver(images_saved, sender=LandImage)
+@receiver(post_delete, sender=LandImage)
+def sync_land_images(sender, instance=None, land=None, **kwargs):
+    land_id = land.land_id if land is not None else instance.land_id
+    ListingSearchIndex.sync_land(land_id=land_id)
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_save, sender=House)
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Property)
+@receiver(post_delete, sender=House)
+@receiver(post_delete, sender=Room)
+@receiver(post_save, sender=PropertyImage)
+@receiver(images_saved, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyImage)
+def invalidate_property_searches(sender, **kwargs):
+    # Bumped after the commit, a search running before it would cache the old listings under the new version
+    transaction.on_commit(lambda: SearchCache.bump([LISTING_TYPE.HOUSE.value, LISTING_TYPE.ROOM.value]))
+
+
+@receiver(post_save, sender=Land)
+@receiver(post_delete, sender=Land)
+@receiver(post_save, sender=LandImage)
+@receiver(images_saved, sender=LandImage)
+@receiver(post_delete, sender=LandImage)
+def invalidate_land_searches(sender, **kwargs):
+    transaction.on_commit(lambda: SearchCache.bump([LISTING_TYPE.LAND.value]))
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def invalidate_account_searches(sender, **kwargs):
+    # Paid flags order every search and inactive accounts hide their listings
+    transaction.on_commit(lambda: SearchCache.bump([listing_type.value for listing_type in LISTING_TYPE]))
@@ -0,0 +1,756 @@
+from datetime import timedelta
+from decimal import Decimal
+import math
+import unittest
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import Q
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from account.models import Account
+from booking.models import Booking
+from house.enums.availability_status import STATUS
+from house.models import House
+from house.serializers import ResponseHouseSerializer
+from land.enums.land_status import LAND_STATUS
+from land.models import Land
+from listing.models import HomepageFeedEntry, ListingSearchIndex
+from location.models import District, Location, Region
+from payment.enums.payment_status import PaymentStatus
+from payment.models import Payment
+from property.models import Property
+from property_images.models import LandImage, PropertyImage
+from room.models import Room
+from shared.pagination import ListingPagination
+from subscription_plan.models import SubscriptionPlan
+from rest_framework.test import APIClient
+from user.models import Agent, User
+from utils import geohash
+
+
+def seed_listings(total: int = 40) -> Agent:
+    """Seed agents, accounts, houses, rooms, land, bookings and payments for query tests
+
+    Args:
+        total (int, optional): Number of listings per type. Defaults to 40.
+
+    Returns:
+        Agent: The paid agent owning half of the listings
+    """
+    # The shared caches outlive the test database, entries of a previous run would show other rows
+    for alias in ('search', 'listing_fragments'):
+        caches[alias].clear()
+
+    free_plan = SubscriptionPlan.objects.create(name='Free', price=Decimal('0'), max_houses=1000, is_free=True)
+    paid_plan = SubscriptionPlan.objects.create(name='Premium', price=Decimal('10000'), max_houses=1000)
+
+    agents = []
+    for i in range(2):
+        agent = Agent.objects.create(
+            first_name='Test', last_name=f'Agent{i}', phone_number=f'07123456{i:02d}',
+            gender='Male', email=f'agent{i}@example.com'
+        )
+        Account.subscribe_free_account(plan=free_plan, agent=agent)
+        agents.append(agent)
+
+    region = Region.objects.create(name='Dar es Salaam')
+    districts = ['Kinondoni', 'Ilala', 'Temeke', 'Ubungo']
+    for name in districts:
+        District.objects.create(name=name, region=region)
+
+    for i in range(total):
+        agent = agents[i % 2]
+        location = Location.add_location(
+            region='Dar es Salaam', district=districts[i % len(districts)], ward=f'Ward {i % 5}',
+            street=f'Street {i}', latitude=Decimal('-6.8') + Decimal(i) / 1000, longitude=Decimal('39.2') + Decimal(i) / 1000
+        )
+
+        House.objects.create(
+            agent=agent, location=location, category='Sale', price=Decimal(100000 + i), description='House',
+            nearby_facilities='School', utilities='Water', total_bed_room=3, total_dining_room=1, total_bath_room=2,
+            status=STATUS.BOOKED.value if i % 7 == 0 else STATUS.AVAILABLE.value,
+        )
+        Room.objects.create(
+            agent=agent, location=location, category='Rental', rental_duration='1 Month', price=Decimal(50000 + i),
+            description='Room', nearby_facilities='Market', utilities='Power',
+        )
+        Land.objects.create(
+            agent=agent, location=location, land_size=Decimal('600'), price=Decimal(2000000 + i), description='Land',
+        )
+
+    # Subscribed once the listings exist, objects.create does not copy the paid flag like save_house does
+    Account.subscribe(plan=paid_plan, agent=agents[0])
+    ListingSearchIndex.objects.filter(listing_type__in=['House', 'Room']).update(image_count=1)
+
+    for house in House.objects.filter(status=STATUS.BOOKED.value):
+        Booking.objects.create(property=house, customer_name='Customer', customer_email='c@example.com', customer_phone_number='0755000000')
+        Payment.objects.create(amount=Decimal('2000'), property=house, phone_number='0755000000')
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+    return agents[0]
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Query plan checks need PostgreSQL")
+class ListingQueryPlanTestCase(TestCase):
+    """Fail when a hot query can only be answered with a sequential scan.
+
+    Sequential scans are disabled for the session, so the planner only picks one when no
+    index matches the query predicates.
+    """
+    hot_tables = ['listing_search_index', 'property', 'land', 'account', 'booking', 'payment']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = seed_listings()
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+
+    def assertIndexScan(self, queryset):
+        plan = queryset.explain()
+        for table in self.hot_tables:
+            self.assertNotIn(f"Seq Scan on {table} ", f"{plan}\n", msg=f"Sequential scan on {table}:\n{plan}")
+
+    def test_house_filter(self):
+        self.assertIndexScan(House.house_filter()[:21])
+        self.assertIndexScan(House.house_filter(category='Sale', region='Dar es Salaam', district='Ilala')[:21])
+        self.assertIndexScan(House.house_filter(min_price=Decimal('100010'), max_price=Decimal('100030'))[:21])
+        self.assertIndexScan(House.house_filter(district_id=District.objects.get(name='Ilala').district_id)[:21])
+        self.assertIndexScan(House.house_filter(q='school')[:21])
+        self.assertIndexScan(House.house_filter(near=(-6.79, 39.21, 2))[:21])
+        self.assertIndexScan(House.house_filter(bbox=(39.2, -6.8, 39.21, -6.79))[:21])
+
+    def test_room_filter(self):
+        self.assertIndexScan(Room.room_filter()[:21])
+        self.assertIndexScan(Room.room_filter(region='Dar es Salaam', ward='Ward 1')[:21])
+
+    def test_land_filter(self):
+        self.assertIndexScan(Land.land_filter()[:21])
+        self.assertIndexScan(Land.land_filter(min_price=Decimal('2000010'))[:21])
+        self.assertIndexScan(Land.land_filter(q='ardhi')[:21])
+
+    def test_public_search(self):
+        self.assertIndexScan(ListingSearchIndex.public_search()[:21])
+        self.assertIndexScan(ListingSearchIndex.public_search(listing_types=['House', 'Land'], min_price=Decimal('100010'))[:21])
+        self.assertIndexScan(ListingSearchIndex.public_search(q='school')[:21])
+
+    def test_demo_properties(self):
+        self.assertIndexScan(Property.demo_properties()[:21])
+
+    def test_agent_listings(self):
+        self.assertIndexScan(House.get_agent_houses(agent=self.agent))
+        self.assertIndexScan(Room.get_agent_rooms(agent=self.agent))
+        self.assertIndexScan(Land.get_agent_lands(agent=self.agent))
+
+    def test_booked_properties(self):
+        self.assertIndexScan(Booking.get_booked_properties(agent=self.agent))
+
+    def test_active_account(self):
+        self.assertIndexScan(Account.objects.filter(agent=self.agent, is_active=True)[:1])
+        self.assertIndexScan(Account.get_active_accounts())
+
+    def test_cursor_seek(self):
+        houses = House.house_filter()
+        paginator = ListingPagination()
+        paginator.model = ListingSearchIndex
+        paginator.ordering = tuple(houses.query.order_by)
+        row = houses[20]
+
+        seek = houses.filter(paginator.seek_filter([getattr(row, name.lstrip('-')) for name in paginator.ordering]))[:21]
+
+        # The scan starts at the cursor instead of filtering out every row before it
+        self.assertIndexScan(seek)
+        self.assertRegex(seek.explain(), r'Index Cond: .*ROW\(is_paid, listing_date\) <= ROW')
+
+    def test_pending_payments(self):
+        self.assertIndexScan(Payment.objects.filter(status=PaymentStatus.PENDING.value, payment_date__lt=timezone.now() - timedelta(days=1)))
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "GROUPING SETS need PostgreSQL")
+class ListingFacetTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_listings(total=20)
+
+    def test_facets_match_filter(self):
+        ilala = District.objects.get(name='Ilala')
+
+        for listings in [House.house_filter(), Room.room_filter(region='Dar es Salaam'), Land.land_filter(district_id=ilala.district_id)]:
+            facets = ListingSearchIndex.facets(listings)
+
+            self.assertEqual(facets['total'], listings.count())
+            self.assertEqual(sum(district['count'] for district in facets['districts']), facets['total'])
+            self.assertEqual(sum(bucket['count'] for bucket in facets['price_buckets']), facets['total'])
+
+    def test_facet_names(self):
+        facets = ListingSearchIndex.facets(Land.land_filter())
+
+        self.assertEqual([region['name'] for region in facets['regions']], ['Dar es Salaam'])
+        self.assertEqual({district['name'] for district in facets['districts']}, {'Kinondoni', 'Ilala', 'Temeke', 'Ubungo'})
+        self.assertEqual(facets['zoning_types'], [{'value': 'RESIDENTIAL', 'count': 20}])
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Query tests need PostgreSQL")
+class ListingSearchTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_listings(total=20)
+
+    def test_public_search_keeps_type_rules(self):
+        ListingSearchIndex.objects.filter(listing_type='House').update(image_count=0)
+        listings = ListingSearchIndex.public_search()
+
+        self.assertFalse(listings.filter(listing_type='House').exists())
+        self.assertEqual(listings.filter(listing_type='Room').count(), Room.room_filter().count())
+        self.assertEqual(listings.filter(listing_type='Land').count(), Land.land_filter().count())
+        self.assertEqual(
+            [instance.pk for instance in ListingSearchIndex.hydrate_listings(listings[:21])],
+            [row.listing_id for row in listings[:21]]
+        )
+
+    def test_location_names_match_rows_without_references(self):
+        houses = House.house_filter(district='kinondoni')
+        count = houses.count()
+        self.assertGreater(count, 0)
+
+        # Rows indexed before their references were backfilled only carry the names
+        ListingSearchIndex.objects.filter(pk=houses.first().pk).update(region_ref=None, district_ref=None)
+
+        self.assertEqual(House.house_filter(district='Kinondoni').count(), count)
+        self.assertEqual(House.house_filter(region='DAR ES SALAAM').count(), House.house_filter().count())
+
+    def test_keyword_search(self):
+        houses = list(House.objects.filter(agent=Agent.objects.get(last_name='Agent1'), status=STATUS.AVAILABLE.value)[:2])
+        Property.objects.filter(pk__in=[house.pk for house in houses]).update(image_count=1)
+        houses[0].image_count = houses[1].image_count = 1
+        houses[0].description = 'Nyumba nzuri karibu na shule'
+        houses[0].save()
+        houses[1].description = 'Close to the schools'
+        houses[1].save()
+
+        # Swahili words match as typed, English ones also match their stem
+        self.assertEqual(list(House.house_filter(q='shule').values_list('listing_id', flat=True)), [houses[0].pk])
+        self.assertEqual(House.house_filter(q='school').count(), House.house_filter().count())
+        # A match in the description outranks one in the nearby facilities
+        self.assertEqual(House.house_filter(q='school').filter(is_paid=False).first().listing_id, houses[1].pk)
+
+        response = self.client.get('/api/v2/house/houses/filter_houses/', {'q': 'shule', 'page_size': 5})
+        self.assertEqual([str(house['property_id']) for house in response.data['results']], [str(houses[0].pk)])
+
+    def test_geo_search(self):
+        latitude, longitude, radius_km = -6.79, 39.21, 1.0
+
+        def distance_km(row) -> float:
+            lat, lng = math.radians(float(row.latitude)), math.radians(float(row.longitude))
+            haversine = math.sin((lat - math.radians(latitude)) / 2) ** 2 + math.cos(lat) * math.cos(math.radians(latitude)) * math.sin((lng - math.radians(longitude)) / 2) ** 2
+            return 2 * geohash.EARTH_RADIUS_KM * math.asin(math.sqrt(haversine))
+
+        lands = Land.land_filter()
+        near = Land.land_filter(near=(latitude, longitude, radius_km))
+
+        self.assertEqual({row.pk for row in near}, {row.pk for row in lands if distance_km(row) <= radius_km})
+        self.assertTrue(0 < near.count() < lands.count())
+        self.assertTrue(all(abs(row.distance_km - distance_km(row)) < 1e-6 for row in near))
+
+        inside = Land.land_filter(bbox=(39.2, -6.8, 39.205, -6.795))
+        self.assertEqual(inside.count(), 6)
+
+        response = self.client.get('/api/v2/land/lands/land_filter/', {'lat': latitude, 'lng': longitude})
+        self.assertEqual(response.status_code, 400)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Query tests need PostgreSQL")
+class ListingSearchIndexSyncTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_listings(total=2)
+
+    def test_property_rows_follow_the_listing(self):
+        house = House.objects.filter(status=STATUS.AVAILABLE.value).first()
+        row = ListingSearchIndex.objects.get(pk=house.pk)
+        self.assertEqual((row.listing_type, row.price, row.is_available), ('House', house.price, True))
+
+        house.price = Decimal('150000')
+        house.save()
+        updated = ListingSearchIndex.objects.get(pk=house.pk)
+        self.assertEqual(updated.price, Decimal('150000'))
+        self.assertGreater(updated.version, row.version)
+
+        house.mark_booked()
+        self.assertFalse(ListingSearchIndex.objects.get(pk=house.pk).is_available)
+
+        house.delete()
+        self.assertFalse(ListingSearchIndex.objects.filter(pk=house.pk).exists())
+
+    def test_created_room_and_hidden_account(self):
+        agent = House.objects.first().agent
+        room = Room.objects.create(
+            agent=agent, location=Location.objects.first(), category='Rental', rental_duration='1 Month',
+            price=Decimal('70000'), description='Room', nearby_facilities='Market', utilities='Power',
+        )
+        self.assertEqual(ListingSearchIndex.objects.get(pk=room.pk).listing_type, 'Room')
+
+        Property.deactivate_active_properties(agent=agent)
+        self.assertFalse(ListingSearchIndex.objects.filter(listing_type__in=['House', 'Room'], agent=agent).exists())
+
+    def test_cover_image_follows_the_listing(self):
+        house = House.objects.first()
+        image = PropertyImage.objects.bulk_create([PropertyImage(property=house, image='property_images/cover.png')])[0]
+        Property.objects.filter(pk=house.pk).update(cover_image_id=image.pk, image_count=1)
+
+        ListingSearchIndex.sync_property(property_id=house.pk)
+        row = ListingSearchIndex.objects.get(pk=house.pk)
+
+        self.assertEqual((row.cover_image_id, row.image_count), (image.pk, 1))
+
+    def test_land_rows_follow_the_listing(self):
+        land = Land.objects.first()
+        self.assertTrue(ListingSearchIndex.objects.get(pk=land.pk).is_available)
+
+        land.status = LAND_STATUS.SOLD.name
+        land.save()
+        self.assertFalse(ListingSearchIndex.objects.get(pk=land.pk).is_available)
+
+        land.delete()
+        self.assertFalse(ListingSearchIndex.objects.filter(pk=land.pk).exists())
+
+    def test_location_edit_updates_every_listing(self):
+        location = Location.objects.first()
+        location.street = 'Mtaa Mpya'
+        location.latitude = Decimal('-6.7')
+        location.save()
+
+        rows = ListingSearchIndex.objects.filter(listing_id__in=[
+            *Property.objects.filter(location=location).values_list('pk', flat=True),
+            *Land.objects.filter(location=location).values_list('pk', flat=True),
+        ])
+
+        self.assertEqual(rows.count(), 3)
+        self.assertEqual({(row.street, row.latitude) for row in rows}, {('mtaa mpya', Decimal('-6.7'))})
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Query tests need PostgreSQL")
+class ListingCursorPaginationTestCase(TestCase):
+    url = '/api/v2/house/houses/filter_houses/'
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_listings(total=12)
+
+    def setUp(self):
+        caches['search'].clear()
+
+    def walk(self, page_size: int) -> list:
+        """Follow the next links from the first cursor page, returning the property IDs in page order"""
+        listing_ids = []
+        response = self.client.get(self.url, {'cursor': '', 'page_size': page_size})
+
+        while True:
+            self.assertEqual(response.status_code, 200, msg=response.content)
+            self.assertLessEqual(len(response.data['results']), page_size)
+            listing_ids += [str(listing['property_id']) for listing in response.data['results']]
+
+            if response.data['next'] is None:
+                return listing_ids
+
+            response = self.client.get(response.data['next'])
+
+    def expected(self) -> list:
+        return [str(listing_id) for listing_id in House.house_filter().values_list('listing_id', flat=True)]
+
+    def test_pages_cover_the_ranking_once(self):
+        self.assertEqual(self.walk(page_size=4), self.expected())
+
+    def test_ties_on_listing_date(self):
+        ListingSearchIndex.objects.filter(listing_type='House').update(listing_date=timezone.now())
+
+        listing_ids = self.walk(page_size=3)
+
+        self.assertEqual(listing_ids, self.expected())
+        self.assertEqual(len(set(listing_ids)), House.house_filter().count())
+
+    def test_last_page(self):
+        total = House.house_filter().count()
+        response = self.client.get(self.url, {'cursor': '', 'page_size': total})
+
+        self.assertEqual(len(response.data['results']), total)
+        self.assertIsNone(response.data['next'])
+        self.assertIsNone(response.data['previous'])
+
+    def test_tampered_cursor(self):
+        for cursor in ['not-a-cursor', 'WzFd', 'WyJ4IiwgIngiLCAieCJd']:
+            response = self.client.get(self.url, {'cursor': cursor})
+
+            self.assertEqual(response.status_code, 400, msg=cursor)
+            self.assertEqual(response.data, {'detail': 'Invalid cursor.'})
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Query tests need PostgreSQL")
+class PaidFlagTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = seed_listings(total=4)
+
+    def paid_flags(self, agent: Agent) -> set:
+        return {
+            *Property.objects.filter(agent=agent).values_list('is_paid', flat=True),
+            *Land.objects.filter(agent=agent).values_list('is_paid', flat=True),
+            *ListingSearchIndex.objects.filter(agent=agent).values_list('is_paid', flat=True),
+        }
+
+    def test_paid_agent_ranks_first(self):
+        free_agent = Agent.objects.exclude(pk=self.agent.pk).get()
+
+        self.assertEqual(self.paid_flags(self.agent), {True})
+        self.assertEqual(self.paid_flags(free_agent), {False})
+        self.assertEqual(House.house_filter().first().agent_id, self.agent.pk)
+
+    def test_expired_account_clears_the_flag(self):
+        account = Account.get_account(agent=self.agent)
+        Account.objects.filter(pk=account.pk).update(end_date=timezone.now() - timedelta(days=1))
+        account.refresh_from_db()
+        rows = ListingSearchIndex.objects.filter(agent=self.agent)
+        updated_at = max(rows.values_list('updated_at', flat=True))
+
+        self.assertTrue(account.expire_account())
+        self.assertEqual(self.paid_flags(self.agent), {False})
+        self.assertTrue(all(row_updated_at > updated_at for row_updated_at in rows.values_list('updated_at', flat=True)))
+
+
+class GeohashTestCase(SimpleTestCase):
+    def test_parse_bbox(self):
+        self.assertEqual(geohash.parse_bbox('39.2,-6.8,39.3,-6.7'), (39.2, -6.8, 39.3, -6.7))
+        self.assertIsNone(geohash.parse_bbox(''))
+
+        for bbox in ['1,2,3', 'a,b,c,d', 'nan,nan,nan,nan', '39.2,-6.8,inf,-6.7', '-inf,-6.8,39.3,-6.7', '181,0,182,1', '0,-91,1,0', '39.3,-6.8,39.2,-6.7']:
+            with self.subTest(bbox=bbox), self.assertRaises(ValueError):
+                geohash.parse_bbox(bbox)
+
+    def test_covering_tiles(self):
+        self.assertEqual(geohash.covering_tiles(-180, -90, 180, 90, precision=0), [''])
+
+        tiles = geohash.covering_tiles(39.2, -6.8, 39.3, -6.7, precision=4)
+        self.assertEqual(len(tiles), len(set(tiles)))
+        for step in range(11):
+            for corner in range(11):
+                latitude, longitude = -6.8 + step / 100, 39.2 + corner / 100
+                self.assertIn(geohash.encode(latitude, longitude, 4), tiles)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Query tests need PostgreSQL")
+class HomepageFeedTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_listings(total=10)
+
+        for listing_id in ListingSearchIndex.objects.values_list('listing_id', flat=True):
+            HomepageFeedEntry.refresh(listing_id=listing_id)
+
+    def setUp(self):
+        caches['search'].clear()
+
+    def test_feed_follows_demo_order(self):
+        demo = list(Property.demo_properties().values_list('listing_id', flat=True))
+
+        self.assertEqual([entry.listing_id for entry in HomepageFeedEntry.feed()], demo)
+        self.assertEqual(HomepageFeedEntry.cached_count(), len(demo))
+
+    def test_count_is_cached_until_the_properties_change(self):
+        count = HomepageFeedEntry.cached_count()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(HomepageFeedEntry.cached_count(), count)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Room.objects.first().delete()
+
+        self.assertEqual(HomepageFeedEntry.cached_count(), count - 1)
+        self.assertEqual(self.client.get('/api/v2/property/properties/demo_property/').data['count'], count - 1)
+
+    def test_refresh_drops_listings_without_images(self):
+        row = ListingSearchIndex.objects.filter(listing_type='Room').first()
+        ListingSearchIndex.objects.filter(pk=row.pk).update(image_count=0)
+        HomepageFeedEntry.refresh(listing_id=row.pk)
+
+        self.assertFalse(HomepageFeedEntry.objects.filter(pk=row.pk).exists())
+        self.assertEqual(HomepageFeedEntry.objects.count(), 19)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Query tests need PostgreSQL")
+class ListingQueryBudgetTestCase(TestCase):
+    """Every listing endpoint runs a fixed number of queries, whatever the number of rows it renders."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = seed_listings(total=30)
+
+        PropertyImage.objects.bulk_create([
+            PropertyImage(property=property, image=f'property_images/{property.pk}-{i}.png')
+            for property in Property.objects.all() for i in range(2)
+        ])
+        LandImage.objects.bulk_create([
+            LandImage(land=land, image=f'land_images/{land.pk}-{i}.png')
+            for land in Land.objects.all() for i in range(2)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.get(pk=self.agent.pk))
+
+    def count_queries(self, url: str, **params) -> int:
+        caches['search'].clear()
+        caches['listing_fragments'].clear()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        return len(context)
+
+    def assertQueryBudget(self, url: str, budget: int, **params):
+        """Fail when the endpoint runs more than `budget` queries or when the count grows with the page size"""
+        # The first request also loads what Django caches per process, such as content types
+        self.count_queries(url, **params)
+        counts = [self.count_queries(url, page_size=page_size, **params) for page_size in (5, 20)]
+
+        self.assertEqual(counts[0], counts[1], msg=f"Query count of {url} depends on the page size: {counts}")
+        self.assertLessEqual(counts[1], budget, msg=f"{url} ran {counts[1]} queries")
+
+    def test_public_filters(self):
+        self.assertQueryBudget('/api/v2/house/houses/filter_houses/', 4)
+        self.assertQueryBudget('/api/v2/room/rooms/room_filter/', 4)
+        self.assertQueryBudget('/api/v2/land/lands/land_filter/', 4)
+        self.assertQueryBudget('/api/v2/house/houses/filter_houses/', 3, view='card')
+        self.assertQueryBudget('/api/v2/listings/search/', 5)
+
+    def test_agent_listings(self):
+        self.assertQueryBudget('/api/v2/house/houses/list_houses/', 4)
+        self.assertQueryBudget('/api/v2/room/rooms/room_list/', 4)
+        self.assertQueryBudget('/api/v2/land/lands/land_list/', 4)
+        self.assertQueryBudget('/api/v2/booking/bookings/agent_booked_properties/', 4)
+
+    def test_details(self):
+        house = House.objects.filter(agent=self.agent).first()
+        land = Land.objects.filter(agent=self.agent).first()
+
+        self.assertLessEqual(self.count_queries(f'/api/v2/house/houses/{house.pk}/house_detail/'), 3)
+        self.assertLessEqual(self.count_queries(f'/api/v2/land/lands/{land.pk}/retrieve_land_details/'), 3)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Query tests need PostgreSQL")
+class FastListRenderingTestCase(TestCase):
+    """The values() and orjson path of the public lists returns the same bytes as the DRF serializers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_listings(total=10)
+
+        PropertyImage.objects.bulk_create([
+            PropertyImage(property=property, image=f'property_images/{property.pk}.png') for property in Property.objects.all()
+        ])
+        LandImage.objects.bulk_create([LandImage(land=land, image=f'land_images/{land.pk}.png') for land in Land.objects.all()])
+
+        for listing_id in ListingSearchIndex.objects.values_list('listing_id', flat=True):
+            HomepageFeedEntry.refresh(listing_id=listing_id)
+
+    def assertSameOutput(self, url: str, **params):
+        contents = []
+
+        for enabled in (True, False):
+            caches['search'].clear()
+            caches['listing_fragments'].clear()
+
+            with self.settings(FAST_LIST_RENDERING=enabled):
+                response = self.client.get(url, params)
+
+            self.assertEqual(response.status_code, 200, msg=response.content)
+            contents.append(response.content)
+
+        self.assertEqual(contents[0], contents[1], msg=url)
+
+    def test_public_lists(self):
+        self.assertSameOutput('/api/v2/house/houses/filter_houses/')
+        self.assertSameOutput('/api/v2/house/houses/filter_houses/', fields='price,location,cover_image', page_size=5)
+        self.assertSameOutput('/api/v2/house/houses/filter_houses/', view='card')
+        self.assertSameOutput('/api/v2/room/rooms/room_filter/')
+        self.assertSameOutput('/api/v2/land/lands/land_filter/')
+        self.assertSameOutput('/api/v2/property/properties/demo_property/')
+
+    def test_location_lists(self):
+        region = Region.objects.get()
+        # JSONRenderer escapes the JavaScript line separators
+        Region.objects.filter(pk=region.pk).update(name='Dar es\u2028Salaam')
+
+        self.assertSameOutput('/api/v2/location/regions/list_regions/')
+        self.assertSameOutput('/api/v2/location/districts/list_districts/')
+        self.assertSameOutput(f'/api/v2/location/districts/{region.pk}/retrieve_region_districts/')
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Query tests need PostgreSQL")
+class ListingFragmentCacheTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_listings(total=10)
+
+    def setUp(self):
+        caches['listing_fragments'].clear()
+
+    def rows(self):
+        return list(ListingSearchIndex.objects.filter(listing_type='House').order_by('listing_id')[:5])
+
+    def render(self, rows, fields=None):
+        return ListingSearchIndex.render(rows, model=House, serializer_class=ResponseHouseSerializer, fields=fields)
+
+    def test_cached_page_needs_no_query(self):
+        rows = self.rows()
+        rendered = self.render(rows)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.render(rows), rendered)
+
+        self.assertEqual([listing['property_id'] for listing in rendered], [row.listing_id for row in rows])
+
+    def test_new_version_renders_again(self):
+        rows = self.rows()
+        self.render(rows)
+        self.render(rows, fields=['price'])
+
+        house = House.objects.get(pk=rows[2].listing_id)
+        house.price = Decimal('123456')
+        house.save()
+
+        rows = self.rows()
+        with self.assertNumQueries(2):
+            rendered = self.render(rows)
+
+        self.assertEqual(rendered[2]['price'], '123456.00')
+        self.assertEqual(self.render(rows, fields=['price'])[2], {'price': '123456.00'})
+
+    def test_paid_flag_renders_again(self):
+        row = ListingSearchIndex.objects.filter(listing_type='House', is_paid=False).first()
+        self.render([row])
+
+        Account.subscribe(plan=SubscriptionPlan.objects.get(name='Premium'), agent=row.agent)
+        row = ListingSearchIndex.objects.get(pk=row.pk)
+
+        self.assertTrue(row.is_paid)
+        with self.assertNumQueries(2):
+            self.render([row])
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Query tests need PostgreSQL")
+class ListingClusterTestCase(TestCase):
+    url = '/api/v2/property/clusters/'
+    bbox = '39.19,-6.81,39.22,-6.78'
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_listings(total=10)
+
+    def setUp(self):
+        caches['search'].clear()
+
+    def clustered_count(self) -> int:
+        response = self.client.get(self.url, {'bbox': self.bbox, 'zoom': 14})
+        self.assertEqual(response.status_code, 200)
+        return sum(cluster['count'] for cluster in response.data)
+
+    def test_clusters_count_the_live_listings(self):
+        # Every seeded listing lies inside the box
+        live = ListingSearchIndex.objects.filter(Q(listing_type='Land') | Q(image_count__gt=0), is_available=True)
+        self.assertEqual(self.clustered_count(), live.count())
+
+    def test_rejects_bad_boxes(self):
+        for params in [{'bbox': 'nan,nan,nan,nan', 'zoom': 3}, {'bbox': '39.2,-6.8,inf,-6.7', 'zoom': 3}, {'bbox': '1,2,3', 'zoom': 3}, {'bbox': self.bbox, 'zoom': 'x'}, {'zoom': 3}, {'bbox': '-180,-90,180,90', 'zoom': 20}]:
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, 400)
+
+    def test_booking_a_house_drops_it_from_the_cached_clusters(self):
+        before = self.clustered_count()
+        house = House.objects.filter(status=STATUS.AVAILABLE.value).first()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            house.mark_booked()
+
+        self.assertEqual(self.clustered_count(), before - 1)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Query tests need PostgreSQL")
+class SearchCacheTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_listings(total=4)
+        # Saving a listing copies the image counter of the property into the index
+        Property.objects.update(image_count=1)
+
+    def setUp(self):
+        caches['search'].clear()
+
+    def prices(self, url: str) -> set:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        return {Decimal(str(listing['price'])) for listing in response.data['results']}
+
+    def assertInvalidatedOnCommit(self, url: str, listing):
+        old_price, new_price = listing.price, listing.price + 1
+        self.assertIn(old_price, self.prices(url))
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            listing.price = new_price
+            listing.save()
+
+        # The cached response is kept until the write commits
+        self.assertIn(old_price, self.prices(url))
+
+        for callback in callbacks:
+            callback()
+
+        prices = self.prices(url)
+        self.assertIn(new_price, prices)
+        self.assertNotIn(old_price, prices)
+
+    def test_writes_invalidate_cached_filters(self):
+        self.assertInvalidatedOnCommit('/api/v2/house/houses/filter_houses/', House.objects.filter(status=STATUS.AVAILABLE.value).first())
+        self.assertInvalidatedOnCommit('/api/v2/room/rooms/room_filter/', Room.objects.first())
+        self.assertInvalidatedOnCommit('/api/v2/land/lands/land_filter/', Land.objects.first())
+
+    def test_writes_invalidate_cached_searches(self):
+        self.assertInvalidatedOnCommit('/api/v2/listings/search/', Land.objects.first())
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Query tests need PostgreSQL")
+class ListingSparseFieldsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_listings(total=55)
+
+    def setUp(self):
+        caches['search'].clear()
+
+    def results(self, url: str, **params) -> list:
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        return response.data['results']
+
+    def test_card_view(self):
+        cards = self.results('/api/v2/house/houses/filter_houses/', view='card', page_size=5)
+
+        self.assertEqual(len(cards), 5)
+        self.assertEqual(set(cards[0]), {'id', 'type', 'price', 'category', 'status', 'region', 'district', 'ward', 'street', 'cover_image'})
+        self.assertEqual({card['type'] for card in cards}, {'House'})
+
+    def test_fields(self):
+        self.assertEqual(set(self.results('/api/v2/house/houses/filter_houses/', view='card', fields='price,cover_image')[0]), {'price', 'cover_image'})
+        self.assertEqual(set(self.results('/api/v2/land/lands/land_filter/', fields='price,location')[0]), {'price', 'location'})
+
+        response = self.client.get('/api/v2/room/rooms/room_filter/', {'fields': 'price,owner_password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_page_size_is_capped(self):
+        self.assertEqual(len(self.results('/api/v2/room/rooms/room_filter/', page_size=5)), 5)
+        self.assertEqual(len(self.results('/api/v2/room/rooms/room_filter/', page_size=500)), ListingPagination.max_page_size)
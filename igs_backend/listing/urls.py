@@ -0,0 +1,8 @@
+from rest_framework.routers import DefaultRouter
+from . import views
+
+router = DefaultRouter()
+
+router.register(r'facets', views.FacetViewSet, basename='facet')
+router.register(r'search', views.SearchViewSet, basename='search')
+urlpatterns = router.urls
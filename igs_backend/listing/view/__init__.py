@@ -0,0 +1,2 @@
+from .facet_view import FacetViewSet
+from .search_view import SearchViewSet
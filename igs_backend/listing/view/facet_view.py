@@ -0,0 +1,155 @@
+from decimal import Decimal
+import uuid
+from django.http import HttpRequest
+from rest_framework import viewsets, permissions, status
+from rest_framework.response import Response
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from house.enums.room_category import ROOM_CATEGORY
+from house.models import House
+from land.models import Land
+from listing.enums.listing_type import LISTING_TYPE
+from listing.models import ListingSearchIndex
+from listing.serializers import ListingFacetsSerializer
+from room.models import Room
+from shared.seriaizers import DetailResponseSerializer
+from utils import geohash
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+class FacetViewSet(viewsets.ViewSet):
+    permission_classes = [permissions.AllowAny]
+
+    @swagger_auto_schema(
+        operation_description="Count the listings matching a house, room or land filter per region, district, category, room category, zoning type and price bucket",
+        operation_summary="Listing filter facets",
+        tags=["Listing"],
+        responses={
+            200: openapi.Response(
+                description="Facet counts",
+                schema=ListingFacetsSerializer(many=False)
+            ),
+            400: openapi.Response(
+                description="Bad request",
+                schema=DetailResponseSerializer(many=False)
+            ),
+            500: openapi.Response(
+                description="Internal server error",
+                schema=DetailResponseSerializer(many=False)
+            ),
+        },
+        manual_parameters=[
+            openapi.Parameter(
+                'listing_type', openapi.IN_QUERY, description="Listing type to count, takes the parameters of its filter endpoint",
+                type=openapi.TYPE_STRING, enum=[listing_type.value for listing_type in LISTING_TYPE], required=True
+            ),
+            openapi.Parameter(
+                'category', openapi.IN_QUERY, description="Category of the house or land", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'roomCategory', openapi.IN_QUERY, description="Category of the rooms", type=openapi.TYPE_STRING,
+                enum=[category.value for category in ROOM_CATEGORY]
+            ),
+            openapi.Parameter(
+                'region', openapi.IN_QUERY, description="Region of the listing location", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'district', openapi.IN_QUERY, description="District of the listing location", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'ward', openapi.IN_QUERY, description="Ward of the listing location", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'street', openapi.IN_QUERY, description="Street of the listing location", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'minPrice', openapi.IN_QUERY, description="Minimum price of the listing", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'maxPrice', openapi.IN_QUERY, description="Maximum price of the listing", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'region_id', openapi.IN_QUERY, description="Region ID of the listing location, takes precedence over region", type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+            ),
+            openapi.Parameter(
+                'district_id', openapi.IN_QUERY, description="District ID of the listing location, takes precedence over district", type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+            ),
+            openapi.Parameter(
+                'q', openapi.IN_QUERY, description="Keywords to search in the description, nearby facilities and utilities", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'lat', openapi.IN_QUERY, description="Latitude of the search center, requires lng and radius_km", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'lng', openapi.IN_QUERY, description="Longitude of the search center, requires lat and radius_km", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'radius_km', openapi.IN_QUERY, description="Only listings within this many kilometers of lat/lng (max 200)", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'bbox', openapi.IN_QUERY, description="Only listings inside the map box `min_lng,min_lat,max_lng,max_lat`", type=openapi.TYPE_STRING
+            ),
+        ]
+    )
+    def list(self, request: HttpRequest):
+        listing_type: str = request.GET.get('listing_type')
+        category: str = request.GET.get('category')
+        room_category: str = request.GET.get('roomCategory')
+        region: str = request.GET.get('region')
+        district: str = request.GET.get('district')
+        min_price: str = request.GET.get('minPrice')
+        max_price: str = request.GET.get('maxPrice')
+        street: str = request.GET.get('street')
+        ward: str = request.GET.get('ward')
+        region_id: str = request.GET.get('region_id')
+        district_id: str = request.GET.get('district_id')
+        q: str = request.GET.get('q')
+
+        if listing_type not in [listing_type.value for listing_type in LISTING_TYPE]:
+            return Response({"detail": "Invalid listing type."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            min_price = Decimal(min_price) if min_price else None
+            max_price = Decimal(max_price) if max_price else None
+        except Exception:
+            return Response({"detail": "Invalid price format."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            region_id = uuid.UUID(region_id) if region_id else None
+            district_id = uuid.UUID(district_id) if district_id else None
+        except ValueError:
+            return Response({"detail": "Invalid region or district ID."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            near = geohash.parse_radius(request.GET.get('lat'), request.GET.get('lng'), request.GET.get('radius_km'))
+            bbox = geohash.parse_bbox(request.GET.get('bbox'))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        filters = {
+            'region': region, 'district': district, 'min_price': min_price, 'max_price': max_price, 'street': street,
+            'ward': ward, 'region_id': region_id, 'district_id': district_id, 'q': q, 'near': near, 'bbox': bbox,
+        }
+
+        try:
+            if listing_type == LISTING_TYPE.HOUSE.value:
+                filters['category'] = category
+                listings = House.house_filter(**filters)
+            elif listing_type == LISTING_TYPE.ROOM.value:
+                filters['room_category'] = room_category
+                listings = Room.room_filter(**filters)
+            else:
+                filters['category'] = category
+                listings = Land.land_filter(**filters)
+
+            facets = ListingSearchIndex.facets(listings, cache_key=ListingSearchIndex.facet_cache_key(listing_type, **filters))
+            serializer = ListingFacetsSerializer(facets)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        except ValueError as e:
+            logger.error(f"Validation error occurred: {e}", exc_info=True)
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"Unexpected error occurred: {e}", exc_info=True)
+            return Response({"detail": f"An unexpected error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,187 @@
+from decimal import Decimal
+import uuid
+from django.http import HttpRequest
+from rest_framework import viewsets, permissions, status
+from rest_framework.response import Response
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from house.enums.room_category import ROOM_CATEGORY
+from land.models import Land
+from listing.enums.listing_type import LISTING_TYPE
+from listing.models import ListingSearchIndex
+from listing.search_cache import SearchCache
+from listing.serializers import ListingCardSerializer
+from shared.mixins import CachedSearchMixin
+from shared.pagination import ListingPagination
+from shared.seriaizers import DetailResponseSerializer
+from shared.serializer import SparseFieldsMixin
+from utils import geohash
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+class SearchViewSet(CachedSearchMixin, viewsets.ViewSet):
+    permission_classes = [permissions.AllowAny]
+    cache_control = {
+        'list': {'public': True, 'max_age': 30},
+    }
+
+    @swagger_auto_schema(
+        operation_description="Search houses, rooms and land together, paid listings first then the newest or the most relevant. Each result carries its `type`",
+        operation_summary="Search every listing type",
+        tags=["Listing"],
+        responses={
+            200: openapi.Response(
+                description="Listing cards of every type",
+                schema=ListingCardSerializer(many=True)
+            ),
+            304: openapi.Response(
+                description="Not modified since the ETag or date sent"
+            ),
+            400: openapi.Response(
+                description="Bad request",
+                schema=DetailResponseSerializer(many=False)
+            ),
+            500: openapi.Response(
+                description="Internal server error",
+                schema=DetailResponseSerializer(many=False)
+            ),
+        },
+        manual_parameters=[
+            openapi.Parameter(
+                'types', openapi.IN_QUERY, description="Comma separated listing types to include (House, Room, Land), every type when empty", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'category', openapi.IN_QUERY, description="Category of the house or land, rooms are always listed for rent", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'roomCategory', openapi.IN_QUERY, description="Category of the rooms", type=openapi.TYPE_STRING,
+                enum=[category.value for category in ROOM_CATEGORY]
+            ),
+            openapi.Parameter(
+                'region', openapi.IN_QUERY, description="Region of the listing location", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'district', openapi.IN_QUERY, description="District of the listing location", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'ward', openapi.IN_QUERY, description="Ward of the listing location", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'street', openapi.IN_QUERY, description="Street of the listing location", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'minPrice', openapi.IN_QUERY, description="Minimum price of the listing", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'maxPrice', openapi.IN_QUERY, description="Maximum price of the listing", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'region_id', openapi.IN_QUERY, description="Region ID of the listing location, takes precedence over region", type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+            ),
+            openapi.Parameter(
+                'district_id', openapi.IN_QUERY, description="District ID of the listing location, takes precedence over district", type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+            ),
+            openapi.Parameter(
+                'q', openapi.IN_QUERY, description="Keywords to search in the description, nearby facilities and utilities", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'lat', openapi.IN_QUERY, description="Latitude of the search center, requires lng and radius_km", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'lng', openapi.IN_QUERY, description="Longitude of the search center, requires lat and radius_km", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'radius_km', openapi.IN_QUERY, description="Only listings within this many kilometers of lat/lng (max 200)", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'bbox', openapi.IN_QUERY, description="Only listings inside the map box `min_lng,min_lat,max_lng,max_lat`", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'fields', openapi.IN_QUERY, description="Comma separated card fields to return, every field when empty", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'page_size', openapi.IN_QUERY, description="Number of listings per page (max 50)", type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'cursor', openapi.IN_QUERY, description="Keyset pagination cursor, send it empty for the first page and follow `next`", type=openapi.TYPE_STRING
+            ),
+        ]
+    )
+    def list(self, request: HttpRequest):
+        listing_types: str = request.GET.get('types')
+        category: str = request.GET.get('category')
+        room_category: str = request.GET.get('roomCategory')
+        region: str = request.GET.get('region')
+        district: str = request.GET.get('district')
+        min_price: str = request.GET.get('minPrice')
+        max_price: str = request.GET.get('maxPrice')
+        street: str = request.GET.get('street')
+        ward: str = request.GET.get('ward')
+        region_id: str = request.GET.get('region_id')
+        district_id: str = request.GET.get('district_id')
+        q: str = request.GET.get('q')
+
+        listing_types = sorted({listing_type.strip() for listing_type in (listing_types or '').split(',') if listing_type.strip()})
+        listing_types = listing_types or [listing_type.value for listing_type in LISTING_TYPE]
+
+        if room_category and not ROOM_CATEGORY.valid(room_category=room_category):
+            return Response({"detail": f"Invalid room category: {room_category}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            min_price = Decimal(min_price) if min_price else None
+            max_price = Decimal(max_price) if max_price else None
+        except Exception:
+            return Response({"detail": "Invalid price format."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            region_id = uuid.UUID(region_id) if region_id else None
+            district_id = uuid.UUID(district_id) if district_id else None
+        except ValueError:
+            return Response({"detail": "Invalid region or district ID."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            near = geohash.parse_radius(request.GET.get('lat'), request.GET.get('lng'), request.GET.get('radius_km'))
+            bbox = geohash.parse_bbox(request.GET.get('bbox'))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        cache_key = SearchCache.key('listing_search', listing_types, request)
+        cached = self.cached_search_response(request, cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            listings = ListingSearchIndex.public_search(
+                listing_types=listing_types,
+                category=category,
+                room_category=room_category,
+                region=region,
+                district=district,
+                region_id=region_id,
+                district_id=district_id,
+                ward=ward,
+                street=street,
+                min_price=min_price,
+                max_price=max_price,
+                q=q,
+                near=near,
+                bbox=bbox,
+            )
+
+            fields = SparseFieldsMixin.parse_fields(request.GET.get('fields'))
+            # The card columns have the same names on houses, rooms and land
+            only = ListingCardSerializer.get_only(Land, fields)
+
+            def render(rows):
+                return ListingCardSerializer(ListingSearchIndex.hydrate_listings(rows, only=only), many=True, fields=fields).data
+
+            return self.search_response(request, cache_key, listings, ListingPagination(), render)
+
+        except ValueError as e:
+            logger.error(f"Validation error occurred: {e}", exc_info=True)
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"Unexpected error occurred: {e}", exc_info=True)
+            return Response({"detail": f"An unexpected error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from location.models import Location
+
+
+class Command(BaseCommand):
+    help = "Populate region, district and ward references and the normalized street of existing locations"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Recompute every location, not only the ones missing a district reference")
+
+    def handle(self, *args, **options):
+        locations = Location.objects.all() if options['all'] else Location.objects.filter(district_ref__isnull=True)
+        updated = 0
+
+        for location in locations.iterator():
+            location.populate_references()
+            location.save(update_fields=['region_ref', 'district_ref', 'ward_ref', 'street_normalized'])
+            updated += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} locations"))
@@ -3,6 +3,10 @@ from django.db import models
 import uuid
 import logging
 
+from .district import District
+from .region import Region
+from .ward import Ward
+
 logger = logging.getLogger(__name__)
 
 class Location(models.Model):
@@ -13,6 +17,10 @@ class Location(models.Model):
     street = models.CharField(max_length=255, null=False, blank=False)
     latitude = models.DecimalField(max_digits=11, decimal_places=8)
     longitude = models.DecimalField(max_digits=11, decimal_places=8)
+    region_ref = models.ForeignKey(Region, on_delete=models.SET_NULL, null=True, blank=True, related_name="locations")
+    district_ref = models.ForeignKey(District, on_delete=models.SET_NULL, null=True, blank=True, related_name="locations")
+    ward_ref = models.ForeignKey(Ward, on_delete=models.SET_NULL, null=True, blank=True, related_name="locations")
+    street_normalized = models.CharField(max_length=255, null=False, blank=True, default='', db_index=True)
 
     class Meta:
         db_table = 'location'
@@ -21,8 +29,27 @@ class Location(models.Model):
     def __str__(self) -> str:
         return f'{self.district} {self.ward}, {self.region}'
 
+    @staticmethod
+    def normalize(value: str) -> str:
+        """Normalize a free text location name for equality lookups"""
+        return (value or '').strip().lower()
+
+    def populate_references(self, district_ref: District = None) -> None:
+        """Resolve the region, district and ward references from the location names and normalize the street
+
+        Args:
+            district_ref (District, optional): Already resolved district, looked up by name when not provided. Defaults to None.
+        """
+        if district_ref is None:
+            district_ref = District.objects.select_related('region').filter(name__iexact=self.district.strip()).first()
+
+        self.district_ref = district_ref
+        self.region_ref = district_ref.region if district_ref else Region.objects.filter(name__iexact=self.region.strip()).first()
+        self.ward_ref = Ward.objects.filter(name__iexact=self.ward.strip()).first() if self.ward else None
+        self.street_normalized = self.normalize(self.street)
+
     @classmethod
-    def add_location(cls, region: str, district: str, ward: str, street: str, latitude: Decimal, longitude: Decimal) -> 'Location':
+    def add_location(cls, region: str, district: str, ward: str, street: str, latitude: Decimal, longitude: Decimal, district_ref: District = None) -> 'Location':
         """This method creates a new location in the database and returns the instance of the newly added location.
 
         Args:
@@ -31,6 +58,7 @@ class Location(models.Model):
             ward (str): Ward name as a string.
             latitude (Decimal): Latitude.
             longitude (Decimal): Longitude.
+            district_ref (District, optional): District instance the location belongs to. Defaults to None.
 
         Returns:
             Location: The newly created Location instance.
@@ -43,6 +71,7 @@ class Location(models.Model):
             latitude=latitude,
             longitude=longitude
         )
+        location.populate_references(district_ref=district_ref)
         location.save()
         logger.info(f"Location saved successfully to the database: {location}")
         return location
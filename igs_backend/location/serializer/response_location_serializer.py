@@ -5,4 +5,4 @@ from location.models import Location
 class ResponseLocationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Location
-        fields = '__all__'
\ No newline at end of file
+        exclude = ['region_ref', 'district_ref', 'ward_ref', 'street_normalized']
\ No newline at end of file
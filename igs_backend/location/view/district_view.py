@@ -2,6 +2,9 @@ import uuid
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
+from shared.renderers import ORJSONRenderer
+from shared.serializer import RowConverter
 from drf_yasg.utils import swagger_auto_schema
 from location.models import District, Region
 from location.serializers import *
@@ -107,7 +110,7 @@ class DistrictViewSet(viewsets.ModelViewSet):
             )
         ]
     )
-    @action(detail=False, methods=['get'], url_path='(?P<region_id>[^/]+)/retrieve_region_districts')
+    @action(detail=False, methods=['get'], url_path='(?P<region_id>[^/]+)/retrieve_region_districts', renderer_classes=[ORJSONRenderer, BrowsableAPIRenderer])
     def retrieve_region_districts(self, request, region_id: uuid.UUID):
         """Retrieve districts for a specific region by region ID."""
         try:
@@ -118,8 +121,7 @@ class DistrictViewSet(viewsets.ModelViewSet):
 
             districts = District.get_districts_by_region(region=region)
 
-            serializer = ResponseDistrictSerializer(districts, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(RowConverter.serialize(ResponseDistrictSerializer, districts), status=status.HTTP_200_OK)
 
         except Exception as e:
             # Handle any errors during the request
@@ -133,11 +135,10 @@ class DistrictViewSet(viewsets.ModelViewSet):
         tags=["Location"],
         responses={200: ResponseDistrictSerializer(many=True)},
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=[ORJSONRenderer, BrowsableAPIRenderer])
     def list_districts(self, request):
         """List all districts."""
         districts = District.get_all_districts()
-        serializer = ResponseDistrictSerializer(districts, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return Response(data=RowConverter.serialize(ResponseDistrictSerializer, districts), status=status.HTTP_200_OK)
     
 # 612939fb-10d2-4cb8-86a8-449ec2b688ae
@@ -3,6 +3,9 @@ from authentication.custom_permissions import *
 from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
+from shared.renderers import ORJSONRenderer
+from shared.serializer import RowConverter
 from django.core.exceptions import ValidationError
 from location.models import Region
 from location.serializers import *
@@ -85,9 +88,8 @@ class RegionViewSet(viewsets.ViewSet):
         tags=["Location"],
         responses={200: ResponseRegionSerializer(many=True)},
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=[ORJSONRenderer, BrowsableAPIRenderer])
     def list_regions(self, request):
         """List all regions."""
         regions = Region.get_regions()
-        serializer = ResponseRegionSerializer(regions, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return Response(data=RowConverter.serialize(ResponseRegionSerializer, regions), status=status.HTTP_200_OK)
@@ -2,6 +2,9 @@ import uuid
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
+from shared.renderers import ORJSONRenderer
+from shared.serializer import RowConverter
 from drf_yasg.utils import swagger_auto_schema
 from location.models import Ward, Street
 from location.serializers import RequestStreetSerializer
@@ -65,7 +68,7 @@ class StreetViewSet(viewsets.ModelViewSet):
             )
         ]
     )
-    @action(detail=False, methods=['get'], url_path='(?P<ward_id>[^/]+)/retrieve_ward_streets')
+    @action(detail=False, methods=['get'], url_path='(?P<ward_id>[^/]+)/retrieve_ward_streets', renderer_classes=[ORJSONRenderer, BrowsableAPIRenderer])
     def retrieve_ward_streets(self, request, ward_id: uuid.UUID):
         """Retrieve Streets for a specific region by region ID."""
         try:
@@ -76,8 +79,7 @@ class StreetViewSet(viewsets.ModelViewSet):
 
             wards = Street.get_streets_by_Ward(ward=ward)
 
-            serializer = RequestStreetSerializer(wards, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(RowConverter.serialize(RequestStreetSerializer, wards), status=status.HTTP_200_OK)
 
         except Exception as e:
             # Handle any errors during the request
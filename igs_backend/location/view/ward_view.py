@@ -2,6 +2,9 @@ import uuid
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
+from shared.renderers import ORJSONRenderer
+from shared.serializer import RowConverter
 from drf_yasg.utils import swagger_auto_schema
 from location.models import District, Ward
 from location.serializers import RequestWardSerializer
@@ -65,7 +68,7 @@ class WardViewSet(viewsets.ModelViewSet):
             )
         ]
     )
-    @action(detail=False, methods=['get'], url_path='(?P<district_id>[^/]+)/retrieve_district_wards')
+    @action(detail=False, methods=['get'], url_path='(?P<district_id>[^/]+)/retrieve_district_wards', renderer_classes=[ORJSONRenderer, BrowsableAPIRenderer])
     def retrieve_district_wards(self, request, district_id: uuid.UUID):
         """Retrieve wards for a specific region by region ID."""
         try:
@@ -76,8 +79,7 @@ class WardViewSet(viewsets.ModelViewSet):
 
             districts = Ward.get_wards_by_district(district=district)
 
-            serializer = RequestWardSerializer(districts, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(RowConverter.serialize(RequestWardSerializer, districts), status=status.HTTP_200_OK)
 
         except Exception as e:
             # Handle any errors during the request
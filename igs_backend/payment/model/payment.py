@@ -2,6 +2,7 @@ from decimal import Decimal
 import logging
 import uuid
 from django.db import models
+from django.db.models import Q
 from django.core.exceptions import ValidationError
 from account.models import Account
 from booking.models import Booking
@@ -43,6 +44,9 @@ class Payment(models.Model):
     class Meta:
         db_table = 'payment'
         app_label = 'payment'
+        indexes = [
+            models.Index(fields=['payment_date'], name='payment_pending_date_idx', condition=Q(status=PaymentStatus.PENDING.value)),
+        ]
 
     def mark_as_consumed(self):
         """Mark the payment as consumed and store the timestamp."""
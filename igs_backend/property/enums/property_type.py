@@ -0,0 +1,15 @@
+from enum import Enum
+from typing import List, Tuple
+
+class PROPERTY_TYPE(Enum):
+    HOUSE = "House"
+    ROOM = "Room"
+
+    @classmethod
+    def choices(cls) -> List[Tuple[str, str]]:
+        return [(property_type.value, property_type.value) for property_type in cls]
+
+    @property
+    def related_name(self) -> str:
+        """Reverse name of the child table on Property"""
+        return self.value.lower()
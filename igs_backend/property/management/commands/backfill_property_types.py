@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from property.enums.property_type import PROPERTY_TYPE
+from property.models import Property
+
+
+class Command(BaseCommand):
+    help = "Populate the property type of existing properties from their house or room row"
+
+    def handle(self, *args, **options):
+        for property_type in PROPERTY_TYPE:
+            updated = Property.objects.filter(
+                property_type__isnull=True, **{f"{property_type.related_name}__isnull": False}
+            ).update(property_type=property_type.value)
+
+            self.stdout.write(self.style.SUCCESS(f"Marked {updated} properties as {property_type.value}"))
@@ -4,25 +4,56 @@ from django.db import models
 from django.http import Http404
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-from django.db.models import QuerySet
+from django.db.models import QuerySet, Q
 
-from account.models import Account
 from house.enums.availability_status import STATUS
 from house.enums.category import CATEGORY
 from house.enums.condition import CONDITION
 from house.enums.furnishing_status import FURNISHING_STATUS
 from house.enums.heating_cooling_system import HEATING_COOLING_SYSTEM
+from property.enums.property_type import PROPERTY_TYPE
 from property.enums.rental_duration import RENTAL_DURATION
 from house.enums.security_feature import SECURITY_FEATURES
+from listing.enums.listing_type import LISTING_TYPE
+from listing.models import ListingSearchIndex
 from location.models import Location
 from user.models import Agent
 import logging
-from django.db.models import QuerySet, Q, Count, When, Case, IntegerField, Value, OuterRef, Exists
 
 
 logger = logging.getLogger(__name__)
 
+class PropertyQuerySet(models.QuerySet):
+    def as_subtypes(self) -> List['Property']:
+        """Evaluate into House and Room instances with their own fields, loaded along in the same query
+
+        Returns:
+            List[Property]: House and Room instances in the queryset order, plain properties without a child row stay as they are
+        """
+        properties = self.select_related(*[property_type.related_name for property_type in PROPERTY_TYPE])
+        subtypes = []
+
+        for property in properties:
+            # Rows saved before the discriminator existed are recognised from the joined child row
+            property_type = PROPERTY_TYPE(property.property_type) if property.property_type else next(
+                (property_type for property_type in PROPERTY_TYPE if hasattr(property, property_type.related_name)), None
+            )
+
+            if property_type is None:
+                subtypes.append(property)
+                continue
+
+            subtype = getattr(property, property_type.related_name)
+            subtype.property_type = property_type.value
+            subtypes.append(subtype)
+
+        return subtypes
+
+
 class Property(models.Model):
+    # Value of `property_type` for the rows of a child model
+    default_property_type: str = None
+
     property_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     agent = models.ForeignKey(Agent, on_delete=models.RESTRICT, null=False, related_name="properties")
     location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name="properties")
@@ -38,14 +69,25 @@ class Property(models.Model):
     furnishing_status = models.CharField(max_length=255, choices=FURNISHING_STATUS.choices(), default=FURNISHING_STATUS.default(), null=False, blank=False)
     status = models.CharField(max_length=255, choices=STATUS.choices(), default=STATUS.default(), null=False, blank=False)
     is_active_account = models.BooleanField(default=True)
+    is_paid = models.BooleanField(default=False)
+    image_count = models.IntegerField(default=0)
+    cover_image_id = models.UUIDField(null=True, blank=True)
     is_deleted = models.BooleanField(default=False)
     listing_date = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
+    property_type = models.CharField(max_length=20, choices=PROPERTY_TYPE.choices(), null=True, blank=True, editable=False)
+
+    objects = PropertyQuerySet.as_manager()
     
     class Meta:
         abstract = False
         db_table = 'property'
         app_label = 'property'
+        indexes = [
+            models.Index(fields=['agent', '-listing_date'], name='property_agent_listing_idx', condition=Q(is_deleted=False)),
+            models.Index(fields=['category', 'price'], name='property_available_idx', condition=Q(is_deleted=False, is_active_account=True, status=STATUS.AVAILABLE.value)),
+            models.Index(fields=['status', 'agent'], name='property_status_agent_idx', condition=Q(is_deleted=False)),
+        ]
 
     def __str__(self):
         return f"Property {self.property_id}"
@@ -55,7 +97,7 @@ class Property(models.Model):
     
     def mark_booked(self) -> None:
         self.status = STATUS.BOOKED.value
-        self.save(update_fields=['status'])
+        self.save(update_fields=['status', 'updated_at'])
         
     def clean(self):
         """Ensure `rental_duration` is only provided for rental properties."""
@@ -70,35 +112,25 @@ class Property(models.Model):
         
         if not skip_validation:
             self.full_clean() 
+
+        if self.property_type is None:
+            self.property_type = self.default_property_type
         
         super().save(*args, **kwargs)
 
         
     @classmethod
-    def demo_properties(cls) -> 'QuerySet[Property]':
+    def demo_properties(cls) -> 'QuerySet[ListingSearchIndex]':
         """Retrieves demo property and uncategorized property
 
         Returns:
-            QuerySet[Property]: Property instances queryset
+            QuerySet[ListingSearchIndex]: Ordered index rows of houses and rooms with images, load the properties with `ListingSearchIndex.hydrate`
         """
-        paid_account_exists = Account.objects.filter(
-            agent=OuterRef("agent"),
-            is_active=True,
-            plan__is_free=False
-        ).values("pk")
-
-        queryset = cls.objects.filter(is_active_account = True, is_deleted = False).annotate(
-            is_paid=Case(
-                When(Exists(paid_account_exists), then=Value(1)),
-                default=Value(0),
-                output_field=IntegerField()
-            ),
-            image_count=Count('images', distinct=True) 
-        ).filter(image_count__gt=0) 
-
-        queryset = queryset.select_related('location').order_by('-is_paid', '-listing_date')
-
-        return queryset
+        return ListingSearchIndex.search(
+            listing_types=[LISTING_TYPE.HOUSE.value, LISTING_TYPE.ROOM.value],
+            available_only=False,
+            with_images=True,
+        )
         
     @classmethod
     def mark_property_rented(cls, property_id: uuid.UUID, agent: Agent) -> None:
@@ -108,7 +140,7 @@ class Property(models.Model):
             raise Http404("Property not found or not in the booked status.")
         
         property.status = STATUS.RENTED.value
-        property.save(update_fields=['status'])
+        property.save(update_fields=['status', 'updated_at'])
         
     @classmethod
     def mark_property_available(cls, property_id: uuid.UUID, agent: Agent) -> None:
@@ -123,7 +155,7 @@ class Property(models.Model):
             raise Http404("Property not found or not in rented or sold or booked status.")
         
         property.status = STATUS.AVAILABLE.value
-        property.save(update_fields=['status'])
+        property.save(update_fields=['status', 'updated_at'])
         
     @classmethod
     def mark_property_sold(cls, property_id: uuid.UUID, agent: Agent) -> None:
@@ -133,7 +165,7 @@ class Property(models.Model):
             raise Http404("Property not found or not in the sold status.")
         
         property.status = STATUS.SOLD.value
-        property.save(update_fields=['status'])
+        property.save(update_fields=['status', 'updated_at'])
     
     @classmethod
     def total_properties_for_agent(cls, agent: Agent) -> int:
@@ -201,7 +233,7 @@ class Property(models.Model):
         
         for house in inactive_houses:
             house.is_active_account = True
-            house.save(update_fields=["is_active_account"], skip_validation=True)
+            house.save(update_fields=["is_active_account", "updated_at"], skip_validation=True)
             
     @classmethod
     def deactivate_active_properties(cls, agent: Agent):
@@ -217,4 +249,4 @@ class Property(models.Model):
         
         for house in inactive_houses:
             house.is_active_account = False
-            house.save(update_fields=["is_active_account"], skip_validation=True)
+            house.save(update_fields=["is_active_account", "updated_at"], skip_validation=True)
@@ -1,40 +1,27 @@
 from rest_framework import serializers
 
-from house.models import House
 from igs_backend import settings
 from location.serializer.response_location_serializer import ResponseLocationSerializer
 from property.models import Property
-from room.models import Room
+from property_images.enums.rendition_size import RENDITION_SIZE
+from shared.serializer import ImageUrlsField, SparseFieldsMixin, image_url
 
 
 class ResponsePropertySerializer(serializers.ModelSerializer):
     location = ResponseLocationSerializer(many=False)
-    images = serializers.SerializerMethodField()
+    images = ImageUrlsField(size=RENDITION_SIZE.THUMBNAIL.value)
     
     class Meta:
         model = Property
         fields = ['property_id', 'category', 'price', 'status', 'heating_cooling_system', 'rental_duration', 'description', 'condition', 'nearby_facilities', 'utilities', 
                   'security_features', 'furnishing_status', 'location', 'images']
     
-    def get_images(self, obj):
-        images = obj.images.all()
-        image_urls = []
-
-        base_url = settings.PROPERTY_IMAGE_BASE_URL 
-
-        for image in images:
-            image_id = image.image_id
-            
-            image_url = f"{base_url}/{image_id}/"
-            
-            image_urls.append(image_url)
-
-        return image_urls
     
 
-class ResponseDemoPropertySerializer(serializers.ModelSerializer):
+class ResponseDemoPropertySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     location = ResponseLocationSerializer(many=False)
-    images = serializers.SerializerMethodField()
+    images = ImageUrlsField(size=RENDITION_SIZE.THUMBNAIL.value)
+    cover_image = serializers.SerializerMethodField()
     is_active_account = serializers.BooleanField(write_only=True)
     agent = serializers.UUIDField(write_only=True)
     is_deleted = serializers.BooleanField(write_only=True)
@@ -42,35 +29,25 @@ class ResponseDemoPropertySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Property
-        fields = '__all__'
+        exclude = ['is_paid', 'image_count', 'cover_image_id']
+
+    field_columns = {
+        'cover_image': ['cover_image_id'],
+        'property_type': ['property_type'],
+    }
 
-    def get_images(self, obj):
+    def get_cover_image(self, obj):
         """
-        Generate full URLs for the images associated with this house in the desired format.
+        Thumbnail URL of the cover image of this property, read from the maintained cover image column.
         """
-        images = obj.images.all()
-        image_urls = []
+        if obj.cover_image_id is None:
+            return None
 
-        base_url = settings.PROPERTY_IMAGE_BASE_URL 
+        return image_url(settings.PROPERTY_IMAGE_BASE_URL, obj.cover_image_id, RENDITION_SIZE.THUMBNAIL.value)
 
-        for image in images:
-            image_id = image.image_id
-            
-            image_url = f"{base_url}/{image_id}/"
-            
-            image_urls.append(image_url)
-
-        return image_urls
     
     def get_property_type(self, obj):
         """
-        Returns the type of the property (House or Room)
+        Returns the type of the property (House or Room) from the stored discriminator
         """
-        if hasattr(obj, 'house'):
-            return "House"
-        elif hasattr(obj, 'room'):
-            return "Room"
-        return "Unknown"  
-
-
-        
\ No newline at end of file
+        return obj.property_type or getattr(obj, 'listing_type', None) or "Unknown"
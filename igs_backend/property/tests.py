@@ -1,3 +1,68 @@
 from django.test import TestCase
 
-# Create your tests here.
+from house.enums.availability_status import STATUS
+from house.models import House
+from land.models import Land
+from listing.tests import seed_listings
+from property.models import Property
+from room.models import Room
+
+
+class PropertySubtypeTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_listings(total=4)
+
+    def test_as_subtypes_loads_children_in_one_query(self):
+        with self.assertNumQueries(1):
+            properties = Property.objects.order_by('price').as_subtypes()
+            self.assertEqual([type(property) for property in properties], [Room] * 4 + [House] * 4)
+            self.assertEqual({property.property_type for property in properties}, {'House', 'Room'})
+            self.assertTrue(all(property.room_category for property in properties[:4]))
+
+    def test_as_subtypes_without_discriminator(self):
+        Property.objects.update(property_type=None)
+
+        properties = Property.objects.order_by('price').as_subtypes()
+        self.assertEqual([property.property_type for property in properties], ['Room'] * 4 + ['House'] * 4)
+
+
+class DetailValidatorsTestCase(TestCase):
+    """Every write shown by a detail response changes its ETag, a conditional GET never returns the old copy"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = seed_listings(total=2)
+
+    def assertChangesDetail(self, url: str, write):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        write()
+
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], response['ETag'])
+        return changed
+
+    def test_booking_changes_the_house_detail(self):
+        house = House.objects.filter(status=STATUS.AVAILABLE.value).first()
+
+        response = self.assertChangesDetail(f'/api/v2/house/houses/{house.pk}/house_detail/', house.mark_booked)
+        self.assertEqual(response.data['status'], STATUS.BOOKED.value)
+
+    def test_account_changes_the_room_detail(self):
+        room = Room.objects.filter(agent=self.agent).first()
+
+        self.assertChangesDetail(f'/api/v2/room/rooms/{room.pk}/room_detail/', lambda: Property.deactivate_active_properties(agent=self.agent))
+
+    def test_location_edit_changes_the_land_detail(self):
+        land = Land.objects.filter(agent=self.agent).first()
+
+        def edit_location():
+            land.location.street = 'Mtaa Mpya'
+            land.location.save()
+
+        response = self.assertChangesDetail(f'/api/v2/land/lands/{land.pk}/retrieve_land_details/', edit_location)
+        self.assertEqual(response.data['location']['street'], 'Mtaa Mpya')
@@ -5,4 +5,5 @@ router = DefaultRouter()
 
 router.register(r'images', views.PropertyImageViewSet, basename='image')
 router.register(r'properties', views.PropertyViewSet, basename='property')
+router.register(r'clusters', views.ClusterViewSet, basename='cluster')
 urlpatterns = router.urls
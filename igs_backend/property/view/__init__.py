@@ -1,2 +1,3 @@
 from .property_image_view import PropertyImageViewSet
-from .property_view import PropertyViewSet
\ No newline at end of file
+from .property_view import PropertyViewSet
+from .cluster_view import ClusterViewSet
\ No newline at end of file
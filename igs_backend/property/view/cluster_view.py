@@ -0,0 +1,64 @@
+from django.http import HttpRequest
+from rest_framework import viewsets, permissions, status
+from rest_framework.response import Response
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from listing.models import ListingSearchIndex
+from listing.serializers import ListingClusterSerializer
+from shared.seriaizers import DetailResponseSerializer
+from utils import geohash
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+class ClusterViewSet(viewsets.ViewSet):
+    permission_classes = [permissions.AllowAny]
+
+    @swagger_auto_schema(
+        operation_description="Group the available houses, rooms and land inside the visible map box into clusters sized for the zoom level",
+        operation_summary="Listing map clusters",
+        tags=["Property"],
+        responses={
+            200: openapi.Response(
+                description="Clusters with their listing count, centroid and price range",
+                schema=ListingClusterSerializer(many=True)
+            ),
+            400: openapi.Response(
+                description="Bad request",
+                schema=DetailResponseSerializer(many=False)
+            ),
+            500: openapi.Response(
+                description="Internal server error",
+                schema=DetailResponseSerializer(many=False)
+            ),
+        },
+        manual_parameters=[
+            openapi.Parameter(
+                'bbox', openapi.IN_QUERY, description="Visible map box `min_lng,min_lat,max_lng,max_lat`", type=openapi.TYPE_STRING, required=True
+            ),
+            openapi.Parameter(
+                'zoom', openapi.IN_QUERY, description="Map zoom level between 0 and 20", type=openapi.TYPE_INTEGER, required=True
+            ),
+        ]
+    )
+    def list(self, request: HttpRequest):
+        try:
+            bbox = geohash.parse_bbox(request.GET.get('bbox'))
+            zoom = int(request.GET.get('zoom', ''))
+        except ValueError:
+            return Response({"detail": "Invalid bbox or zoom."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if bbox is None:
+            return Response({"detail": "bbox is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            clusters = ListingSearchIndex.clusters(bbox=bbox, zoom=zoom)
+            serializer = ListingClusterSerializer(clusters, many=True)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        except ValueError as e:
+            logger.error(f"Validation error occurred: {e}", exc_info=True)
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"Unexpected error occurred: {e}", exc_info=True)
+            return Response({"detail": f"An unexpected error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
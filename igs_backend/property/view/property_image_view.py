@@ -1,26 +1,25 @@
 from typing import cast
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest
 from rest_framework import viewsets, permissions, status
 from authentication.custom_permissions import *
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from igs_backend import settings
 from property.models import Property
 from property.serializers import RequestPropertyImageSerializer
+from property_images.enums.rendition_size import RENDITION_SIZE
 from property_images.models import PropertyImage
+from shared.mixins import MediaFileMixin
 from shared.seriaizers import DetailResponseSerializer
 import logging
-import os
-import mimetypes
 
 from user.models import Agent, User
 
 
 logger = logging.getLogger(__name__)
 
-class PropertyImageViewSet(viewsets.ModelViewSet):
+class PropertyImageViewSet(MediaFileMixin, viewsets.ModelViewSet):
     def get_serializer_class(self):
         return RequestPropertyImageSerializer
 
@@ -110,26 +109,32 @@ class PropertyImageViewSet(viewsets.ModelViewSet):
                 description="The UUID of the image to retrieve",
                 type=openapi.TYPE_STRING,
                 required=True
+            ),
+            openapi.Parameter(
+                'size',
+                openapi.IN_QUERY,
+                description="Rendition to retrieve, the full image by default",
+                type=openapi.TYPE_STRING,
+                enum=[choice[0] for choice in RENDITION_SIZE.choices()],
+                required=False
             )
         ]
     )
     @action(detail=False, methods=['get'], url_path='property-images/(?P<image_id>[^/]+)')
     def property_images(self, request, image_id):
-        try:
-            image = PropertyImage.get_image_by_id(image_id=image_id)
+        size = request.query_params.get('size', RENDITION_SIZE.FULL.value)
 
-            image_path = os.path.join(settings.MEDIA_ROOT, str(image.image))
+        if not RENDITION_SIZE.valid(size):
+            return Response({"detail": f"Invalid size '{size}'. Valid options are {', '.join([choice[0] for choice in RENDITION_SIZE.choices()])}."}, status=status.HTTP_400_BAD_REQUEST)
 
-            if not os.path.exists(image_path):
-                return Response({"detail": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            image_name = PropertyImage.get_image_file(image_id=image_id, size=size)
+            response = self.serve_media(request, image_name, cache_control=self.immutable_cache_control) if image_name else None
 
-            mime_type, _ = mimetypes.guess_type(image_path)
-            if not mime_type:
-                mime_type = 'application/octet-stream'
+            if response is None:
+                return Response({"detail": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
 
-            with open(image_path, 'rb') as image_file:
-                response = HttpResponse(image_file.read(), content_type=mime_type)
-                return response
+            return response
 
         except PropertyImage.DoesNotExist:
             return Response({"detail": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -3,17 +3,25 @@ from sre_constants import CATEGORY
 from typing import cast
 import uuid
 from django.http import Http404, HttpRequest, HttpResponse
-from rest_framework.pagination import PageNumberPagination
 from rest_framework import viewsets, permissions, status
 from authentication.custom_permissions import *
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
+from shared.renderers import ORJSONRenderer
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from igs_backend import settings
+from listing.enums.listing_type import LISTING_TYPE
+from listing.models import HomepageFeedEntry, ListingSearchIndex
+from listing.search_cache import SearchCache
+from listing.serializers import ListingCardSerializer
 from property.models import Property
 from property.serializers import RequestPropertyStatusSerializer, ResponseDemoPropertySerializer
 from property_images.models import PropertyImage
+from shared.mixins import CachedSearchMixin
+from shared.pagination import FeedPagination, ListingPagination
+from shared.serializer import SparseFieldsMixin
 from shared.seriaizers import DetailResponseSerializer
 import logging
 import os
@@ -23,7 +31,11 @@ from user.models import Agent, User
 
 logger = logging.getLogger(__name__)
 
-class PropertyViewSet(viewsets.ModelViewSet):
+class PropertyViewSet(CachedSearchMixin, viewsets.ModelViewSet):
+    cache_control = {
+        'demo_property': {'public': True, 'max_age': 30},
+    }
+
     def get_serializer_class(self):
         return RequestPropertyStatusSerializer
 
@@ -190,6 +202,23 @@ class PropertyViewSet(viewsets.ModelViewSet):
         operation_summary="Demo property",
         method="get",
         tags=["Property"],
+        manual_parameters=[
+            openapi.Parameter(
+                'view', openapi.IN_QUERY, description="`card` returns the compact card of each listing instead of the full listing",
+                type=openapi.TYPE_STRING, enum=['card']
+            ),
+            openapi.Parameter(
+                'fields', openapi.IN_QUERY, description="Comma separated fields to return, e.g. `property_id,price,cover_image`", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'page_size', openapi.IN_QUERY, description="Listings per page, at most 50", type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'cursor', openapi.IN_QUERY,
+                description="Opt in cursor pagination, send an empty value for the first page then follow `next`",
+                type=openapi.TYPE_STRING
+            ),
+        ],
         responses={
             200: openapi.Response(
                 description="A paginated list of property",
@@ -221,6 +250,7 @@ class PropertyViewSet(viewsets.ModelViewSet):
                                         type=openapi.TYPE_ARRAY,
                                         items=openapi.Schema(type=openapi.TYPE_STRING),
                                     ),
+                                    'cover_image': openapi.Schema(type=openapi.TYPE_STRING),
                                     'category': openapi.Schema(type=openapi.TYPE_STRING),
                                     'price': openapi.Schema(type=openapi.TYPE_STRING),
                                     'rental_duration': openapi.Schema(type=openapi.TYPE_STRING),
@@ -248,19 +278,35 @@ class PropertyViewSet(viewsets.ModelViewSet):
             ),
         },
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=[ORJSONRenderer, BrowsableAPIRenderer])
     def demo_property(self, request: HttpRequest):
+        cache_key = SearchCache.key('demo_property', [LISTING_TYPE.HOUSE.value, LISTING_TYPE.ROOM.value], request)
+        cached = self.cached_search_response(request, cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            properties = Property.demo_properties()
-            paginator = PageNumberPagination()
-            
-            page = paginator.paginate_queryset(properties, request)
-            if page is not None:
-                serializer = ResponseDemoPropertySerializer(page, many=True)
-                return paginator.get_paginated_response(serializer.data)
+            fields = SparseFieldsMixin.parse_fields(request.GET.get('fields'))
+
+            if request.GET.get('view') == 'card':
+                only = ListingCardSerializer.get_only(Property, fields)
+                properties = Property.demo_properties()
+                paginator = ListingPagination()
+
+                def render(rows):
+                    return ListingCardSerializer(ListingSearchIndex.hydrate(rows, model=Property, only=only), many=True, fields=fields).data
+            else:
+                # The full entries are read pre-rendered from the homepage feed
+                fields = ResponseDemoPropertySerializer(fields=fields).readable_field_names()
+                properties = HomepageFeedEntry.feed()
+                paginator = FeedPagination(count=HomepageFeedEntry.cached_count)
 
-            serializer = ResponseDemoPropertySerializer(properties, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+                def render(entries):
+                    return HomepageFeedEntry.payloads(entries, fields=fields)
+
+            return self.search_response(request, cache_key, properties, paginator, render)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Unexpected error occurred: {e}", exc_info=True)
             return Response({"detail": f"An unexpected error occurred: {e}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PropertyImagesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "property_images"
+
+    def ready(self):
+        from . import receivers
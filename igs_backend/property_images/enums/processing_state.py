@@ -0,0 +1,12 @@
+from enum import Enum
+from typing import List, Tuple
+
+class PROCESSING_STATE(Enum):
+    PENDING = "Pending"
+    PROCESSING = "Processing"
+    READY = "Ready"
+    FAILED = "Failed"
+
+    @classmethod
+    def choices(cls) -> List[Tuple[str, str]]:
+        return [(state.value, state.value) for state in cls]
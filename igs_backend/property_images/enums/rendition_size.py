@@ -0,0 +1,24 @@
+from enum import Enum
+from typing import List, Tuple
+
+class RENDITION_SIZE(Enum):
+    THUMBNAIL = "thumbnail"
+    MEDIUM = "medium"
+    FULL = "full"
+
+    @classmethod
+    def choices(cls) -> List[Tuple[str, str]]:
+        return [(size.value, size.value) for size in cls]
+
+    @classmethod
+    def valid(cls, size: str) -> bool:
+        return size in [choice.value for choice in cls]
+
+    @property
+    def max_width(self) -> int:
+        """Widest the rendition is stored, narrower originals are never upscaled"""
+        return {
+            RENDITION_SIZE.THUMBNAIL: 320,
+            RENDITION_SIZE.MEDIUM: 960,
+            RENDITION_SIZE.FULL: 1920,
+        }[self]
@@ -0,0 +1,96 @@
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+from PIL import Image, ImageFilter
+from django.core.management.base import BaseCommand
+
+from property_images.enums.rendition_size import RENDITION_SIZE
+from utils.upload_image import MAX_SIZE_IN_BYTES, MAX_WIDTH, compress_and_resize_image, create_renditions, verify_image
+
+# The removed loop never ends on an image still too large at quality 75, it is cut there
+LEGACY_MAX_RESAVES = 5
+
+
+def legacy_compress(image) -> int:
+    """Verify then compress an upload as before the size targeted encoder, returning the encoded size"""
+    Image.open(image).verify()
+    image.seek(0)
+
+    img = Image.open(image)
+    if img.width > MAX_WIDTH:
+        ratio = MAX_WIDTH / float(img.width)
+        img = img.resize((MAX_WIDTH, int(float(img.height) * ratio)), Image.Resampling.LANCZOS)
+
+    temp_file_path = tempfile.mktemp(suffix=".webp")
+    img.save(temp_file_path, format='WebP', quality=80)
+
+    for _ in range(LEGACY_MAX_RESAVES):
+        if os.path.getsize(temp_file_path) <= MAX_SIZE_IN_BYTES:
+            break
+        img.save(temp_file_path, format='WebP', quality=75)
+
+    with open(temp_file_path, 'rb') as f:
+        size = len(f.read())
+    os.remove(temp_file_path)
+    return size
+
+
+class Command(BaseCommand):
+    help = "Measure the CPU time per image of the WebP encoding of uploads, before and after the size targeted encoder"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', type=Path, help="Directory of photos to encode, synthetic phone photos when omitted")
+        parser.add_argument('--count', type=int, default=8, help="Synthetic photos to generate")
+
+    def _corpus(self, directory: Path, count: int) -> dict:
+        if directory is not None:
+            return {path.name: path.read_bytes() for path in sorted(directory.iterdir()) if path.is_file()}
+
+        corpus = {}
+        for i in range(count):
+            # Blurred noise compresses like a detailed photo, sharper ones exceed the byte budget
+            size = (4000, 3000) if i % 2 == 0 else (3000, 4000)
+            img = Image.frombytes('RGB', (size[0] // 4, size[1] // 4), os.urandom(size[0] * size[1] * 3 // 16)).resize(size)
+            img = img.filter(ImageFilter.GaussianBlur(1 + i % 4))
+            buffer = io.BytesIO()
+            img.save(buffer, format='JPEG', quality=92)
+            corpus[f"synthetic-{i}.jpg"] = buffer.getvalue()
+        return corpus
+
+    def _time(self, encode, data: bytes):
+        start = time.process_time()
+        result = encode(io.BytesIO(data))
+        return result, (time.process_time() - start) * 1000
+
+    def handle(self, *args, **options):
+        corpus = self._corpus(options['corpus'], options['count'])
+        totals = [0.0, 0.0, 0.0]
+        max_widths = {size.value: size.max_width for size in RENDITION_SIZE}
+
+        for name, data in corpus.items():
+            legacy_size, legacy_ms = self._time(legacy_compress, data)
+
+            def encode(file):
+                verify_image(file)
+                return compress_and_resize_image(file)
+
+            compressed, current_ms = self._time(encode, data)
+            renditions, renditions_ms = self._time(lambda file: create_renditions(file, max_widths), data)
+
+            totals[0] += legacy_ms
+            totals[1] += current_ms
+            totals[2] += renditions_ms
+            self.stdout.write(
+                f"{name}: before {legacy_ms:.0f} ms ({legacy_size} bytes), "
+                f"after {current_ms:.0f} ms ({compressed.size} bytes), "
+                f"all renditions {renditions_ms:.0f} ms ({sum(rendition.file.size for rendition in renditions.values())} bytes)"
+            )
+
+        if corpus:
+            count = len(corpus)
+            self.stdout.write(self.style.SUCCESS(
+                f"CPU time per image: before {totals[0] / count:.0f} ms, after {totals[1] / count:.0f} ms, "
+                f"all renditions {totals[2] / count:.0f} ms"
+            ))
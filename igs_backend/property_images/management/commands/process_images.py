@@ -0,0 +1,71 @@
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import multiprocessing
+import time
+from typing import Optional
+import uuid
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from property_images.enums.processing_state import PROCESSING_STATE
+from property_images.models import LandImage, PropertyImage
+
+
+logger = logging.getLogger(__name__)
+
+
+def process_image(model_label: str, image_id: uuid.UUID) -> Optional[str]:
+    """Process one image in a worker process, which keeps its own database connection
+
+    An error is logged instead of stopping the batch, the image is claimed again once its claim times out.
+    """
+    try:
+        return apps.get_model(model_label).process(image_id=image_id)
+    except Exception as e:
+        logger.error(f"Error occurred while processing image {image_id}: {e}", exc_info=True)
+        # A connection broken by the error is opened again for the next image
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
+        return None
+
+
+class Command(BaseCommand):
+    help = "Resize and compress the queued property and land images with a pool of worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help="Worker processes, 0 processes the images in this process")
+        parser.add_argument('--batch-size', type=int, default=10, help="Images claimed per image table at a time")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument('--once', action='store_true', help="Exit once the queue is empty")
+
+    def handle(self, *args, **options):
+        # Workers are forked with the loaded Django setup
+        pool = ProcessPoolExecutor(max_workers=options['workers'], mp_context=multiprocessing.get_context('fork')) if options['workers'] else None
+
+        try:
+            while True:
+                claimed = [
+                    (model._meta.label, image_id)
+                    for model in (PropertyImage, LandImage)
+                    for image_id in model.claim(limit=options['batch_size'])
+                ]
+
+                if not claimed:
+                    if options['once']:
+                        return
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                if pool is not None:
+                    # Forked workers must not share the connection of this process
+                    connections.close_all()
+                    states = list(pool.map(process_image, *zip(*claimed)))
+                else:
+                    states = [process_image(model_label, image_id) for model_label, image_id in claimed]
+
+                ready = states.count(PROCESSING_STATE.READY.value)
+                self.stdout.write(f"Processed {len(claimed)} images, {ready} ready, {states.count(PROCESSING_STATE.FAILED.value)} failed")
+        finally:
+            if pool is not None:
+                pool.shutdown()
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from land.models import Land
+from property.models import Property
+from property_images.models import LandImage, PropertyImage
+
+
+class Command(BaseCommand):
+    help = "Recompute the image counter and cover image of every property and land from their ready images"
+
+    def handle(self, *args, **options):
+        for model, image_model, field in (
+            (Property, PropertyImage, 'property_id'),
+            (Land, LandImage, 'land_id'),
+        ):
+            images = image_model.objects.ready().filter(**{field: OuterRef(field)})
+
+            updated = model.objects.update(
+                image_count=Coalesce(
+                    Subquery(images.values(field).annotate(total=Count('image_id')).values('total'), output_field=IntegerField()),
+                    Value(0),
+                ),
+                cover_image_id=Subquery(images.order_by('image_id').values('image_id')[:1]),
+            )
+
+            self.stdout.write(self.style.SUCCESS(f"Synced image counters of {updated} {model._meta.db_table} rows"))
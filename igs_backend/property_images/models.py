@@ -1,92 +1,349 @@
-from typing import List
+from datetime import timedelta
+from typing import Iterable, List, Optional
+import os
 import uuid
+import logging
 from django.db import models
 from django.db import transaction
+from django.db.models import Case, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from land.models import Land
 from property.models import Property
-from utils.upload_image import upload_image_to, validate_image
+from property_images.enums.processing_state import PROCESSING_STATE
+from property_images.enums.rendition_size import RENDITION_SIZE
+from property_images.signals import images_saved
+from shared.storage import ContentAddressedStorage
+from utils.upload_image import create_renditions, upload_image_to, upload_rendition_to, validate_image, verify_image
 
-class PropertyImage(models.Model):
+
+logger = logging.getLogger(__name__)
+
+MAX_PROCESSING_ATTEMPTS = 3
+# Images and their renditions are stored by content, identical files are shared between rows
+image_storage = ContentAddressedStorage()
+# A claimed image still processing after this long is taken back, its worker is assumed dead
+PROCESSING_TIMEOUT = timedelta(minutes=10)
+
+
+class ImageQuerySet(models.QuerySet):
+    def ready(self) -> 'ImageQuerySet':
+        """Images whose processing is done, the only ones shown and counted on their listing"""
+        return self.filter(processing_state=PROCESSING_STATE.READY.value)
+
+
+class ProcessedImage(models.Model):
+    """Image of a listing, stored as uploaded and compressed later by the `process_images` workers.
+
+    Uploads only verify the file and queue it, the resize and WebP encode run in a worker
+    process outside of the request. The image counter and cover image of the owner only
+    include ready images, so a listing that needs images stays hidden until one is ready.
+    Processing also stores the smaller renditions listed in `RENDITION_SIZE`.
+    """
     image_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, null=False)
-    property = models.ForeignKey(Property, related_name='images', on_delete=models.CASCADE)
-    image = models.ImageField(upload_to=upload_image_to, validators=[validate_image])
-    
+    image = models.ImageField(upload_to=upload_image_to, validators=[validate_image], storage=image_storage, db_index=True)
+    processing_state = models.CharField(max_length=20, choices=PROCESSING_STATE.choices(), default=PROCESSING_STATE.READY.value)
+    processing_attempts = models.PositiveSmallIntegerField(default=0)
+    processing_started_at = models.DateTimeField(null=True, blank=True)
+    uploaded_at = models.DateTimeField(default=timezone.now)
+
+    objects = ImageQuerySet.as_manager()
+
+    # Name of the foreign key to the listing owning the image
+    owner_field: str
+
     class Meta:
-        db_table = 'property_images'
-        app_label = 'property_images'
-    
+        abstract = True
+        indexes = [
+            models.Index(
+                fields=['uploaded_at'], name='%(class)s_queue_idx',
+                condition=Q(processing_state__in=[PROCESSING_STATE.PENDING.value, PROCESSING_STATE.PROCESSING.value]),
+            ),
+        ]
+
     def __str__(self):
         return str(self.image_id)
-    
+
+    @classmethod
+    def _owner_model(cls) -> type:
+        return cls._meta.get_field(cls.owner_field).related_model
+
+    @classmethod
+    def _rendition_model(cls) -> type:
+        return cls._meta.get_field('renditions').related_model
+
+    def delete(self, using=None, keep_parents=False):
+        """Delete the image and update the image counter and cover image of its owner"""
+        owner_id = getattr(self, f"{self.owner_field}_id")
+
+        with transaction.atomic():
+            if self.processing_state == PROCESSING_STATE.READY.value:
+                self._owner_model().objects.filter(pk=owner_id).update(
+                    image_count=Greatest(F('image_count') - 1, Value(0)),
+                    cover_image_id=Case(
+                        When(cover_image_id=self.image_id, then=Subquery(
+                            type(self).objects.ready().filter(**{self.owner_field: owner_id}).exclude(image_id=self.image_id).order_by('image_id').values('image_id')[:1]
+                        )),
+                        default=F('cover_image_id'),
+                    ),
+                    updated_at=timezone.now(),
+                )
+            return super().delete(using=using, keep_parents=keep_parents)
+
     @classmethod
-    def get_image_by_id(cls, image_id: uuid.UUID) -> 'PropertyImage':
+    def get_image_by_id(cls, image_id: uuid.UUID) -> 'ProcessedImage':
         """Retrieve image instance using image id
 
         Args:
             image_id (uuid.UUID): Image id to retrieve the image instance
 
         Returns:
-            PropertyImage: Image instance if found, otherwise None
+            ProcessedImage: Image instance if found, otherwise None
         """
         return cls.objects.filter(image_id=image_id).first()
-    
+
     @classmethod
-    def save(cls, property: Property, images: List[InMemoryUploadedFile]) -> None:
-        """Class method to save property images
+    def get_image_file(cls, image_id: uuid.UUID, size: str = RENDITION_SIZE.FULL.value) -> Optional[str]:
+        """Name of the stored file of an image at a rendition size
+
+        Images without that rendition, processed before renditions existed or narrower than
+        the rendition, fall back to their own file.
 
         Args:
-            property (Property): Property for which the images are uplaoded
+            image_id (uuid.UUID): Image id
+            size (str, optional): Rendition size. Defaults to RENDITION_SIZE.FULL.value.
+
+        Returns:
+            Optional[str]: File name relative to the media root, None if the image does not exist or is not ready
+        """
+        rendition = cls._rendition_model().objects.filter(image_id=OuterRef('pk'), size=size).values('file')[:1]
+
+        return cls.objects.ready().filter(image_id=image_id).values_list(
+            Coalesce(Subquery(rendition), F('image'), output_field=models.CharField()), flat=True
+        ).first()
+
+    @staticmethod
+    def release_files(names: Iterable[str]) -> None:
+        """Delete the stored files that no image or rendition references any more
+
+        Files are content addressed, identical uploads and renditions of different images share
+        one file, so a file is only deleted once the last row referencing it is gone. The check and
+        the delete hold the lock of the name, see `ContentAddressedStorage.lock_name`.
+
+        Args:
+            names (Iterable[str]): Names of files that lost a reference
+        """
+        references = [(model, 'image') for model in ProcessedImage.__subclasses__()]
+        references += [(model._rendition_model(), 'file') for model in ProcessedImage.__subclasses__()]
+
+        for name in set(filter(None, names)):
+            # Waits for a save reusing the file to commit its reference
+            with transaction.atomic():
+                image_storage.lock_name(name)
+
+                if not any(model.objects.filter(**{field: name}).exists() for model, field in references):
+                    image_storage.delete(name)
+
+    @classmethod
+    def enqueue(cls, owner: models.Model, images: List[InMemoryUploadedFile]) -> List['ProcessedImage']:
+        """Store uploaded images as they are and queue them for processing
+
+        Args:
+            owner (models.Model): Listing for which the images are uploaded
             images (List[InMemoryUploadedFile]): List of images
+
+        Raises:
+            ValidationError: If a file is not an image
+
+        Returns:
+            List[ProcessedImage]: Queued images
         """
-        image_objects = []
+        for image in images:
+            verify_image(image)
+
+        return cls.objects.bulk_create([
+            cls(**{cls.owner_field: owner}, image=image, processing_state=PROCESSING_STATE.PENDING.value)
+            for image in images
+        ])
+
+    @classmethod
+    def claim(cls, limit: int) -> List[uuid.UUID]:
+        """Take the oldest queued images for a worker, with the ones whose worker died
+
+        Rows locked by another worker are skipped, so concurrent workers never claim the same image.
+        An image whose worker died on each of its `MAX_PROCESSING_ATTEMPTS` attempts is marked failed.
+
+        Args:
+            limit (int): Maximum number of images to take
+
+        Returns:
+            List[uuid.UUID]: IDs of the claimed images
+        """
+        now = timezone.now()
+        timed_out = Q(processing_state=PROCESSING_STATE.PROCESSING.value, processing_started_at__lt=now - PROCESSING_TIMEOUT)
+
+        with transaction.atomic():
+            cls.objects.filter(timed_out, processing_attempts__gte=MAX_PROCESSING_ATTEMPTS).update(
+                processing_state=PROCESSING_STATE.FAILED.value
+            )
+            image_ids = list(
+                cls.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(processing_state=PROCESSING_STATE.PENDING.value)
+                    | timed_out & Q(processing_attempts__lt=MAX_PROCESSING_ATTEMPTS)
+                )
+                .order_by('uploaded_at')
+                .values_list('image_id', flat=True)[:limit]
+            )
+            cls.objects.filter(image_id__in=image_ids).update(
+                processing_state=PROCESSING_STATE.PROCESSING.value,
+                processing_started_at=now,
+                processing_attempts=F('processing_attempts') + 1,
+            )
+
+        return image_ids
+
+    @classmethod
+    def process(cls, image_id: uuid.UUID) -> Optional[str]:
+        """Resize and compress a claimed image into its renditions, then count it on its owner
+
+        A failed image is queued again until it has used `MAX_PROCESSING_ATTEMPTS` attempts.
+
+        Args:
+            image_id (uuid.UUID): ID of an image returned by `claim`
+
+        Returns:
+            Optional[str]: New processing state, None if the image was deleted meanwhile
+        """
+        image = cls.objects.filter(image_id=image_id).first()
+
+        if image is None:
+            return None
+
+        original = image.image.name
+        rendition_model = cls._rendition_model()
+        renditions = []
 
+        try:
+            with image.image.open('rb') as file:
+                encoded = create_renditions(file, max_widths={size.value: size.max_width for size in RENDITION_SIZE})
+        except Exception as e:
+            logger.error(f"Error occurred while processing image {image_id}: {e}", exc_info=True)
+            state = PROCESSING_STATE.FAILED if image.processing_attempts >= MAX_PROCESSING_ATTEMPTS else PROCESSING_STATE.PENDING
+            cls.objects.filter(image_id=image_id, processing_state=PROCESSING_STATE.PROCESSING.value).update(processing_state=state.value)
+            return state.value
+
+        owner_model = cls._owner_model()
+        owner_id = getattr(image, f"{cls.owner_field}_id")
+
+        # The files are stored in the transaction referencing them, a reused file stays locked until the commit
         try:
             with transaction.atomic():
-                for image in images:
-                    compressed_image = validate_image(image)
+                for size, rendition in encoded.items():
+                    renditions.append(rendition_model(image=image, size=size, width=rendition.width, height=rendition.height, bytes=rendition.file.size))
+                    if size == RENDITION_SIZE.FULL.value:
+                        # The full rendition replaces the original as the file of the image
+                        image.image.save(os.path.basename(rendition.file.name), rendition.file, save=False)
+                        renditions[-1].file = image.image.name
+                    else:
+                        renditions[-1].file.save(os.path.basename(rendition.file.name), rendition.file, save=False)
 
-                    image_obj = cls(property=property, image=compressed_image)
-                    image_objects.append(image_obj)
+                processed = cls.objects.filter(image_id=image_id, processing_state=PROCESSING_STATE.PROCESSING.value).update(
+                    image=image.image.name,
+                    processing_state=PROCESSING_STATE.READY.value,
+                )
 
-                cls.objects.bulk_create(image_objects)
-                
-        except Exception as e:
-            raise e
+                if processed:
+                    rendition_model.objects.bulk_create(renditions)
+                    owner_model.objects.filter(pk=owner_id).update(
+                        image_count=F('image_count') + 1,
+                        cover_image_id=Coalesce(F('cover_image_id'), Value(image_id, output_field=models.UUIDField())),
+                        updated_at=timezone.now(),
+                    )
+        except Exception:
+            # The rows were rolled back, the files saved so far are referenced by nothing
+            cls.release_files(rendition.file.name for rendition in renditions if rendition.file)
+            raise
 
+        # Drop whichever files are no longer referenced
+        cls.release_files([original] if processed else [rendition.file.name for rendition in renditions])
 
+        if not processed:
+            return None
 
+        owner = owner_model.objects.filter(pk=owner_id).first()
+        if owner is not None:
+            images_saved.send(sender=cls, **{cls.owner_field: owner})
+
+        return PROCESSING_STATE.READY.value
+
+
+class ImageRendition(models.Model):
+    """Stored WebP rendition of a processed image at one of the `RENDITION_SIZE` widths"""
+    rendition_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, null=False)
+    size = models.CharField(max_length=20, choices=RENDITION_SIZE.choices())
+    file = models.ImageField(upload_to=upload_rendition_to, storage=image_storage, db_index=True)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    bytes = models.PositiveIntegerField()
 
-class LandImage(models.Model):
-    image_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, null=False)
-    land = models.ForeignKey(Land, related_name='images', on_delete=models.CASCADE)
-    image = models.ImageField(upload_to=upload_image_to, validators=[validate_image])
-    
     class Meta:
-        db_table = 'land_images'
-        app_label = 'property_images'
+        abstract = True
+        constraints = [
+            models.UniqueConstraint(fields=['image', 'size'], name='%(class)s_image_size_unique'),
+        ]
 
     def __str__(self):
-        return str(self.image_id)
+        return f"{self.image_id} {self.size}"
+
+
+class PropertyImage(ProcessedImage):
+    property = models.ForeignKey(Property, related_name='images', on_delete=models.CASCADE)
+
+    owner_field = 'property'
+
+    class Meta(ProcessedImage.Meta):
+        db_table = 'property_images'
+        app_label = 'property_images'
 
     @classmethod
-    def get_image_by_id(cls, image_id: uuid.UUID) -> 'LandImage':
-        """Retrieve image instance using image id"""
-        return cls.objects.filter(image_id=image_id).first()
+    def save(cls, property: Property, images: List[InMemoryUploadedFile]) -> None:
+        """Class method to save property images, they show on the property once processed
+
+        Args:
+            property (Property): Property for which the images are uplaoded
+            images (List[InMemoryUploadedFile]): List of images
+        """
+        cls.enqueue(owner=property, images=images)
+
+
+class LandImage(ProcessedImage):
+    land = models.ForeignKey(Land, related_name='images', on_delete=models.CASCADE)
+
+    owner_field = 'land'
+
+    class Meta(ProcessedImage.Meta):
+        db_table = 'land_images'
+        app_label = 'property_images'
 
     @classmethod
     def save(cls, land: Land, images: List[InMemoryUploadedFile]) -> None:
-        """Save land images"""
-        image_objects = []
+        """Save land images, they show on the land once processed"""
+        cls.enqueue(owner=land, images=images)
 
-        try:
-            with transaction.atomic():
-                for image in images:
-                    compressed_image = validate_image(image)
-                    image_obj = cls(land=land, image=compressed_image)
-                    image_objects.append(image_obj)
 
-                cls.objects.bulk_create(image_objects)
+class PropertyImageRendition(ImageRendition):
+    image = models.ForeignKey(PropertyImage, related_name='renditions', on_delete=models.CASCADE)
 
-        except Exception as e:
-            raise e
+    class Meta(ImageRendition.Meta):
+        db_table = 'property_image_renditions'
+        app_label = 'property_images'
+
+
+class LandImageRendition(ImageRendition):
+    image = models.ForeignKey(LandImage, related_name='renditions', on_delete=models.CASCADE)
+
+    class Meta(ImageRendition.Meta):
+        db_table = 'land_image_renditions'
+        app_label = 'property_images'
@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from property_images.models import LandImage, LandImageRendition, ProcessedImage, PropertyImage, PropertyImageRendition
+
+
+@receiver(post_delete, sender=PropertyImage)
+@receiver(post_delete, sender=LandImage)
+def release_image_file(sender, instance, **kwargs):
+    name = instance.image.name
+    transaction.on_commit(lambda: ProcessedImage.release_files([name]))
+
+
+@receiver(post_delete, sender=PropertyImageRendition)
+@receiver(post_delete, sender=LandImageRendition)
+def release_rendition_file(sender, instance, **kwargs):
+    name = instance.file.name
+    transaction.on_commit(lambda: ProcessedImage.release_files([name]))
@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# Sent after images are bulk created for a property or land, bulk_create does not send post_save
+images_saved = Signal()
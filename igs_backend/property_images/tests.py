@@ -1,3 +1,299 @@
-from django.test import TestCase
+from io import BytesIO, StringIO
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from PIL import Image
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
 
-# Create your tests here.
+from house.models import House
+from house.serializers import ResponseHouseDetailSerializer
+from listing.models import ListingSearchIndex
+from listing.tests import seed_listings
+from property_images.enums.processing_state import PROCESSING_STATE
+from property_images.enums.rendition_size import RENDITION_SIZE
+from property_images.models import MAX_PROCESSING_ATTEMPTS, PROCESSING_TIMEOUT, ProcessedImage, PropertyImage
+from utils import upload_image
+from utils.upload_image import MAX_ENCODE_ATTEMPTS, MIN_QUALITY, create_renditions
+
+
+def image_upload(name: str = 'photo.jpg') -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new('RGB', (2400, 1600), 'green').save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class ImageProcessingTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_settings = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media_settings.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_listings(total=1)
+
+    def setUp(self):
+        self.house = House.objects.get()
+        ListingSearchIndex.sync_property(property_id=self.house.pk)
+
+    def indexed_image_count(self) -> int:
+        # Searches only return index rows with images
+        return ListingSearchIndex.objects.get(listing_id=self.house.pk).image_count
+
+    def process_images(self):
+        call_command('process_images', workers=0, once=True, stdout=StringIO())
+
+    def test_listing_shows_once_an_image_is_ready(self):
+        PropertyImage.save(property=self.house, images=[image_upload(), image_upload()])
+
+        self.assertEqual(set(PropertyImage.objects.values_list('processing_state', flat=True)), {PROCESSING_STATE.PENDING.value})
+        self.assertEqual(self.indexed_image_count(), 0)
+
+        self.process_images()
+
+        self.house.refresh_from_db()
+        self.assertEqual(self.house.image_count, 2)
+        self.assertIn(self.house.cover_image_id, PropertyImage.objects.ready().values_list('image_id', flat=True))
+        self.assertEqual(self.indexed_image_count(), 2)
+
+        image = PropertyImage.objects.first()
+        self.assertTrue(image.image.name.endswith('.webp'))
+        self.assertLessEqual(Image.open(image.image.path).width, 1920)
+
+    def test_processing_stores_renditions(self):
+        PropertyImage.save(property=self.house, images=[image_upload()])
+        self.process_images()
+
+        image = PropertyImage.objects.get()
+        renditions = {rendition.size: rendition for rendition in image.renditions.all()}
+
+        self.assertEqual({size: rendition.width for size, rendition in renditions.items()}, {'full': 1920, 'medium': 960, 'thumbnail': 320})
+        self.assertEqual(renditions['full'].file.name, image.image.name)
+        self.assertEqual(Image.open(renditions['thumbnail'].file.path).size, (320, 213))
+        self.assertEqual(PropertyImage.get_image_file(image.image_id, RENDITION_SIZE.THUMBNAIL.value), renditions['thumbnail'].file.name)
+
+        srcset = ResponseHouseDetailSerializer(House.get_house_by_id(property_id=self.house.pk)).data['image_srcsets'][0]['srcset']
+        self.assertRegex(srcset, r'\?size=thumbnail 320w, .+\?size=medium 960w, [^?]+/ 1920w$')
+
+    def test_narrow_images_only_keep_the_full_rendition(self):
+        buffer = BytesIO()
+        Image.new('RGB', (300, 200), 'green').save(buffer, 'JPEG')
+        PropertyImage.save(property=self.house, images=[SimpleUploadedFile('small.jpg', buffer.getvalue(), content_type='image/jpeg')])
+        self.process_images()
+
+        image = PropertyImage.objects.get()
+        self.assertEqual(list(image.renditions.values_list('size', 'width')), [('full', 300)])
+        self.assertEqual(PropertyImage.get_image_file(image.image_id, RENDITION_SIZE.THUMBNAIL.value), image.image.name)
+
+    def test_image_endpoint_streams_with_validators_and_ranges(self):
+        PropertyImage.save(property=self.house, images=[image_upload()])
+        image = PropertyImage.objects.get()
+        url = f'/api/v2/property/images/property-images/{image.pk}/'
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        self.process_images()
+        image.refresh_from_db()
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), image.image.read())
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        partial = self.client.get(url, HTTP_RANGE='bytes=0-9')
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial['Content-Range'], f"bytes 0-9/{image.image.size}")
+        self.assertEqual(b''.join(partial.streaming_content), image.image.open('rb').read(10))
+        unsatisfiable = self.client.get(url, HTTP_RANGE=f'bytes={image.image.size}-')
+        self.assertEqual(unsatisfiable.status_code, 416)
+        self.assertFalse(unsatisfiable.has_header('Cache-Control'))
+
+        head = self.client.head(url)
+        self.assertEqual(head['Content-Length'], str(image.image.size))
+        self.assertEqual(head.content, b'')
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_LOCATION='/protected-media/')
+    def test_image_endpoint_redirects_to_nginx(self):
+        PropertyImage.save(property=self.house, images=[image_upload()])
+        self.process_images()
+        image = PropertyImage.objects.get()
+
+        response = self.client.get(f'/api/v2/property/images/property-images/{image.pk}/', {'size': 'thumbnail'})
+
+        name = PropertyImage.get_image_file(image.pk, RENDITION_SIZE.THUMBNAIL.value)
+        self.assertRegex(name, r'^property_images/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.webp$')
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{name}')
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['Content-Type'], 'image/webp')
+
+    def test_broken_image_fails_after_retries(self):
+        PropertyImage.save(property=self.house, images=[image_upload()])
+        image = PropertyImage.objects.get()
+        # Stored files are shared by content, the broken bytes go to a file of their own
+        image.image.save('broken.jpg', ContentFile(b'not an image'), save=False)
+        PropertyImage.objects.filter(pk=image.pk).update(image=image.image.name)
+
+        for _ in range(MAX_PROCESSING_ATTEMPTS):
+            self.process_images()
+
+        image.refresh_from_db()
+        self.assertEqual(image.processing_state, PROCESSING_STATE.FAILED.value)
+        self.assertEqual(image.processing_attempts, MAX_PROCESSING_ATTEMPTS)
+        self.assertFalse(image.renditions.exists())
+        self.assertEqual(self.indexed_image_count(), 0)
+
+    def test_identical_uploads_share_a_file_until_the_last_is_deleted(self):
+        PropertyImage.save(property=self.house, images=[image_upload('a.jpg'), image_upload('b.jpg')])
+        self.process_images()
+        first, second = PropertyImage.objects.order_by('uploaded_at', 'image_id')
+        names = {first.image.name, *first.renditions.values_list('file', flat=True)}
+
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(set(first.renditions.values_list('file', flat=True)), set(second.renditions.values_list('file', flat=True)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(all(os.path.exists(os.path.join(self.media_root, name)) for name in names))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(any(os.path.exists(os.path.join(self.media_root, name)) for name in names))
+
+    def test_deleting_the_cover_picks_the_next_image(self):
+        images = PropertyImage.objects.bulk_create([
+            PropertyImage(property=self.house, image=f'property_images/{i}.webp') for i in range(3)
+        ])
+        call_command('sync_image_counters', stdout=StringIO())
+        cover, *others = sorted(images, key=lambda image: image.image_id)
+
+        self.house.refresh_from_db()
+        self.assertEqual((self.house.image_count, self.house.cover_image_id), (3, cover.image_id))
+
+        PropertyImage.objects.get(pk=cover.pk).delete()
+
+        self.house.refresh_from_db()
+        row = ListingSearchIndex.objects.get(listing_id=self.house.pk)
+        self.assertEqual((self.house.image_count, self.house.cover_image_id), (2, others[0].image_id))
+        self.assertEqual((row.image_count, row.cover_image_id), (2, others[0].image_id))
+
+    def test_deleting_a_queued_image_keeps_the_counter(self):
+        PropertyImage.save(property=self.house, images=[image_upload()])
+        self.process_images()
+        PropertyImage.save(property=self.house, images=[image_upload()])
+
+        PropertyImage.objects.get(processing_state=PROCESSING_STATE.PENDING.value).delete()
+
+        self.house.refresh_from_db()
+        self.assertEqual(self.house.image_count, 1)
+
+    def test_timed_out_claims_use_up_the_attempts(self):
+        PropertyImage.save(property=self.house, images=[image_upload('a.jpg'), image_upload('b.jpg')])
+        retried, exhausted = PropertyImage.objects.order_by('uploaded_at', 'image_id')
+        started_at = timezone.now() - PROCESSING_TIMEOUT * 2
+        PropertyImage.objects.filter(pk=retried.pk).update(processing_state=PROCESSING_STATE.PROCESSING.value, processing_started_at=started_at, processing_attempts=1)
+        PropertyImage.objects.filter(pk=exhausted.pk).update(processing_state=PROCESSING_STATE.PROCESSING.value, processing_started_at=started_at, processing_attempts=MAX_PROCESSING_ATTEMPTS)
+
+        self.assertEqual(PropertyImage.claim(limit=10), [retried.pk])
+
+        exhausted.refresh_from_db()
+        self.assertEqual(exhausted.processing_state, PROCESSING_STATE.FAILED.value)
+        self.assertEqual(exhausted.processing_attempts, MAX_PROCESSING_ATTEMPTS)
+
+    def test_database_errors_do_not_stop_the_batch(self):
+        PropertyImage.save(property=self.house, images=[image_upload('a.jpg'), image_upload('b.jpg')])
+        first, second = PropertyImage.objects.order_by('uploaded_at', 'image_id')
+        process = PropertyImage.process.__func__
+
+        def fail_first(cls, image_id):
+            if image_id == first.pk:
+                raise DatabaseError('connection lost')
+            return process(cls, image_id)
+
+        with mock.patch.object(PropertyImage, 'process', classmethod(fail_first)):
+            self.process_images()
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        # The failed image waits for its claim to time out
+        self.assertEqual(first.processing_state, PROCESSING_STATE.PROCESSING.value)
+        self.assertEqual(second.processing_state, PROCESSING_STATE.READY.value)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "File name locks need PostgreSQL")
+class SharedFileLockTestCase(TransactionTestCase):
+    """Runs with real commits, the release happens on another connection"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.media_settings.enable()
+        seed_listings(total=1)
+        self.house = House.objects.get()
+
+    def tearDown(self):
+        self.media_settings.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_release_waits_for_a_reuse_to_commit(self):
+        image = PropertyImage.enqueue(owner=self.house, images=[image_upload('a.jpg')])[0]
+        name = image.image.name
+        # The file is left without references, as after the delete of its last image
+        PropertyImage.objects.filter(pk=image.pk).update(image='property_images/other.jpg')
+
+        def release():
+            try:
+                ProcessedImage.release_files([name])
+            finally:
+                connection.close()
+
+        with transaction.atomic():
+            self.assertEqual(PropertyImage.enqueue(owner=self.house, images=[image_upload('b.jpg')])[0].image.name, name)
+
+            releaser = threading.Thread(target=release)
+            releaser.start()
+            releaser.join(timeout=0.5)
+            # The reference is not committed yet, the release waits for it instead of deleting the file
+            self.assertTrue(releaser.is_alive())
+
+        releaser.join()
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, name)))
+
+
+class ImageEncodingTestCase(SimpleTestCase):
+    def noisy_upload(self) -> BytesIO:
+        buffer = BytesIO()
+        Image.frombytes('RGB', (600, 400), os.urandom(600 * 400 * 3)).resize((2400, 1600)).save(buffer, 'JPEG', quality=95)
+        buffer.seek(0)
+        return buffer
+
+    def test_encodes_under_the_byte_budget(self):
+        full = create_renditions(self.noisy_upload(), {'full': 1920}, max_bytes=700_000)['full']
+
+        self.assertLessEqual(full.file.size, 700_000)
+        self.assertEqual((full.width, full.height), (1920, 1280))
+        self.assertEqual(Image.open(full.file).format, 'WEBP')
+
+    def test_gives_up_on_an_unreachable_budget(self):
+        with mock.patch('utils.upload_image._webp_bytes', wraps=upload_image._webp_bytes) as encode:
+            full = create_renditions(self.noisy_upload(), {'full': 1920}, max_bytes=1000)['full']
+
+        self.assertLessEqual(encode.call_count, MAX_ENCODE_ATTEMPTS)
+        self.assertEqual(encode.call_args_list[-1].kwargs['quality'], MIN_QUALITY)
+        self.assertGreater(full.file.size, 1000)
@@ -1,17 +1,23 @@
 from decimal import Decimal
 import uuid
+from typing import Tuple
 from django.db import models
 from account.models import Account
-from house.enums.availability_status import STATUS
 from house.enums.category import CATEGORY
 from house.enums.room_category import ROOM_CATEGORY
+from listing.enums.listing_type import LISTING_TYPE
+from listing.models import ListingSearchIndex
 from location.models import Location
+from property.enums.property_type import PROPERTY_TYPE
 from property.models import Property
 from user.models import Agent
 from django.core.exceptions import PermissionDenied, ValidationError
-from django.db.models import QuerySet, Q, Count, When, Case, IntegerField, Value, OuterRef, Exists
+from django.db.models import QuerySet
+from utils.prefetch import images_prefetch
 
 class Room(Property):
+    default_property_type = PROPERTY_TYPE.ROOM.value
+
     room_category = models.CharField(max_length=100, choices=ROOM_CATEGORY.choices(), default=ROOM_CATEGORY.default(), null=False, blank=False)
     
     class Meta:
@@ -20,7 +26,7 @@ class Room(Property):
         
     def delete(self) -> None:
         self.is_deleted = True
-        self.save(update_fields=["is_deleted"], skip_validation=True)
+        self.save(update_fields=["is_deleted", "updated_at"], skip_validation=True)
         
     @classmethod
     def soft_delete_room(cls, property_id: uuid.UUID, agent: Agent) -> None:
@@ -83,6 +89,8 @@ class Room(Property):
             furnishing_status=furnishing_status,
             room_category=room_category,
             rental_duration=rental_duration,
+            is_paid=account.is_paid(),
+            property_type=PROPERTY_TYPE.ROOM.value,
         )
 
         instance.save()
@@ -99,7 +107,7 @@ class Room(Property):
         Returns:
             Room or None: The room instance that matches the given property ID, or None if no match is found.
         """
-        return cls.objects.filter(property_id=property_id, is_deleted = False).first()
+        return cls.objects.select_related('location').prefetch_related(images_prefetch(cls, renditions=True)).filter(property_id=property_id, is_deleted = False).first()
     
     @classmethod
     def get_agent_room(cls, agent: Agent, property_id: uuid.UUID) -> 'Room':
@@ -124,7 +132,7 @@ class Room(Property):
         Returns:
             QuerySet[Room]: A queryset containing all rooms associated with the given agent.
         """
-        return cls.objects.filter(agent=agent, is_deleted = False).order_by('-listing_date')
+        return cls.objects.select_related('location').prefetch_related(images_prefetch(cls)).filter(agent=agent, is_deleted = False).order_by('-listing_date')
     
     @classmethod
     def get_rooms_with_no_images(cls, agent: Agent) -> 'QuerySet[Room]':
@@ -136,16 +144,16 @@ class Room(Property):
         Returns:
             QuerySet[Room]: A queryset of rooms filtered based on the given criteria.
         """
-        return cls.objects.filter(agent=agent, is_deleted = False).annotate(
-            image_count = Count('images', distinct=True)
-        ).filter(image_count = 0)
+        return cls.objects.filter(agent=agent, is_deleted = False, image_count = 0)
     
     @classmethod
     def room_filter(cls, region: str = None, district: str = None, min_price: Decimal = None, 
                     max_price: Decimal = None, room_category: str = None, ward: str = None, 
-                    street: str = None) -> 'QuerySet[Room]':
+                    street: str = None, region_id: uuid.UUID = None, district_id: uuid.UUID = None,
+                    q: str = None, near: Tuple[float, float, float] = None,
+                    bbox: Tuple[float, float, float, float] = None) -> 'QuerySet[ListingSearchIndex]':
         """
-        Class method to filter rooms based on the given criteria.
+        Class method to filter available rooms with images from the listing search index, paid listings first.
 
         Args:
             region (str, optional): The region of the property. Defaults to None.
@@ -155,57 +163,33 @@ class Room(Property):
             room_category (str, optional): The category of the room (e.g., 'Bedroom'). Defaults to None.
             ward (str, optional): The ward of the property. Defaults to None.
             street (str, optional): The street of the property. Defaults to None.
+            region_id (uuid.UUID, optional): The region ID of the property. Defaults to None.
+            district_id (uuid.UUID, optional): The district ID of the property. Defaults to None.
+            q (str, optional): Keywords searched in the description, nearby facilities and utilities. Defaults to None.
+            near (Tuple[float, float, float], optional): (latitude, longitude, radius_km) circle to search in. Defaults to None.
+            bbox (Tuple[float, float, float, float], optional): (min_lng, min_lat, max_lng, max_lat) box to search in. Defaults to None.
 
         Returns:
-            QuerySet[Room]: A queryset of rooms filtered based on the given criteria.
+            QuerySet[ListingSearchIndex]: Ordered index rows, load the rooms with `ListingSearchIndex.hydrate`
         """
         
         if room_category and not ROOM_CATEGORY.valid(room_category=room_category):
             raise ValueError(f"Invalid room category: {room_category}.")
 
-        filters = Q(
-            status=STATUS.AVAILABLE.value,
-            is_active_account=True,
+        return ListingSearchIndex.search(
+            listing_types=[LISTING_TYPE.ROOM.value],
+            with_images=True,
             category=CATEGORY.RENTAL.value,
-            is_deleted = False
+            room_category=room_category,
+            region=region,
+            district=district,
+            region_id=region_id,
+            district_id=district_id,
+            ward=ward,
+            street=street,
+            min_price=min_price,
+            max_price=max_price,
+            q=q,
+            near=near,
+            bbox=bbox,
         )
-        
-        if room_category:
-            filters &= Q(room_category=room_category)
-
-        if min_price:
-            filters &= Q(price__gte=min_price)
-
-        if max_price:
-            filters &= Q(price__lte=max_price)
-
-        if region:
-            filters &= Q(location__region__iexact=region)
-
-        if district:
-            filters &= Q(location__district__iexact=district)
-
-        if ward:
-            filters &= Q(location__ward__iexact=ward)
-
-        if street:
-            filters &= Q(location__street__iexact=street)
-
-        paid_account_exists = Account.objects.filter(
-            agent=OuterRef("agent"),
-            is_active=True,
-            plan__is_free=False
-        ).values("pk")
-
-        queryset = cls.objects.filter(filters).annotate(
-            is_paid=Case(
-                When(Exists(paid_account_exists), then=Value(1)),
-                default=Value(0),
-                output_field=IntegerField()
-            ),
-            image_count=Count('images', distinct=True) 
-        ).filter(image_count__gt=0) 
-
-        queryset = queryset.select_related('location').order_by('-is_paid', '-listing_date')
-
-        return queryset
@@ -1,2 +1,3 @@
 from .request_room_serializer import RequestRoomSerializer
-from .response_room_serializer import ResponseMyRoomSerializer, ResponseRoomSerializer
\ No newline at end of file
+from .response_room_serializer import ResponseMyRoomSerializer, ResponseRoomSerializer
+from .response_room_detail_serializer import ResponseRoomDetailSerializer
\ No newline at end of file
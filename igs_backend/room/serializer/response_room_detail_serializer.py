@@ -0,0 +1,18 @@
+from igs_backend import settings
+from shared.serializer import ImageSrcsetField, ImageUrlsField, image_url
+
+from .response_room_serializer import ResponseRoomSerializer
+
+
+class ResponseRoomDetailSerializer(ResponseRoomSerializer):
+    images = ImageUrlsField()
+    image_srcsets = ImageSrcsetField(source='images')
+
+    def get_cover_image(self, obj):
+        """
+        Full URL of the cover image of this room, read from the maintained cover image column.
+        """
+        if obj.cover_image_id is None:
+            return None
+
+        return image_url(settings.PROPERTY_IMAGE_BASE_URL, obj.cover_image_id)
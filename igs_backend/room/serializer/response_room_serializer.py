@@ -2,62 +2,43 @@ from rest_framework import serializers
 from igs_backend import settings
 from location.serializers import ResponseLocationSerializer
 from room.models import Room
+from property_images.enums.rendition_size import RENDITION_SIZE
+from shared.serializer import ImageUrlsField, SparseFieldsMixin, image_url
 
 
-class ResponseRoomSerializer(serializers.ModelSerializer):
+class ResponseRoomSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     location = ResponseLocationSerializer(many=False)
-    images = serializers.SerializerMethodField()
+    images = ImageUrlsField(size=RENDITION_SIZE.THUMBNAIL.value)
+    cover_image = serializers.SerializerMethodField()
     is_active_account = serializers.BooleanField(write_only=True)
     agent = serializers.UUIDField(write_only=True)
     is_deleted = serializers.BooleanField(write_only=True)
 
     class Meta:
         model = Room
-        fields = '__all__'
+        exclude = ['is_paid', 'image_count', 'cover_image_id', 'property_type']
 
-    def get_images(self, obj):
+    field_columns = {
+        'cover_image': ['cover_image_id'],
+    }
+
+    def get_cover_image(self, obj):
         """
-        Generate full URLs for the images associated with this Room in the desired format.
+        Thumbnail URL of the cover image of this room, read from the maintained cover image column.
         """
-        images = obj.images.all()
-        image_urls = []
-
-        base_url = settings.PROPERTY_IMAGE_BASE_URL 
+        if obj.cover_image_id is None:
+            return None
 
-        for image in images:
-            image_id = image.image_id
-            
-            image_url = f"{base_url}/{image_id}/"
-            
-            image_urls.append(image_url)
+        return image_url(settings.PROPERTY_IMAGE_BASE_URL, obj.cover_image_id, RENDITION_SIZE.THUMBNAIL.value)
 
-        return image_urls
     
 
 class ResponseMyRoomSerializer(serializers.ModelSerializer):
     location = ResponseLocationSerializer(many=False)
-    images = serializers.SerializerMethodField()
+    images = ImageUrlsField()
     is_active_account = serializers.BooleanField(write_only=True)
     agent = serializers.UUIDField(write_only=True)
 
     class Meta:
         model = Room
-        fields = '__all__'
-
-    def get_images(self, obj):
-        """
-        Generate full URLs for the images associated with this Room in the desired format.
-        """
-        images = obj.images.all()
-        image_urls = []
-
-        base_url = settings.PROPERTY_IMAGE_BASE_URL 
-
-        for image in images:
-            image_id = image.image_id
-            
-            image_url = f"{base_url}/{image_id}/"
-            
-            image_urls.append(image_url)
-
-        return image_urls
+        exclude = ['is_paid', 'image_count', 'cover_image_id', 'property_type']
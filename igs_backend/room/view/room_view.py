@@ -6,14 +6,24 @@ from rest_framework import viewsets, permissions, status
 from authentication.custom_permissions import IsAgent
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
+from shared.renderers import ORJSONRenderer
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from house.enums.room_category import ROOM_CATEGORY
+from listing.enums.listing_type import LISTING_TYPE
+from listing.models import ListingSearchIndex
+from listing.search_cache import SearchCache
+from listing.serializers import ListingCardSerializer
 from location.models import Location, District
 from property.models import Property
 from property_images.models import PropertyImage
 from room.models import Room
-from room.serializers import RequestRoomSerializer, ResponseRoomSerializer, ResponseMyRoomSerializer
+from room.serializers import RequestRoomSerializer, ResponseRoomDetailSerializer, ResponseRoomSerializer, ResponseMyRoomSerializer
+from shared.mixins import CachedSearchMixin
+from shared.pagination import ListingPagination
+from shared.serializer import SparseFieldsMixin
+from utils import geohash
 from shared.seriaizers import DetailResponseSerializer
 import logging
 from rest_framework.pagination import PageNumberPagination
@@ -22,14 +32,16 @@ from django.core.exceptions import PermissionDenied, ValidationError
 
 from user.models import Agent, User
 
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import never_cache
 
 
 logger = logging.getLogger(__name__)
 
-@method_decorator(never_cache, name='dispatch')
-class RoomViewSet(viewsets.ModelViewSet):
+class RoomViewSet(CachedSearchMixin, viewsets.ModelViewSet):
+    cache_control = {
+        'room_filter': {'public': True, 'max_age': 30},
+        'room_detail': {'public': True, 'max_age': 60},
+    }
+
     def get_serializer_class(self):
         return RequestRoomSerializer
     
@@ -152,7 +164,8 @@ class RoomViewSet(viewsets.ModelViewSet):
                     ward=validated_data.get("ward"),
                     street=validated_data.get("street"),
                     latitude=validated_data.get("latitude"),
-                    longitude=validated_data.get("longitude")
+                    longitude=validated_data.get("longitude"),
+                    district_ref=district,
                 )
 
                 response = Room.save_room(
@@ -391,6 +404,16 @@ class RoomViewSet(viewsets.ModelViewSet):
                             type=openapi.TYPE_ARRAY,
                             items=openapi.Schema(type=openapi.TYPE_STRING),
                         ),
+                        'image_srcsets': openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    'url': openapi.Schema(type=openapi.TYPE_STRING),
+                                    'srcset': openapi.Schema(type=openapi.TYPE_STRING),
+                                }
+                            ),
+                        ),
                         'room_category': openapi.Schema(type=openapi.TYPE_STRING),
                         'price': openapi.Schema(type=openapi.TYPE_STRING),
                         'rental_duration': openapi.Schema(type=openapi.TYPE_STRING),
@@ -431,8 +454,14 @@ class RoomViewSet(viewsets.ModelViewSet):
             
             if not room:
                 return Response({"detail": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
-            serializer = ResponseRoomSerializer(room, many=False)
-            return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+            etag = self.weak_etag(str(room.pk), room.updated_at.isoformat())
+            not_modified = self.not_modified(request, etag, room.updated_at)
+            if not_modified is not None:
+                return not_modified
+
+            serializer = ResponseRoomDetailSerializer(room, many=False)
+            return self.set_validators(Response(data=serializer.data, status=status.HTTP_200_OK), etag, room.updated_at)
         except Exception as e:
           logger.error(f"Un expected error occured while getting house with id {pk}", exc_info=True)
           return Response(data={"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -539,9 +568,45 @@ class RoomViewSet(viewsets.ModelViewSet):
             openapi.Parameter(
                 'maxPrice', openapi.IN_QUERY, description="Maximum price of the house", type=openapi.TYPE_STRING
             ),
+            openapi.Parameter(
+                'region_id', openapi.IN_QUERY, description="Region ID of the room location, takes precedence over region", type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+            ),
+            openapi.Parameter(
+                'district_id', openapi.IN_QUERY, description="District ID of the room location, takes precedence over district", type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+            ),
+            openapi.Parameter(
+                'q', openapi.IN_QUERY, description="Keywords to search in the description, nearby facilities and utilities, results are ranked by relevance after paid listings", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'lat', openapi.IN_QUERY, description="Latitude of the search center, requires lng and radius_km", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'lng', openapi.IN_QUERY, description="Longitude of the search center, requires lat and radius_km", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'radius_km', openapi.IN_QUERY, description="Only rooms within this many kilometers of lat/lng (max 200)", type=openapi.TYPE_NUMBER
+            ),
+            openapi.Parameter(
+                'bbox', openapi.IN_QUERY, description="Only rooms inside the map box `min_lng,min_lat,max_lng,max_lat`", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'view', openapi.IN_QUERY, description="`card` returns the compact card of each listing instead of the full listing",
+                type=openapi.TYPE_STRING, enum=['card']
+            ),
+            openapi.Parameter(
+                'fields', openapi.IN_QUERY, description="Comma separated fields to return, e.g. `property_id,price,cover_image`", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'page_size', openapi.IN_QUERY, description="Listings per page, at most 50", type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'cursor', openapi.IN_QUERY,
+                description="Opt in cursor pagination, send an empty value for the first page then follow `next`",
+                type=openapi.TYPE_STRING
+            ),
         ]
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=[ORJSONRenderer, BrowsableAPIRenderer])
     def room_filter(self, request: HttpRequest):
         room_category: str = request.GET.get('roomCategory')
         region: str = request.GET.get('region')
@@ -550,6 +615,9 @@ class RoomViewSet(viewsets.ModelViewSet):
         max_price: str = request.GET.get('maxPrice')
         street: str = request.GET.get('street')
         ward: str = request.GET.get('ward')
+        region_id: str = request.GET.get('region_id')
+        district_id: str = request.GET.get('district_id')
+        q: str = request.GET.get('q')
 
         try:
             min_price = Decimal(min_price) if min_price else None
@@ -558,18 +626,33 @@ class RoomViewSet(viewsets.ModelViewSet):
             return Response({"detail": "Invalid price format."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            rooms = Room.room_filter(room_category=room_category, region=region, district=district, min_price=min_price, max_price=max_price, street=street, ward=ward)
-            
+            region_id = uuid.UUID(region_id) if region_id else None
+            district_id = uuid.UUID(district_id) if district_id else None
+        except ValueError:
+            return Response({"detail": "Invalid region or district ID."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            near = geohash.parse_radius(request.GET.get('lat'), request.GET.get('lng'), request.GET.get('radius_km'))
+            bbox = geohash.parse_bbox(request.GET.get('bbox'))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        cache_key = SearchCache.key('room_filter', [LISTING_TYPE.ROOM.value], request)
+        cached = self.cached_search_response(request, cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            rooms = Room.room_filter(room_category=room_category, region=region, district=district, min_price=min_price, max_price=max_price, street=street, ward=ward, region_id=region_id, district_id=district_id, q=q, near=near, bbox=bbox)
             
-            paginator = PageNumberPagination()
             
-            page = paginator.paginate_queryset(rooms, request)
-            if page is not None:
-                serializer = ResponseRoomSerializer(page, many=True)
-                return paginator.get_paginated_response(serializer.data)
+            fields = SparseFieldsMixin.parse_fields(request.GET.get('fields'))
+            serializer_class = ListingCardSerializer if request.GET.get('view') == 'card' else ResponseRoomSerializer
 
-            serializer = ResponseRoomSerializer(rooms, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            def render(rows):
+                return ListingSearchIndex.render(rows, model=Room, serializer_class=serializer_class, fields=fields)
+
+            return self.search_response(request, cache_key, rooms, ListingPagination(), render)
         except ValueError as e:
             logger.error(f"Validation error occurred: {e}", exc_info=True)
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1 @@
+from .compression_middleware import CompressionMiddleware
@@ -0,0 +1,161 @@
+import gzip
+import zlib
+from typing import Dict, Iterable, Optional
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class _GzipEncoder:
+    encoding = 'gzip'
+
+    def __init__(self):
+        # wbits 31 writes the gzip container instead of a raw zlib stream
+        self._stream = zlib.compressobj(settings.RESPONSE_COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    @staticmethod
+    def compress(data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=settings.RESPONSE_COMPRESSION_GZIP_LEVEL, mtime=0)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._stream.compress(data) + self._stream.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._stream.flush()
+
+
+class _BrotliEncoder:
+    encoding = 'br'
+
+    def __init__(self):
+        self._stream = brotli.Compressor(quality=settings.RESPONSE_COMPRESSION_BROTLI_QUALITY)
+
+    @staticmethod
+    def compress(data: bytes) -> bytes:
+        return brotli.compress(data, quality=settings.RESPONSE_COMPRESSION_BROTLI_QUALITY)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._stream.process(data) + self._stream.flush()
+
+    def finish(self) -> bytes:
+        return self._stream.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress API responses with brotli or gzip.
+
+    Responses under `RESPONSE_COMPRESSION_PATHS` with a text or JSON body of at least
+    `RESPONSE_COMPRESSION_MIN_SIZE` bytes are sent with the encoding the client prefers among
+    `RESPONSE_COMPRESSION_ENCODINGS`, ties going to the first one listed. `br` is only offered
+    when the Brotli package is installed. Streaming responses are compressed chunk by chunk and
+    each chunk is flushed, so nothing is held back waiting for the rest of the stream.
+    """
+    encoders = {'gzip': _GzipEncoder}
+    if brotli is not None:
+        encoders['br'] = _BrotliEncoder
+
+    compressible_types = ('application/json', 'application/javascript', 'text/')
+
+    @staticmethod
+    def _accepted(header: str) -> Dict[str, float]:
+        """Quality of each coding listed in an Accept-Encoding header"""
+        accepted = {}
+
+        for item in header.split(','):
+            coding, _, params = item.strip().partition(';')
+            quality = 1.0
+
+            for param in params.split(';'):
+                name, _, value = param.strip().partition('=')
+                if name.strip().lower() == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+
+            if coding:
+                accepted[coding.strip().lower()] = quality
+
+        return accepted
+
+    @classmethod
+    def select_encoding(cls, header: str) -> Optional[str]:
+        """Enabled encoding to answer an Accept-Encoding header with
+
+        Args:
+            header (str): Accept-Encoding of the request
+
+        Returns:
+            Optional[str]: Content coding, None to send the body as it is
+        """
+        accepted = cls._accepted(header)
+        enabled = [encoding for encoding in settings.RESPONSE_COMPRESSION_ENCODINGS if encoding in cls.encoders]
+        qualities = {encoding: accepted.get(encoding, accepted.get('*', 0.0)) for encoding in enabled}
+        candidates = [encoding for encoding in enabled if qualities[encoding] > 0]
+
+        return max(candidates, key=lambda encoding: qualities[encoding], default=None)
+
+    def _is_compressible(self, request, response) -> bool:
+        if not request.path.startswith(tuple(settings.RESPONSE_COMPRESSION_PATHS)):
+            return False
+
+        if response.has_header('Content-Encoding') or 'no-transform' in response.get('Cache-Control', ''):
+            return False
+
+        if not response.get('Content-Type', '').startswith(self.compressible_types):
+            return False
+
+        return response.streaming or len(response.content) >= settings.RESPONSE_COMPRESSION_MIN_SIZE
+
+    @staticmethod
+    def _compress_stream(encoder, chunks: Iterable[bytes]):
+        for chunk in chunks:
+            data = encoder.chunk(chunk)
+            if data:
+                yield data
+        yield encoder.finish()
+
+    @staticmethod
+    async def _acompress_stream(encoder, chunks):
+        async for chunk in chunks:
+            data = encoder.chunk(chunk)
+            if data:
+                yield data
+        yield encoder.finish()
+
+    def process_response(self, request, response):
+        if not self._is_compressible(request, response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = self.select_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        encoder = self.encoders[encoding]
+
+        if response.streaming:
+            stream = self._acompress_stream if response.is_async else self._compress_stream
+            response.streaming_content = stream(encoder(), response.streaming_content)
+            # The compressed size is only known once the stream ends
+            del response.headers['Content-Length']
+        else:
+            compressed = encoder.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # A strong ETag names the exact bytes, the encoded body is only equivalent to them
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = f"W/{etag}"
+
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,3 @@
+from .conditional_response_mixin import ConditionalResponseMixin
+from .media_file_mixin import MediaFileMixin
+from .cached_search_mixin import CachedSearchMixin
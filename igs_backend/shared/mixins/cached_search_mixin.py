@@ -0,0 +1,66 @@
+from typing import Callable, Iterable, Optional
+from rest_framework import status
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+from listing.search_cache import SearchCache
+from .conditional_response_mixin import ConditionalResponseMixin
+
+
+class CachedSearchMixin(ConditionalResponseMixin):
+    """Conditional GET for search actions whose responses are kept in the `SearchCache`.
+
+    Actions look the request up with `cached_search_response` before building their query and
+    answer with `search_response`, which paginates, validates, renders and caches the page.
+    """
+
+    def cached_search_response(self, request, cache_key: str) -> Optional[Response]:
+        """Response of a search already rendered for the same parameters
+
+        Returns:
+            Optional[Response]: Cached or not modified response, None when the search must run
+        """
+        cached = SearchCache.get(cache_key)
+
+        if cached is None:
+            return None
+
+        not_modified = self.not_modified(request, cached['etag'], cached['last_modified'])
+        if not_modified is not None:
+            return not_modified
+
+        return self.set_validators(Response(cached['data'], status=status.HTTP_200_OK), cached['etag'], cached['last_modified'])
+
+    def search_response(self, request, cache_key: str, listings: Iterable, paginator: BasePagination, render: Callable[[list], list]) -> Response:
+        """Paginated search response, cached under `cache_key` once rendered
+
+        Args:
+            request (HttpRequest): Search request
+            cache_key (str): Key from `SearchCache.key`
+            listings (Iterable): Rows of the search with `pk` and `updated_at`
+            paginator (BasePagination): Paginator of the action
+            render (Callable[[list], list]): Serializer data of a page of rows
+
+        Returns:
+            Response: Rendered or not modified response with its validators
+        """
+        page = paginator.paginate_queryset(listings, request)
+        paginated = page is not None
+
+        if paginated:
+            etag, last_modified = self.listing_validators(page, *paginator.get_page_state())
+        else:
+            page = list(listings)
+            etag, last_modified = self.listing_validators(page)
+
+        not_modified = self.not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        if paginated:
+            response = paginator.get_paginated_response(render(page))
+        else:
+            response = Response(render(page), status=status.HTTP_200_OK)
+
+        SearchCache.set(cache_key, {'data': response.data, 'etag': etag, 'last_modified': last_modified})
+        return self.set_validators(response, etag, last_modified)
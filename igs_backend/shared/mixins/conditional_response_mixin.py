@@ -0,0 +1,71 @@
+from datetime import datetime
+import hashlib
+from typing import Dict, Iterable, Optional, Tuple
+from django.http import HttpResponse
+from django.utils.cache import add_never_cache_headers, get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+class ConditionalResponseMixin:
+    """Per action Cache-Control policies and conditional GET for viewsets.
+
+    Successful responses of the actions listed in `cache_control` get that policy, every other
+    response is marked uncacheable as with `never_cache`. Actions compute their validators from
+    the cheapest query that identifies the content and call `not_modified` before serializing.
+    """
+    cache_control: Dict[str, Dict] = {}
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        policy = self.cache_control.get(getattr(self, 'action', None))
+
+        if policy is not None and response.status_code in (200, 304):
+            patch_cache_control(response, **policy)
+        else:
+            add_never_cache_headers(response)
+
+        return response
+
+    @staticmethod
+    def weak_etag(*parts) -> str:
+        return f'W/"{hashlib.md5(repr(parts).encode()).hexdigest()}"'
+
+    @classmethod
+    def listing_validators(cls, rows: Iterable, *state) -> Tuple[str, Optional[datetime]]:
+        """Validators of a page of listings from their ids and last update
+
+        Args:
+            rows (Iterable): Page of listings with `pk` and `updated_at`
+            state: Anything else rendered in the response, such as the total count
+
+        Returns:
+            Tuple[str, Optional[datetime]]: Weak ETag and Last-Modified
+        """
+        rows = list(rows)
+        etag = cls.weak_etag(state, [(str(row.pk), row.updated_at.isoformat()) for row in rows])
+        last_modified = max((row.updated_at for row in rows), default=None)
+        return etag, last_modified
+
+    def not_modified(self, request, etag: str, last_modified: Optional[datetime]) -> Optional[HttpResponse]:
+        """Answer with 304 when the client copy is still current
+
+        Returns:
+            Optional[HttpResponse]: Not modified response, None when the content must be sent
+        """
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified.timestamp()) if last_modified else None
+        )
+
+        if response is not None:
+            self.set_validators(response, etag, last_modified)
+
+        return response
+
+    @staticmethod
+    def set_validators(response: HttpResponse, etag: str, last_modified: Optional[datetime]) -> HttpResponse:
+        response['ETag'] = etag
+
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+
+        return response
@@ -0,0 +1,139 @@
+import mimetypes
+import os
+import re
+from typing import Optional
+from urllib.parse import quote
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class MediaFileMixin:
+    """Serve files of the media root from viewset actions without holding them in memory.
+
+    With `MEDIA_ACCEL_REDIRECT_LOCATION` set, the action only resolves the file and answers with
+    an `X-Accel-Redirect` to that internal nginx location, which sends it with sendfile and
+    handles HEAD and Range. Otherwise the file is streamed with `FileResponse`, with the same
+    validators and single byte range support. ETags follow the nginx format, built from the
+    modification time and size, so both paths validate the copies cached by the other.
+    """
+
+    @property
+    def immutable_cache_control(self) -> dict:
+        """Policy of files whose URL never serves other content, such as processed images"""
+        return {'public': True, 'max_age': settings.MEDIA_CACHE_MAX_AGE, 'immutable': True}
+
+    @staticmethod
+    def media_validators(path: str):
+        stat = os.stat(path)
+        return f'"{int(stat.st_mtime):x}-{stat.st_size:x}"', int(stat.st_mtime), stat.st_size
+
+    def serve_media(self, request, name: str, cache_control: dict) -> Optional[HttpResponse]:
+        """Response sending a media file, or telling nginx to send it
+
+        Args:
+            request: Request of the action, conditional and Range headers are honoured
+            name (str): File name relative to the media root
+            cache_control (dict): Cache-Control directives of the response, as for `patch_cache_control`
+
+        Returns:
+            Optional[HttpResponse]: Response, None when the file does not exist
+        """
+        path = os.path.join(settings.MEDIA_ROOT, name)
+
+        if not os.path.isfile(path):
+            return None
+
+        etag, last_modified, size = self.media_validators(path)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+        if response is None:
+            response = self._file_response(request, name, path, etag, size)
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+
+        # A shared cache must not keep a range or precondition error under the file URL
+        if response.status_code in (200, 206, 304):
+            patch_cache_control(response, **cache_control)
+
+        return response
+
+    def _file_response(self, request, name: str, path: str, etag: str, size: int) -> HttpResponse:
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        location = settings.MEDIA_ACCEL_REDIRECT_LOCATION
+
+        if location:
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = f"{location.rstrip('/')}/{quote(name)}"
+            return response
+
+        byte_range = self._byte_range(request, etag, size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f"bytes */{size}"
+            return response
+
+        start, end = byte_range or (0, size - 1)
+        length = end - start + 1
+
+        if request.method == 'HEAD':
+            response = HttpResponse(content_type=content_type)
+        else:
+            file = open(path, 'rb')
+            file.seek(start)
+            response = FileResponse(_FileSlice(file, length), content_type=content_type)
+
+        if byte_range:
+            response.status_code = 206
+            response['Content-Range'] = f"bytes {start}-{end}/{size}"
+
+        response['Content-Length'] = str(length)
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    @staticmethod
+    def _byte_range(request, etag: str, size: int):
+        """First and last byte of a single range request, None for the whole file, False when unsatisfiable"""
+        header = request.META.get('HTTP_RANGE', '').strip()
+        match = RANGE_RE.match(header)
+
+        # Several ranges and ranges of a changed file get the whole file
+        if not match or request.META.get('HTTP_IF_RANGE', etag) != etag or not any(match.groups()):
+            return None
+
+        first, last = match.groups()
+
+        if not first:
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start, end = int(first), min(int(last), size - 1) if last else size - 1
+
+        if start >= size or start > end or (not first and int(last) == 0):
+            return False
+
+        return start, end
+
+
+class _FileSlice:
+    """Reads at most `length` bytes of an open file, closing it with the response"""
+
+    def __init__(self, file, length: int):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
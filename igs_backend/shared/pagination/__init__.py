@@ -0,0 +1,2 @@
+from .listing_pagination import ListingPagination
+from .feed_pagination import FeedPagination
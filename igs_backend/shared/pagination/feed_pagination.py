@@ -0,0 +1,29 @@
+from functools import partial
+from typing import Callable
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+from .listing_pagination import ListingPagination
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator taking its total from a cached count instead of a COUNT over the whole queryset"""
+
+    def __init__(self, object_list, per_page, count: Callable[[], int], **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_function = count
+
+    @cached_property
+    def count(self) -> int:
+        return self.count_function()
+
+
+class FeedPagination(ListingPagination):
+    """Listing pagination of tables whose row count is cached, a page then takes a single query
+
+    Args:
+        count (Callable[[], int]): Cached number of rows of the paginated queryset
+    """
+
+    def __init__(self, count: Callable[[], int]):
+        self.django_paginator_class = partial(CachedCountPaginator, count=count)
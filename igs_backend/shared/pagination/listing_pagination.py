@@ -0,0 +1,153 @@
+import base64
+import json
+from typing import List, Optional
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Field, Func, Q, QuerySet, Value
+from django.db.models.lookups import GreaterThanOrEqual, LessThanOrEqual
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class ListingPagination(PageNumberPagination):
+    """Page number pagination with an opt in keyset (cursor) mode for the public listing endpoints.
+
+    Without the `cursor` query parameter it behaves exactly like `PageNumberPagination`. With
+    `?cursor=` (empty for the first page) each page is fetched with a seek on the ranking columns
+    instead of COUNT(*) and OFFSET. The seek starts the index scan at the cursor, so deep pages
+    cost the same as the first one.
+
+    The ranking is the ordering of the queryset, or `ordering` when the queryset is unordered. It
+    must end with a unique column.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    ordering = ('-is_paid', '-listing_date', 'listing_id')
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> Optional[List]:
+        self.cursor_mode = self.cursor_query_param in request.query_params
+
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.request = request
+        self.model = queryset.model
+        page_size = self.get_page_size(request)
+
+        if not page_size:
+            return None
+
+        if queryset.query.order_by:
+            self.ordering = tuple(queryset.query.order_by)
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request.query_params[self.cursor_query_param])
+
+        if position is not None:
+            queryset = queryset.filter(self.seek_filter(position))
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.rows = rows[:page_size]
+        return self.rows
+
+    def get_paginated_response(self, data) -> Response:
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+
+        return Response({
+            'next': self.get_next_cursor_link(),
+            'previous': None,
+            'results': data,
+        })
+
+    def get_page_state(self) -> tuple:
+        """Pagination values rendered besides the rows, the page validators depend on them"""
+        if self.cursor_mode:
+            return (self.has_next,)
+
+        return (self.page.paginator.count,)
+
+    def get_next_cursor_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.rows[-1]))
+
+    def encode_cursor(self, row) -> str:
+        """Encode the ranking values of the last row of the page"""
+        values = [
+            self.get_field(name).value_to_string(row) if self.get_field(name) else getattr(row, name.lstrip('-'))
+            for name in self.ordering
+        ]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def get_field(self, name: str):
+        """Model field of an ordering column, None for annotations such as a search rank"""
+        try:
+            return self.model._meta.get_field(name.lstrip('-'))
+        except FieldDoesNotExist:
+            return None
+
+    def decode_cursor(self, cursor: str) -> Optional[List]:
+        """Decode a cursor back into ranking values, an empty cursor means the first page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        if not cursor:
+            return None
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+
+            return [
+                self.get_field(name).to_python(value) if self.get_field(name) else value
+                for name, value in zip(self.ordering, values)
+            ]
+        except Exception:
+            raise ValueError("Invalid cursor.")
+
+    def seek_filter(self, position: List) -> Q:
+        """Build the row comparison `(ordering) > (position)` respecting each column direction
+
+        The exact comparison is an OR over the columns, which PostgreSQL can only apply as a filter
+        after reading every skipped row. It is ANDed with a redundant row bound over the leading
+        columns that share a direction, which the index scan uses as its start key.
+        """
+        seek = Q()
+        equal = Q()
+
+        for name, value in zip(self.ordering, position):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            seek |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+
+        return self.leading_bound(position) & seek
+
+    def leading_bound(self, position: List) -> Q:
+        """Row bound `(leading columns) <= (position)`, `>=` when ascending, on the leading model
+        columns that share the direction of the first one and cannot be null"""
+        descending = self.ordering[0].startswith('-')
+        columns, values = [], []
+
+        for name, value in zip(self.ordering, position):
+            field = self.get_field(name)
+
+            if field is None or field.null or name.startswith('-') != descending:
+                break
+
+            columns.append(F(field.name))
+            values.append(Value(value, output_field=field))
+
+        if not columns:
+            return Q()
+
+        comparison = LessThanOrEqual if descending else GreaterThanOrEqual
+        return Q(comparison(Func(*columns, function='ROW', output_field=Field()), Func(*values, function='ROW')))
@@ -0,0 +1,29 @@
+import orjson
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer backed by orjson, producing the same bytes as `JSONRenderer` with the default settings.
+
+    UUIDs and datetimes are encoded natively, UTC as `Z` like the DRF encoder, anything else
+    orjson does not know such as Decimal goes through the DRF encoder. Indented output, non
+    default JSON settings and `FAST_LIST_RENDERING` turned off are left to `JSONRenderer`.
+    """
+    option = orjson.OPT_UTC_Z
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        if (
+            not settings.FAST_LIST_RENDERING
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=self.option)
+        # Escaped by JSONRenderer for JavaScript, these code points end a line there
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -1 +1,5 @@
-from .serializer.detail_response_serializer import DetailResponseSerializer
\ No newline at end of file
+from .serializer.detail_response_serializer import DetailResponseSerializer
+from .serializer.image_urls_field import ImageUrlsField, image_url
+from .serializer.image_srcset_field import ImageSrcsetField
+from .serializer.sparse_fields_mixin import SparseFieldsMixin
+from .serializer.row_converter import RowConverter
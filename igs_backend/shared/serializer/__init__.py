@@ -1 +1,5 @@
-from .detail_response_serializer import DetailResponseSerializer
\ No newline at end of file
+from .detail_response_serializer import DetailResponseSerializer
+from .image_urls_field import ImageUrlsField, image_url
+from .image_srcset_field import ImageSrcsetField
+from .sparse_fields_mixin import SparseFieldsMixin
+from .row_converter import RowConverter
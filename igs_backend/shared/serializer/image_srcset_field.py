@@ -0,0 +1,30 @@
+from igs_backend import settings
+from rest_framework import serializers
+
+from .image_urls_field import ImageUrlsField, image_url
+
+
+class ImageSrcsetField(ImageUrlsField):
+    """URL and `srcset` of each image of a listing, declared with `source='images'`.
+
+    The srcset lists the stored renditions with their width, read from the renditions
+    prefetched by `images_prefetch(..., renditions=True)`. The widest one is the image
+    itself and keeps its plain URL, images without renditions only list that URL.
+    """
+    child = serializers.DictField()
+
+    def to_representation(self, images):
+        base_url = getattr(settings, self.base_url_setting)
+        return [{'url': image_url(base_url, image.image_id), 'srcset': self.srcset(base_url, image)} for image in images.all()]
+
+    @staticmethod
+    def srcset(base_url: str, image) -> str:
+        renditions = sorted(image.renditions.all(), key=lambda rendition: rendition.width)
+
+        if not renditions:
+            return image_url(base_url, image.image_id)
+
+        return ', '.join(
+            f"{image_url(base_url, image.image_id, None if rendition is renditions[-1] else rendition.size)} {rendition.width}w"
+            for rendition in renditions
+        )
@@ -0,0 +1,32 @@
+from typing import Optional
+import uuid
+from igs_backend import settings
+from rest_framework import serializers
+
+
+def image_url(base_url: str, image_id: uuid.UUID, size: Optional[str] = None) -> str:
+    """URL of an image served from `base_url`, at a rendition size when given"""
+    url = f"{base_url}/{image_id}/"
+    return f"{url}?size={size}" if size else url
+
+
+class ImageUrlsField(serializers.ListField):
+    """Full URLs of the images of a listing, declared on the image relation such as `images`.
+
+    Reads the related manager with `.all()` so images prefetched by the model query methods
+    are used as they are, without a query per row. `images_prefetch` only loads ready images.
+    Lists pass a rendition `size` so cards link to a small file instead of the full image.
+    """
+    child = serializers.CharField()
+
+    def __init__(self, base_url_setting: str = 'PROPERTY_IMAGE_BASE_URL', size: Optional[str] = None, **kwargs):
+        kwargs['read_only'] = True
+        self.base_url_setting = base_url_setting
+        self.size = size
+        super().__init__(**kwargs)
+
+    def url(self, image_id: uuid.UUID) -> str:
+        return image_url(getattr(settings, self.base_url_setting), image_id, self.size)
+
+    def to_representation(self, images):
+        return [self.url(image.image_id) for image in images.all()]
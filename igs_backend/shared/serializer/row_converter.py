@@ -0,0 +1,221 @@
+import decimal
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Type
+from django.conf import settings
+from django.db.models import QuerySet
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .image_srcset_field import ImageSrcsetField
+from .image_urls_field import ImageUrlsField
+
+
+# Values read from the database that these fields render unchanged, or that orjson encodes like them
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.URLField,
+    serializers.SlugField,
+    serializers.ChoiceField,
+    serializers.BooleanField,
+    serializers.IntegerField,
+)
+
+
+class _RowObject:
+    """Attribute access over a values() row, for serializer methods written against instances"""
+    __slots__ = ('_row', '_prefix')
+
+    def __init__(self, row: Dict, prefix: str = ''):
+        self._row = row
+        self._prefix = prefix
+
+    def __getattr__(self, name: str):
+        try:
+            return self._row[self._prefix + name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class RowConverter:
+    """Render the output of a model serializer straight from `values()` rows.
+
+    The fields of the serializer are compiled once into functions over a row, so a page costs a
+    query for its columns and one per image relation, without building model instances or
+    running the field machinery of DRF per value. UUIDs and datetimes are left to the renderer,
+    use `ORJSONRenderer` to encode them natively.
+    """
+
+    def __init__(self, serializer: serializers.ModelSerializer):
+        self.model = serializer.Meta.model
+        self.pk_column = self.model._meta.pk.attname
+        self.columns = {self.pk_column: None}
+        self.image_relations = {}
+        self.steps = self._compile(serializer)
+
+    @staticmethod
+    def _value(field: serializers.Field, column: str) -> Callable[[Dict], object]:
+        if type(field) in PASSTHROUGH_FIELDS or (isinstance(field, serializers.UUIDField) and field.uuid_format == 'hex_verbose'):
+            return itemgetter(column)
+
+        if (
+            isinstance(field, serializers.DecimalField)
+            and field.decimal_places is not None
+            and getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+            and not field.localize
+        ):
+            # Same quantization as DecimalField.quantize with the context and exponent built once
+            context = decimal.getcontext().copy()
+            if field.max_digits is not None:
+                context.prec = field.max_digits
+            exponent = decimal.Decimal('.1') ** field.decimal_places
+            rounding = field.rounding
+            convert = lambda value: '{:f}'.format(value.quantize(exponent, rounding=rounding, context=context))
+        elif isinstance(field, serializers.DateTimeField) and (getattr(field, 'format', api_settings.DATETIME_FORMAT) or '').lower() == ISO_8601:
+            convert = field.enforce_timezone
+        else:
+            convert = field.to_representation
+
+        def value(row):
+            value = row[column]
+            return None if value is None else convert(value)
+
+        return value
+
+    def _compile(self, serializer: serializers.ModelSerializer, prefix: str = '') -> List[tuple]:
+        concrete = {field.name: field for field in serializer.Meta.model._meta.concrete_fields}
+        field_columns = getattr(serializer, 'field_columns', {})
+        steps = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if isinstance(field, ImageUrlsField) and not isinstance(field, ImageSrcsetField) and not prefix:
+                relation = serializer.Meta.model._meta.get_field(field.source)
+                self.image_relations[name] = (relation.related_model, relation.field.attname, field)
+                # Tuple keys never clash with the column names of the row
+                steps.append((name, itemgetter(('images', name))))
+            elif isinstance(field, serializers.SerializerMethodField) and name in field_columns:
+                self.columns.update(dict.fromkeys(f"{prefix}{column}" for column in field_columns[name]))
+                method = getattr(serializer, field.method_name)
+                steps.append((name, lambda row, method=method, prefix=prefix: method(_RowObject(row, prefix))))
+            elif isinstance(field, serializers.ModelSerializer) and field.source in concrete:
+                key = f"{prefix}{concrete[field.source].attname}"
+                self.columns[key] = None
+                nested = self._compile(field, prefix=f"{prefix}{field.source}__")
+                steps.append((name, lambda row, key=key, nested=nested: None if row[key] is None else {n: step(row) for n, step in nested}))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None and field.source in concrete:
+                column = f"{prefix}{concrete[field.source].attname}"
+                self.columns[column] = None
+                steps.append((name, itemgetter(column)))
+            elif field.source in concrete and not concrete[field.source].is_relation:
+                column = f"{prefix}{field.source}"
+                self.columns[column] = None
+                steps.append((name, self._value(field, column)))
+            else:
+                raise ValueError(f"{type(serializer).__name__}.{name} cannot be read from columns.")
+
+        return steps
+
+    def _convert(self, rows: List[Dict]) -> List[Dict]:
+        ids = [row[self.pk_column] for row in rows]
+
+        for name, (image_model, foreign_key, field) in self.image_relations.items():
+            urls = {}
+
+            images = image_model.objects.ready().filter(**{f"{foreign_key}__in": ids}).order_by('image_id').values_list(foreign_key, 'image_id')
+            for owner, image_id in images:
+                urls.setdefault(owner, []).append(field.url(image_id))
+
+            for row in rows:
+                row[('images', name)] = urls.get(row[self.pk_column], [])
+
+        steps = self.steps
+        return [{name: step(row) for name, step in steps} for row in rows]
+
+    def rows(self, queryset: QuerySet) -> List[Dict]:
+        """Render every instance of a queryset, in its order
+
+        Args:
+            queryset (QuerySet): Instances of the serializer model
+
+        Returns:
+            List[Dict]: Same dictionaries as the serializer data
+        """
+        return self._convert(list(queryset.values(*self.columns)))
+
+    def rows_in_bulk(self, ids: Iterable) -> Dict:
+        """Render the instances with the given primary keys in one query
+
+        Args:
+            ids (Iterable): Primary keys, missing instances are skipped
+
+        Returns:
+            Dict: Serializer data of each instance, by primary key
+        """
+        ids = list(ids)
+        rows = list(self.model.objects.filter(pk__in=ids).values(*self.columns)) if ids else []
+        return {row[self.pk_column]: data for row, data in zip(rows, self._convert(rows))}
+
+    def rows_by_id(self, ids: Iterable) -> List[Dict]:
+        """Render the instances with the given primary keys in one query, in the order of the keys
+
+        Args:
+            ids (Iterable): Primary keys, missing instances are skipped
+
+        Returns:
+            List[Dict]: Same dictionaries as the serializer data
+        """
+        ids = list(ids)
+        rendered = self.rows_in_bulk(ids)
+        return [rendered[pk] for pk in ids if pk in rendered]
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _compiled(serializer_class: Type[serializers.ModelSerializer], fields: Optional[FrozenSet[str]]) -> Optional['RowConverter']:
+        serializer = serializer_class(fields=list(fields)) if fields else serializer_class()
+
+        if not isinstance(serializer, serializers.ModelSerializer):
+            return None
+
+        try:
+            return RowConverter(serializer)
+        except ValueError:
+            return None
+
+    @classmethod
+    def for_serializer(cls, serializer_class: Type[serializers.ModelSerializer], fields: Optional[List[str]] = None) -> Optional['RowConverter']:
+        """Compiled converter of a serializer, cached per set of requested fields
+
+        Args:
+            serializer_class (Type[serializers.ModelSerializer]): Serializer to render like
+            fields (Optional[List[str]], optional): Requested fields of a `SparseFieldsMixin` serializer. Defaults to None.
+
+        Raises:
+            ValueError: If a requested field does not exist
+
+        Returns:
+            Optional[RowConverter]: Converter, None for serializers without a model or with a field that needs the instance
+        """
+        return cls._compiled(serializer_class, frozenset(fields) if fields else None)
+
+    @classmethod
+    def serialize(cls, serializer_class: Type[serializers.ModelSerializer], queryset: QuerySet, fields: Optional[List[str]] = None) -> list:
+        """Serializer data of a queryset, from values() rows when `FAST_LIST_RENDERING` is on and the serializer allows it
+
+        Args:
+            serializer_class (Type[serializers.ModelSerializer]): Serializer to render like
+            queryset (QuerySet): Instances to render
+            fields (Optional[List[str]], optional): Requested fields of a `SparseFieldsMixin` serializer. Defaults to None.
+
+        Returns:
+            list: Serializer data
+        """
+        converter = cls.for_serializer(serializer_class, fields) if settings.FAST_LIST_RENDERING else None
+
+        if converter is None:
+            return serializer_class(queryset, many=True, **({'fields': fields} if fields else {})).data
+
+        return converter.rows(queryset)
@@ -0,0 +1,81 @@
+from typing import Dict, List, Optional, Type
+from django.db import models
+from rest_framework import serializers
+
+from .image_urls_field import ImageUrlsField
+
+
+class SparseFieldsMixin:
+    """Render only the fields requested with `fields=` and tell the ORM which columns they need.
+
+    Fields computed from other columns declare them in `field_columns`, plain model fields, dotted
+    sources and nested model serializers are resolved from the model.
+    """
+    field_columns: Dict[str, List[str]] = {}
+
+    def __init__(self, *args, fields: Optional[List[str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if fields:
+            unknown = set(fields) - set(self.readable_field_names())
+
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def readable_field_names(self) -> List[str]:
+        return [name for name, field in self.fields.items() if not field.write_only]
+
+    @staticmethod
+    def parse_fields(value: str) -> Optional[List[str]]:
+        """Parse the comma separated `fields` query parameter, None renders every field"""
+        fields = [name.strip() for name in (value or '').split(',') if name.strip()]
+        return fields or None
+
+    @staticmethod
+    def _model_columns(model: Type[models.Model], serializer: serializers.Serializer, prefix: str = '') -> List[str]:
+        concrete = {field.name for field in model._meta.concrete_fields}
+        columns = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if name in getattr(serializer, 'field_columns', {}):
+                columns += [f"{prefix}{column}" for column in serializer.field_columns[name]]
+            elif isinstance(field, serializers.ModelSerializer):
+                columns += SparseFieldsMixin._model_columns(field.Meta.model, field, prefix=f"{prefix}{field.source}__")
+            elif field.source != '*' and field.source.split('.')[0] in concrete:
+                columns.append(f"{prefix}{field.source.replace('.', '__')}")
+
+        return columns
+
+    @classmethod
+    def get_only(cls, model: Type[models.Model], fields: Optional[List[str]] = None) -> List[str]:
+        """Columns to load with `.only()` to render the given fields
+
+        Args:
+            model (Type[models.Model]): Model of the serialized instances
+            fields (Optional[List[str]], optional): Requested fields, every field when None. Defaults to None.
+
+        Raises:
+            ValueError: If a requested field does not exist
+
+        Returns:
+            List[str]: Column paths, related columns are prefixed with the relation name
+        """
+        return cls._model_columns(model, cls(fields=fields))
+
+    @classmethod
+    def get_prefetch(cls, fields: Optional[List[str]] = None) -> List[str]:
+        """Image relations to prefetch to render the given fields
+
+        Args:
+            fields (Optional[List[str]], optional): Requested fields, every field when None. Defaults to None.
+
+        Returns:
+            List[str]: Relation names, empty when no image field is rendered
+        """
+        return [field.source for field in cls(fields=fields).fields.values() if isinstance(field, ImageUrlsField)]
@@ -0,0 +1,90 @@
+import hashlib
+import os
+import tempfile
+from django.core.files.storage import FileSystemStorage
+from django.db import connection
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible(path='shared.storage.ContentAddressedStorage')
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage naming files by the SHA-256 of their content.
+
+    Only the directory and extension of the name built by `upload_to` are kept, the file is
+    stored as `<directory>/ab/cd/<hash>.<ext>` so no directory holds more than 65536 entries
+    per level. Saving content that is already stored writes nothing and returns the existing
+    name, so identical uploads share one file and a name always serves the same bytes.
+
+    Several rows can reference the same name, callers delete a file only once nothing
+    references it any more. Saving and deleting a name take `lock_name`, a save has to run in
+    the transaction writing the row that references the file, so the file cannot be deleted
+    between its reuse and that commit.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content in _save, an existing file is reused rather than renamed
+        return name
+
+    @staticmethod
+    def lock_name(name: str) -> None:
+        """Hold a lock on a file name until the current transaction ends
+
+        Args:
+            name (str): Stored file name
+        """
+        if connection.vendor != 'postgresql':
+            return
+
+        key = int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], 'big', signed=True)
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [key])
+
+    def content_name(self, name: str, content) -> str:
+        digest = hashlib.sha256()
+
+        for chunk in content.chunks():
+            digest.update(chunk)
+
+        content_hash = digest.hexdigest()
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+
+        return os.path.join(directory, content_hash[:2], content_hash[2:4], content_hash + extension)
+
+    def _save(self, name, content):
+        name = self.content_name(name, content)
+        full_path = self.path(name)
+        self.lock_name(name)
+
+        if os.path.exists(full_path):
+            return name
+
+        directory = os.path.dirname(full_path)
+
+        if self.directory_permissions_mode is not None:
+            old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+            try:
+                os.makedirs(directory, self.directory_permissions_mode, exist_ok=True)
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+        # Written aside then renamed, a concurrent save of the same content replaces it with identical bytes
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.part')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                for chunk in content.chunks():
+                    file.write(chunk)
+
+            # mkstemp creates the file readable by its owner only
+            os.chmod(temp_path, self.file_permissions_mode if self.file_permissions_mode is not None else 0o644)
+
+            os.replace(temp_path, full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return name
@@ -1,3 +1,56 @@
-from django.test import TestCase
+import gzip
+import json
+import unittest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
 
-# Create your tests here.
+from shared.middleware import CompressionMiddleware
+from shared.middleware.compression_middleware import brotli
+
+
+class CompressionMiddlewareTestCase(SimpleTestCase):
+    payload = {'results': [{'description': 'Nyumba nzuri karibu na barabara kuu', 'images': [f'/media/{i}/' for i in range(5)]}] * 40}
+
+    def respond(self, response, path='/api/v2/house/houses/filter_houses/', accept='gzip, deflate, br'):
+        request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzip(self):
+        with self.settings(RESPONSE_COMPRESSION_ENCODINGS=['gzip']):
+            response = self.respond(JsonResponse(self.payload))
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(json.loads(gzip.decompress(response.content)), self.payload)
+
+    @unittest.skipIf(brotli is None, "Brotli is not installed")
+    def test_brotli_preferred(self):
+        response = self.respond(JsonResponse(self.payload))
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(json.loads(brotli.decompress(response.content)), self.payload)
+
+    def test_client_preference(self):
+        self.assertEqual(CompressionMiddleware.select_encoding('br;q=0, gzip'), 'gzip')
+        self.assertEqual(CompressionMiddleware.select_encoding('gzip;q=0, *'), 'br' if brotli else None)
+        self.assertIsNone(CompressionMiddleware.select_encoding('identity'))
+        self.assertIsNone(CompressionMiddleware.select_encoding(''))
+
+    def test_skipped_responses(self):
+        small = self.respond(JsonResponse({'detail': 'ok'}))
+        outside_api = self.respond(JsonResponse(self.payload), path='/admin/')
+        image = self.respond(HttpResponse(b'\x89PNG' * 1000, content_type='image/png'))
+
+        for response in (small, outside_api, image):
+            self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_streaming(self):
+        chunks = [json.dumps(self.payload).encode()] * 3
+
+        with self.settings(RESPONSE_COMPRESSION_ENCODINGS=['gzip']):
+            response = self.respond(StreamingHttpResponse(iter(chunks), content_type='application/json'))
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b''.join(chunks))
@@ -1,7 +1,5 @@
-import mimetypes
-import os
 from typing import cast
-from django.http import  HttpRequest, HttpResponse
+from django.http import  HttpRequest
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from authentication.custom_permissions import *
@@ -9,14 +7,14 @@ from rest_framework.decorators import action
 from drf_yasg.utils import swagger_auto_schema
 import logging
 
-from igs_backend import settings
+from shared.mixins import MediaFileMixin
 from user.models import User
 from user.serializers import RequestAvatarSerializer
 
 
 logger = logging.getLogger(__name__)
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(MediaFileMixin, viewsets.ModelViewSet):
     def get_serializer_class(self):
         return RequestAvatarSerializer
 
@@ -45,20 +43,13 @@ class UserViewSet(viewsets.ModelViewSet):
     def serve_avatar(self, request: HttpRequest):
         try:
             user = cast(User, request.user)
+            # The avatar keeps its URL when it is replaced, caches revalidate it with its ETag
+            response = self.serve_media(request, user.avatar.name, cache_control={'private': True, 'no_cache': True}) if user.avatar else None
 
-            file_path = os.path.join(settings.MEDIA_ROOT, user.avatar.name)
-
-            if not os.path.exists(file_path):
+            if response is None:
                 return Response({"detail": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
 
-            mime_type, _ = mimetypes.guess_type(file_path)
-
-            if mime_type is None:
-                mime_type = 'application/octet-stream'
-
-            with open(file_path, 'rb') as image_file:
-                response = HttpResponse(image_file.read(), content_type=mime_type)
-                return response
+            return response
 
         except Exception as e:
             return Response({"detail": f"An error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
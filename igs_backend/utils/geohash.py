@@ -0,0 +1,251 @@
+import math
+from typing import List, Tuple
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+MAX_PRECISION = 9
+MAX_RADIUS_KM = 200
+TILE_SIZE_PX = 256
+
+
+def encode(latitude: float, longitude: float, precision: int = MAX_PRECISION) -> str:
+    """Encode a coordinate into a geohash, nearby points share a common prefix.
+
+    Args:
+        latitude (float): Latitude in degrees.
+        longitude (float): Longitude in degrees.
+        precision (int, optional): Number of characters. Defaults to MAX_PRECISION.
+
+    Returns:
+        str: Geohash of the cell containing the coordinate.
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(geohash) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lng_range[0] = mid
+            else:
+                bits = bits << 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits = bits << 1
+                lat_range[1] = mid
+
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            geohash.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(geohash)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """Height and width of a geohash cell in degrees.
+
+    Args:
+        precision (int): Number of characters.
+
+    Returns:
+        Tuple[float, float]: (latitude degrees, longitude degrees)
+    """
+    total_bits = precision * 5
+    lng_bits = math.ceil(total_bits / 2)
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def precision_for_radius(latitude: float, radius_km: float) -> int:
+    """Finest precision whose cells are at least as large as the radius, so the cell and its
+    eight neighbours always contain the whole circle.
+
+    Args:
+        latitude (float): Latitude of the circle center in degrees.
+        radius_km (float): Radius in kilometers.
+
+    Returns:
+        int: Geohash precision, 0 when the radius is larger than any cell.
+    """
+    cos_latitude = max(math.cos(math.radians(latitude)), 0.01)
+
+    for precision in range(MAX_PRECISION, 0, -1):
+        lat_degrees, lng_degrees = cell_size(precision)
+        height_km = lat_degrees * KM_PER_DEGREE
+        width_km = lng_degrees * KM_PER_DEGREE * cos_latitude
+
+        if min(height_km, width_km) >= radius_km:
+            return precision
+
+    return 0
+
+
+def covering_cells(latitude: float, longitude: float, radius_km: float) -> List[str]:
+    """Geohash prefixes of the cell containing the center and its eight neighbours.
+
+    Args:
+        latitude (float): Latitude of the circle center in degrees.
+        longitude (float): Longitude of the circle center in degrees.
+        radius_km (float): Radius in kilometers.
+
+    Returns:
+        List[str]: Distinct geohash prefixes covering the circle, empty when the radius is too large to prune.
+    """
+    precision = precision_for_radius(latitude, radius_km)
+
+    if precision == 0:
+        return []
+
+    lat_degrees, lng_degrees = cell_size(precision)
+    cells = []
+
+    for lat_step in (-1, 0, 1):
+        for lng_step in (-1, 0, 1):
+            neighbour_latitude = latitude + lat_step * lat_degrees
+            neighbour_longitude = longitude + lng_step * lng_degrees
+
+            if not -90.0 <= neighbour_latitude <= 90.0:
+                continue
+
+            neighbour_longitude = (neighbour_longitude + 180.0) % 360.0 - 180.0
+            cell = encode(neighbour_latitude, neighbour_longitude, precision)
+
+            if cell not in cells:
+                cells.append(cell)
+
+    return cells
+
+
+def precision_for_zoom(zoom: int, min_cell_px: int = 40) -> int:
+    """Finest precision whose cells are still at least `min_cell_px` pixels wide on a web map.
+
+    Args:
+        zoom (int): Web map zoom level, 0 shows the whole world in one 256 pixels tile.
+        min_cell_px (int, optional): Minimum width of a cell on screen. Defaults to 40.
+
+    Returns:
+        int: Geohash precision between 1 and MAX_PRECISION.
+    """
+    degrees_per_px = 360.0 / (TILE_SIZE_PX * 2 ** zoom)
+
+    for precision in range(MAX_PRECISION, 0, -1):
+        _, lng_degrees = cell_size(precision)
+
+        if lng_degrees / degrees_per_px >= min_cell_px:
+            return precision
+
+    return 1
+
+
+def covering_tiles(min_lng: float, min_lat: float, max_lng: float, max_lat: float, precision: int) -> List[str]:
+    """Geohash cells of the given precision intersecting a bounding box.
+
+    Args:
+        min_lng (float): West edge in degrees.
+        min_lat (float): South edge in degrees.
+        max_lng (float): East edge in degrees.
+        max_lat (float): North edge in degrees.
+        precision (int): Number of characters, 0 returns the single world tile ''.
+
+    Returns:
+        List[str]: Distinct geohash cells, west to east then south to north.
+    """
+    if precision == 0:
+        return ['']
+
+    lat_degrees, lng_degrees = cell_size(precision)
+    max_lat, max_lng = min(max_lat, 90.0), min(max_lng, 180.0)
+    tiles = []
+
+    latitude = max(min_lat, -90.0)
+    while True:
+        longitude = max(min_lng, -180.0)
+        while True:
+            tile = encode(latitude, longitude, precision)
+
+            if tile not in tiles:
+                tiles.append(tile)
+
+            if longitude >= max_lng:
+                break
+            longitude = min(longitude + lng_degrees, max_lng)
+
+        if latitude >= max_lat:
+            break
+        latitude = min(latitude + lat_degrees, max_lat)
+
+    return tiles
+
+
+def parse_radius(latitude: str, longitude: str, radius_km: str) -> Tuple[float, float, float] | None:
+    """Parse the `lat`, `lng` and `radius_km` query parameters.
+
+    Returns:
+        Tuple[float, float, float] | None: (latitude, longitude, radius_km) or None when no parameter is given.
+
+    Raises:
+        ValueError: If the parameters are incomplete or out of range.
+    """
+    if not any([latitude, longitude, radius_km]):
+        return None
+
+    if not all([latitude, longitude, radius_km]):
+        raise ValueError("lat, lng and radius_km must be provided together.")
+
+    try:
+        latitude, longitude, radius_km = float(latitude), float(longitude), float(radius_km)
+    except ValueError:
+        raise ValueError("Invalid coordinates format.")
+
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+        raise ValueError("Coordinates are out of range.")
+
+    if not 0 < radius_km <= MAX_RADIUS_KM:
+        raise ValueError(f"radius_km must be greater than 0 and at most {MAX_RADIUS_KM}.")
+
+    return latitude, longitude, radius_km
+
+
+def parse_bbox(bbox: str) -> Tuple[float, float, float, float] | None:
+    """Parse the `bbox` query parameter given as `min_lng,min_lat,max_lng,max_lat`.
+
+    Returns:
+        Tuple[float, float, float, float] | None: (min_lng, min_lat, max_lng, max_lat) or None when not given.
+
+    Raises:
+        ValueError: If the box is malformed, not finite or out of range.
+    """
+    if not bbox:
+        return None
+
+    try:
+        min_lng, min_lat, max_lng, max_lat = [float(value) for value in bbox.split(',')]
+    except ValueError:
+        raise ValueError("bbox must be min_lng,min_lat,max_lng,max_lat.")
+
+    # float() accepts nan and inf, which would never reach the end of the box when covering it with tiles
+    if not all(math.isfinite(value) for value in (min_lng, min_lat, max_lng, max_lat)):
+        raise ValueError("bbox values must be finite numbers.")
+
+    if not -180 <= min_lng <= 180 or not -180 <= max_lng <= 180 or not -90 <= min_lat <= 90 or not -90 <= max_lat <= 90:
+        raise ValueError("Coordinates are out of range.")
+
+    if min_lng > max_lng or min_lat > max_lat:
+        raise ValueError("bbox minimum values must not exceed the maximum values.")
+
+    return min_lng, min_lat, max_lng, max_lat
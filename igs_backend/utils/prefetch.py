@@ -0,0 +1,32 @@
+from typing import Type
+from django.db import models
+from django.db.models import Prefetch
+
+
+def images_prefetch(model: Type[models.Model], relation: str = 'images', renditions: bool = False) -> Prefetch:
+    """Prefetch of the ready images of a listing loading only the columns needed to build their URLs.
+
+    Args:
+        model (Type[models.Model]): Model owning the images, relation paths such as 'property__images' start from it.
+        relation (str, optional): Reverse relation of the image model. Defaults to 'images'.
+        renditions (bool, optional): Also prefetch the size and width of the renditions, for srcsets. Defaults to False.
+
+    Returns:
+        Prefetch: Prefetch of the ready image ids, ordered like the cover image.
+    """
+    *path, name = relation.split('__')
+    owner = model
+
+    for step in path:
+        owner = owner._meta.get_field(step).related_model
+
+    image_model = owner._meta.get_field(name).related_model
+    foreign_key = owner._meta.get_field(name).field.name
+
+    queryset = image_model.objects.ready().only('image_id', foreign_key).order_by('image_id')
+
+    if renditions:
+        rendition_model = image_model._meta.get_field('renditions').related_model
+        queryset = queryset.prefetch_related(Prefetch('renditions', queryset=rendition_model.objects.only('rendition_id', 'image_id', 'size', 'width')))
+
+    return Prefetch(relation, queryset=queryset)
@@ -1,7 +1,7 @@
 import io
+import math
 import os
-import tempfile
-from typing import Any
+from typing import Any, Dict, NamedTuple
 from PIL import Image
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.core.exceptions import ValidationError
@@ -14,56 +14,139 @@ def upload_image_to(instance, filename):
     return os.path.join('property_images', str(image_id) + '.' + extension)
     
 
+def upload_rendition_to(instance, filename):
+    image_id = instance.image_id
+    extension = filename.split('.')[-1]
+
+    return os.path.join('property_images', str(image_id) + '_' + instance.size + '.' + extension)
+
+
 def upload_profile_to(instance, filename):
     user_id = instance.user_id 
     extension = filename.split('.')[-1]
     
     return os.path.join('avatar', str(user_id) + '.' + extension)
 
-def validate_image(image):
-    """Validates and compresses image before saving."""
+def verify_image(image):
+    """Checks that the upload is an image file without decoding its pixels."""
     try:
         img = Image.open(image)
         img.verify()  # Check if it's a valid image file
     except Exception as e:
         raise ValidationError(message="Invalid image file.")
+    finally:
+        image.seek(0)
+
+
+def validate_image(image):
+    """Validates that the upload is an image, the file is compressed when it is processed."""
+    verify_image(image)
 
-    return compress_and_resize_image(image)
+
+class Rendition(NamedTuple):
+    file: InMemoryUploadedFile
+    width: int
+    height: int
+
+
+MAX_WIDTH = 1920
+MAX_SIZE_IN_BYTES = int(1.2 * 1024 * 1024)
+MAX_QUALITY = 80
+MIN_QUALITY = 30
+QUALITY_STEP = 5
+# Encodes tried per rendition before giving up on the byte budget
+MAX_ENCODE_ATTEMPTS = 6
 
 
 def compress_and_resize_image(image: Any) -> InMemoryUploadedFile:
     """Resizes and compresses an image to optimize file size."""
+    return create_renditions(image, {'full': MAX_WIDTH})['full'].file
+
+
+def create_renditions(image: Any, max_widths: Dict[str, int], max_bytes: int = MAX_SIZE_IN_BYTES) -> Dict[str, Rendition]:
+    """Decodes an image once and encodes a WebP rendition per maximum width.
+
+    Each rendition is resized from the next larger one. Images are never upscaled, a width the
+    image is already narrower than gets no rendition since the larger one would be identical.
+    """
+    widths = sorted(max_widths.items(), key=lambda item: item[1], reverse=True)
+    img = _decode(image, max_width=widths[0][1])
+    renditions = {}
+
+    for name, max_width in widths:
+        if renditions and img.width <= max_width:
+            break
+
+        img = _resize(img, max_width=max_width)
+        renditions[name] = _encode_webp(img, max_bytes=max_bytes)
+
+    return renditions
+
+
+def _decode(image: Any, max_width: int) -> Image.Image:
     img = Image.open(image)
-    max_width = 1920
-    max_size_in_mb = 1.2
 
+    if img.width > max_width:
+        # JPEG decodes straight at 1/2, 1/4 or 1/8 scale, never below the requested size
+        img.draft('RGB', (max_width, math.ceil(img.height * max_width / img.width)))
+
+    img.load()
+    return img
+
+
+def _resize(img: Image.Image, max_width: int) -> Image.Image:
     if img.width > max_width:
         ratio = max_width / float(img.width)
         new_height = int((float(img.height) * float(ratio)))
-        img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
+        # Shrinks by an integer factor with reduce() first, then resamples the small image
+        img = img.resize((max_width, new_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
 
-    # Create a temporary file path
-    temp_file_path = tempfile.mktemp(suffix=".webp")
-    img.save(temp_file_path, format='WebP', quality=80)
+    return img
 
-    # Compress if the size is greater than the allowed limit
-    while os.path.getsize(temp_file_path) > max_size_in_mb * 1024 * 1024:
-        img.save(temp_file_path, format='WebP', quality=75)
 
-    # Read the file into memory and create InMemoryUploadedFile
-    with open(temp_file_path, 'rb') as f:
-        img_data = f.read()
-    
-    # Use BytesIO to simulate the file in memory
-    img_io = io.BytesIO(img_data)
-    img_io.seek(0)
+def _encode_webp(img: Image.Image, max_bytes: int) -> Rendition:
+    """Encodes at the highest quality fitting in `max_bytes`, searched in memory.
+
+    Images over the budget at `MAX_QUALITY` probe lower qualities on a grid of `QUALITY_STEP`
+    with the fastest WebP method, stepping down twice as far each time then bisecting, and keep
+    the best probe that fits. The search gives up after `MAX_ENCODE_ATTEMPTS` encodes with the
+    smallest one.
+    """
+    data = _webp_bytes(img, quality=MAX_QUALITY, method=4)
+
+    if len(data) > max_bytes:
+        fitting = None
+        smallest = data
+        low, high = None, MAX_QUALITY   # Highest quality known to fit, lowest known not to
+        step = QUALITY_STEP
+
+        for _ in range(MAX_ENCODE_ATTEMPTS - 1):
+            if low is None:
+                quality = max(high - step, MIN_QUALITY)
+                step *= 2
+            else:
+                quality = (low + high) // 2 // QUALITY_STEP * QUALITY_STEP
+                if quality <= low:
+                    break
+
+            probe = _webp_bytes(img, quality=quality, method=0)
+
+            if len(probe) <= max_bytes:
+                low, fitting = quality, probe
+            else:
+                high = quality
+                smallest = min(smallest, probe, key=len)
+                if quality == MIN_QUALITY:
+                    break
+
+        data = fitting if fitting is not None else smallest
+
+    compressed_image = InMemoryUploadedFile(io.BytesIO(data), None, 'image.webp', 'image/webp', len(data), None)
 
-    # Create an InMemoryUploadedFile from the in-memory image
-    compressed_image = InMemoryUploadedFile(
-        img_io, None, temp_file_path, 'image/webp', len(img_data), None
-    )
+    return Rendition(file=compressed_image, width=img.width, height=img.height)
 
-    # Clean up the temporary file
-    os.remove(temp_file_path)
 
-    return compressed_image
+def _webp_bytes(img: Image.Image, quality: int, method: int) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, format='WebP', quality=quality, method=method)
+    return buffer.getvalue()